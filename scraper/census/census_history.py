@@ -0,0 +1,485 @@
+#!/usr/bin/env python3
+"""
+Census history: every dated census snapshot in one deduplicated SQLite database.
+
+Each snapshot (a census HTML export named after its date, e.g.
+census_may_15_2025.html) is parsed with the streaming extractor of
+census_html_to_tsv. Characters are identified by player and adventurer name,
+and a new version of a character is stored only when one of its fields
+changed since the previous snapshot. Versions carry valid_from/valid_to
+dates (valid_to is exclusive and NULL while current), so the roster on any
+date, class popularity over time and spirit-core progression are plain
+queries instead of a rebuild per snapshot.
+
+Usage:
+    python census_history.py ingest snapshots/ [--db census_history.sqlite]
+    python census_history.py snapshots
+    python census_history.py popularity [--class Mage]
+    python census_history.py progression "Nia Prys"
+"""
+
+import os
+import re
+import sys
+import csv
+import sqlite3
+import hashlib
+import argparse
+import multiprocessing
+from datetime import date, datetime
+from concurrent.futures import ProcessPoolExecutor
+
+from census_html_to_tsv import iter_census_rows
+
+DEFAULT_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'census_history.sqlite')
+
+# Row fields stored per version, in the order of census_html_to_tsv.HEADERS
+FIELDS = (
+    'player_name', 'adventurer_name', 'adventurer_url', 'spirit_core', 'race', 'sub_race',
+    'tier_1_classes', 'tier_2_classes', 'tier_3_classes',
+    'expedition_departure', 'expedition_return', 'ip_lockout_end',
+)
+VERSION_FIELDS = FIELDS[2:]
+CLASS_FIELDS = {'tier_1_classes': 1, 'tier_2_classes': 2, 'tier_3_classes': 3}
+
+# Google Sheets exports empty cells as a zero-width space
+ZERO_WIDTH_SPACE = '\u200b'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots(
+    snapshot_date TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    row_count INTEGER NOT NULL,
+    changed_count INTEGER NOT NULL,
+    ingested_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS characters(
+    id INTEGER PRIMARY KEY,
+    player_name TEXT NOT NULL,
+    adventurer_name TEXT NOT NULL,
+    UNIQUE(player_name, adventurer_name)
+);
+CREATE TABLE IF NOT EXISTS character_versions(
+    character_id INTEGER NOT NULL REFERENCES characters(id),
+    valid_from TEXT NOT NULL,
+    valid_to TEXT,
+    row_hash TEXT NOT NULL,
+    adventurer_url TEXT,
+    spirit_core INTEGER,
+    race TEXT,
+    sub_race TEXT,
+    tier_1_classes TEXT,
+    tier_2_classes TEXT,
+    tier_3_classes TEXT,
+    expedition_departure TEXT,
+    expedition_return TEXT,
+    ip_lockout_end TEXT,
+    PRIMARY KEY(character_id, valid_from)
+);
+CREATE INDEX IF NOT EXISTS character_versions_current ON character_versions(valid_to, character_id);
+CREATE TABLE IF NOT EXISTS version_classes(
+    character_id INTEGER NOT NULL,
+    valid_from TEXT NOT NULL,
+    class_name TEXT NOT NULL,
+    tier INTEGER NOT NULL,
+    PRIMARY KEY(character_id, valid_from, class_name),
+    FOREIGN KEY(character_id, valid_from) REFERENCES character_versions(character_id, valid_from)
+);
+CREATE INDEX IF NOT EXISTS version_classes_by_class ON version_classes(class_name, character_id, valid_from);
+"""
+
+DATE_PATTERNS = (
+    (re.compile(r'(\d{4})-(\d{2})-(\d{2})'), lambda m: date(int(m[1]), int(m[2]), int(m[3]))),
+    (re.compile(r'([a-z]+)_(\d{1,2})_(\d{4})', re.IGNORECASE), lambda m: _month_date(m[1], m[2], m[3])),
+)
+
+def _month_date(month: str, day: str, year: str) -> date:
+    for fmt in ('%B %d %Y', '%b %d %Y'):
+        try:
+            return datetime.strptime(f"{month} {day} {year}", fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Unknown month '{month}'")
+
+def snapshot_date(path: str) -> date:
+    """
+    Date of a snapshot from its file name.
+
+    Accepts census_may_15_2025.html style names and ISO dates (2025-05-15).
+
+    Raises:
+        ValueError: If the name has no recognizable date
+    """
+    name = os.path.basename(path)
+    for pattern, build in DATE_PATTERNS:
+        match = pattern.search(name)
+        if match:
+            try:
+                return build(match)
+            except ValueError:
+                continue
+    raise ValueError(f"No snapshot date in file name: {name}")
+
+def parse_spirit_core(value: str) -> int | None:
+    digits = value.replace(',', '').strip()
+    return int(digits) if digits.isdigit() else None
+
+def split_classes(value: str) -> list[str]:
+    """Class names of a tier cell, without duplicates."""
+    names = []
+    for raw in value.split(','):
+        name = raw.replace(ZERO_WIDTH_SPACE, '').strip()
+        if name and name not in names:
+            names.append(name)
+    return names
+
+def normalize_row(row: list[str]) -> dict:
+    """Census TSV row as stored: typed spirit core, clean class lists, empty cells as None."""
+    record = {}
+    for field, value in zip(FIELDS, row):
+        value = value.replace(ZERO_WIDTH_SPACE, '').strip()
+        if field in CLASS_FIELDS:
+            value = ', '.join(split_classes(value))
+        record[field] = value or None
+    # Same repair as tsv_to_supabase_sql: a missing spirit core shifts race/sub-race left
+    if record['spirit_core'] is None and (record['race'] or '').isdigit():
+        record['spirit_core'], record['race'], record['sub_race'] = record['race'], record['sub_race'], record['tier_1_classes']
+    record['spirit_core'] = parse_spirit_core(record['spirit_core'] or '')
+    # Name columns form the character key and are never NULL
+    record['player_name'] = record['player_name'] or ''
+    record['adventurer_name'] = record['adventurer_name'] or ''
+    return record
+
+def row_hash(record: dict) -> str:
+    payload = '\x1f'.join('' if record[field] is None else str(record[field]) for field in VERSION_FIELDS)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def parse_snapshot(path: str) -> tuple[str, str, list[dict]]:
+    """
+    Parse one snapshot (runs in a worker process).
+
+    Returns:
+        (ISO snapshot date, sha256 of the file, normalized records)
+    """
+    with open(path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    records = {}
+    for row in iter_census_rows(path):
+        record = normalize_row(row)
+        # A character listed twice keeps its first row
+        records.setdefault((record['player_name'], record['adventurer_name']), record)
+    return snapshot_date(path).isoformat(), digest, list(records.values())
+
+def parse_tsv_snapshot(path: str) -> tuple[str, str, list[dict]]:
+    """Same as parse_snapshot for a census TSV (output of census_html_to_tsv)."""
+    with open(path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    records = {}
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f, delimiter='\t')
+        next(reader, None)
+        for row in reader:
+            if len(row) < len(FIELDS) or not row[0].strip():
+                continue
+            record = normalize_row(row)
+            records.setdefault((record['player_name'], record['adventurer_name']), record)
+    return snapshot_date(path).isoformat(), digest, list(records.values())
+
+def _parse_file(path: str) -> tuple[str, str, list[dict]]:
+    return parse_tsv_snapshot(path) if path.endswith('.tsv') else parse_snapshot(path)
+
+class CensusHistory:
+    """Deduplicated history of census snapshots in a SQLite database."""
+
+    def __init__(self, db_path: str = DEFAULT_DB):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def snapshots(self) -> list[sqlite3.Row]:
+        return self.conn.execute("SELECT * FROM snapshots ORDER BY snapshot_date").fetchall()
+
+    def latest_snapshot(self) -> str | None:
+        return self.conn.execute("SELECT MAX(snapshot_date) FROM snapshots").fetchone()[0]
+
+    def reset(self):
+        """Drop all history (used before re-ingesting out-of-order snapshots)."""
+        with self.conn:
+            for table in ('version_classes', 'character_versions', 'characters', 'snapshots'):
+                self.conn.execute(f"DELETE FROM {table}")
+
+    def _character_id(self, record: dict) -> int:
+        key = (record['player_name'], record['adventurer_name'])
+        row = self.conn.execute(
+            "SELECT id FROM characters WHERE player_name = ? AND adventurer_name = ?", key).fetchone()
+        if row:
+            return row[0]
+        return self.conn.execute(
+            "INSERT INTO characters(player_name, adventurer_name) VALUES(?, ?)", key).lastrowid
+
+    def add_snapshot(self, snapshot: str, source: str, sha256: str, records: list[dict]) -> int:
+        """
+        Apply one snapshot on top of the history.
+
+        Unchanged characters keep their open version; changed ones get their
+        version closed at the snapshot date and a new one opened; characters
+        missing from the snapshot are closed.
+
+        Args:
+            snapshot: ISO date of the snapshot; must be after every ingested one
+            source: File the snapshot came from
+            sha256: Hash of that file
+            records: Rows from parse_snapshot
+
+        Returns:
+            Number of versions opened or closed
+
+        Raises:
+            ValueError: If the snapshot is not newer than the latest one
+        """
+        latest = self.latest_snapshot()
+        if latest is not None and snapshot <= latest:
+            raise ValueError(f"Snapshot {snapshot} is not after the latest ingested snapshot {latest}")
+
+        current = {
+            (row['player_name'], row['adventurer_name']): (row['character_id'], row['row_hash'])
+            for row in self.conn.execute(
+                "SELECT v.character_id, v.row_hash, c.player_name, c.adventurer_name "
+                "FROM character_versions v JOIN characters c ON c.id = v.character_id "
+                "WHERE v.valid_to IS NULL")
+        }
+        changed = 0
+        seen = set()
+        with self.conn:
+            for record in records:
+                key = (record['player_name'], record['adventurer_name'])
+                seen.add(key)
+                digest = row_hash(record)
+                open_version = current.get(key)
+                if open_version and open_version[1] == digest:
+                    continue
+
+                if open_version:
+                    character_id = open_version[0]
+                    self.conn.execute(
+                        "UPDATE character_versions SET valid_to = ? WHERE character_id = ? AND valid_to IS NULL",
+                        (snapshot, character_id))
+                else:
+                    character_id = self._character_id(record)
+                self.conn.execute(
+                    f"INSERT INTO character_versions(character_id, valid_from, row_hash, {', '.join(VERSION_FIELDS)}) "
+                    f"VALUES(?, ?, ?, {', '.join('?' * len(VERSION_FIELDS))})",
+                    (character_id, snapshot, digest, *(record[field] for field in VERSION_FIELDS)))
+                self.conn.executemany(
+                    "INSERT INTO version_classes(character_id, valid_from, class_name, tier) VALUES(?, ?, ?, ?)",
+                    [(character_id, snapshot, name, tier)
+                     for field, tier in CLASS_FIELDS.items()
+                     for name in split_classes(record[field] or '')])
+                changed += 1
+
+            gone = [character_id for key, (character_id, _) in current.items() if key not in seen]
+            self.conn.executemany(
+                "UPDATE character_versions SET valid_to = ? WHERE character_id = ? AND valid_to IS NULL",
+                [(snapshot, character_id) for character_id in gone])
+            changed += len(gone)
+
+            self.conn.execute(
+                "INSERT INTO snapshots(snapshot_date, source, sha256, row_count, changed_count, ingested_at) "
+                "VALUES(?, ?, ?, ?, ?, ?)",
+                (snapshot, os.path.basename(source), sha256, len(records), changed,
+                 datetime.now().isoformat(timespec='seconds')))
+        return changed
+
+    def ingest(self, paths: list[str], workers: int | None = None, rebuild: bool = False) -> int:
+        """
+        Parse snapshots in parallel and apply them in date order.
+
+        Snapshots already ingested (same date and file hash) are skipped. A
+        snapshot older than the latest ingested one needs rebuild=True, which
+        re-ingests the given files from scratch.
+
+        Args:
+            paths: Snapshot files (.html exports or census .tsv files)
+            workers: Parse processes (default: one per CPU, at most one per file)
+            rebuild: Drop the existing history first
+
+        Returns:
+            Number of snapshots ingested
+        """
+        if rebuild:
+            self.reset()
+        known = {row['snapshot_date']: row['sha256'] for row in self.snapshots()}
+        latest = self.latest_snapshot()
+
+        dated = sorted((snapshot_date(path).isoformat(), path) for path in paths)
+        pending = []
+        for snapshot, path in dated:
+            if snapshot in known:
+                print(f"Skipping {os.path.basename(path)}: snapshot {snapshot} already ingested")
+            elif latest is not None and snapshot < latest:
+                raise ValueError(f"{os.path.basename(path)} ({snapshot}) is older than the latest "
+                                 f"ingested snapshot {latest}; re-run with --rebuild")
+            else:
+                pending.append(path)
+        if not pending:
+            return 0
+
+        workers = min(workers or os.cpu_count() or 1, len(pending))
+        if workers > 1:
+            # Parse concurrently, apply in date order as results come back in submission order
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+                results = executor.map(_parse_file, pending)
+                for path, (snapshot, digest, records) in zip(pending, results):
+                    changed = self.add_snapshot(snapshot, path, digest, records)
+                    print(f"Ingested {snapshot}: {len(records)} characters, {changed} changes")
+        else:
+            for path in pending:
+                snapshot, digest, records = _parse_file(path)
+                changed = self.add_snapshot(snapshot, path, digest, records)
+                print(f"Ingested {snapshot}: {len(records)} characters, {changed} changes")
+        return len(pending)
+
+    def roster(self, on: str | None = None) -> list[sqlite3.Row]:
+        """Characters and their fields as of a date (default: the latest snapshot)."""
+        on = on or self.latest_snapshot()
+        return self.conn.execute(
+            "SELECT c.player_name, c.adventurer_name, v.* FROM character_versions v "
+            "JOIN characters c ON c.id = v.character_id "
+            "WHERE v.valid_from <= ? AND (v.valid_to IS NULL OR v.valid_to > ?) "
+            "ORDER BY c.player_name, c.adventurer_name", (on, on)).fetchall()
+
+    def class_popularity(self, class_name: str | None = None, tier: int | None = None) -> list[sqlite3.Row]:
+        """
+        Number of characters with each class at every snapshot.
+
+        Args:
+            class_name: Only this class
+            tier: Only classes listed in this tier column
+
+        Returns:
+            Rows of (snapshot_date, class_name, characters), by date then count
+        """
+        conditions = []
+        params = []
+        if class_name:
+            conditions.append("vc.class_name = ?")
+            params.append(class_name)
+        if tier:
+            conditions.append("vc.tier = ?")
+            params.append(tier)
+        where = ''.join(f" AND {condition}" for condition in conditions)
+        return self.conn.execute(
+            "SELECT s.snapshot_date, vc.class_name, COUNT(DISTINCT v.character_id) AS characters "
+            "FROM snapshots s "
+            "JOIN character_versions v ON v.valid_from <= s.snapshot_date "
+            "AND (v.valid_to IS NULL OR v.valid_to > s.snapshot_date) "
+            "JOIN version_classes vc ON vc.character_id = v.character_id AND vc.valid_from = v.valid_from"
+            f"{where} "
+            "GROUP BY s.snapshot_date, vc.class_name "
+            "ORDER BY s.snapshot_date, characters DESC, vc.class_name", params).fetchall()
+
+    def spirit_core_progression(self, name: str) -> list[sqlite3.Row]:
+        """
+        Spirit core of every version of the matching characters.
+
+        Args:
+            name: Adventurer or player name (case-insensitive, substring match)
+
+        Returns:
+            Rows of (player_name, adventurer_name, valid_from, valid_to, spirit_core)
+            with repeated spirit-core values collapsed
+        """
+        pattern = f"%{name}%"
+        rows = self.conn.execute(
+            "SELECT c.player_name, c.adventurer_name, v.valid_from, v.valid_to, v.spirit_core "
+            "FROM characters c JOIN character_versions v ON v.character_id = c.id "
+            "WHERE c.adventurer_name LIKE ? OR c.player_name LIKE ? "
+            "ORDER BY c.player_name, c.adventurer_name, v.valid_from", (pattern, pattern)).fetchall()
+        progression = []
+        for row in rows:
+            last = progression[-1] if progression else None
+            # Versions that changed something else keep the same spirit core; merge them
+            if (last and last['player_name'] == row['player_name'] and last['adventurer_name'] == row['adventurer_name']
+                    and last['spirit_core'] == row['spirit_core'] and last['valid_to'] == row['valid_from']):
+                last['valid_to'] = row['valid_to']
+            else:
+                progression.append(dict(row))
+        return progression
+
+def snapshot_files(paths: list[str]) -> list[str]:
+    """Snapshot files from files and directories (.html, or .tsv for converted censuses)."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith(('.html', '.tsv')):
+                    try:
+                        snapshot_date(name)
+                    except ValueError:
+                        continue
+                    files.append(os.path.join(path, name))
+        else:
+            files.append(path)
+    return files
+
+def main():
+    parser = argparse.ArgumentParser(description="Deduplicated history of Mirane census snapshots.")
+    parser.add_argument("--db", default=DEFAULT_DB, help=f"History database (default: {DEFAULT_DB})")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = subparsers.add_parser("ingest", help="Ingest dated census snapshots")
+    ingest_parser.add_argument("paths", nargs="+", help="Snapshot files or directories of them")
+    ingest_parser.add_argument("-j", "--workers", type=int, help="Parse processes (default: CPU count)")
+    ingest_parser.add_argument("--rebuild", action="store_true", help="Drop the history and re-ingest the given snapshots")
+
+    subparsers.add_parser("snapshots", help="List ingested snapshots")
+
+    popularity_parser = subparsers.add_parser("popularity", help="Class popularity per snapshot")
+    popularity_parser.add_argument("--class", dest="class_name", help="Only this class")
+    popularity_parser.add_argument("--tier", type=int, choices=[1, 2, 3], help="Only this tier column")
+
+    progression_parser = subparsers.add_parser("progression", help="Spirit core over time")
+    progression_parser.add_argument("name", help="Adventurer or player name (substring)")
+
+    roster_parser = subparsers.add_parser("roster", help="Characters as of a date")
+    roster_parser.add_argument("--on", help="ISO date (default: latest snapshot)")
+
+    args = parser.parse_args()
+    history = CensusHistory(args.db)
+    try:
+        if args.command == "ingest":
+            files = snapshot_files(args.paths)
+            if not files:
+                print("Error: No dated census snapshots found")
+                sys.exit(1)
+            try:
+                count = history.ingest(files, workers=args.workers, rebuild=args.rebuild)
+            except ValueError as e:
+                print(f"Error: {e}")
+                sys.exit(1)
+            print(f"Ingested {count} snapshot(s) into {args.db}")
+        elif args.command == "snapshots":
+            for row in history.snapshots():
+                print(f"{row['snapshot_date']}\t{row['row_count']} characters\t{row['changed_count']} changes\t{row['source']}")
+        elif args.command == "popularity":
+            for row in history.class_popularity(args.class_name, args.tier):
+                print(f"{row['snapshot_date']}\t{row['class_name']}\t{row['characters']}")
+        elif args.command == "progression":
+            for row in history.spirit_core_progression(args.name):
+                until = row['valid_to'] or 'now'
+                spirit_core = row['spirit_core'] if row['spirit_core'] is not None else '-'
+                print(f"{row['adventurer_name']} ({row['player_name']})\t{row['valid_from']} .. {until}\t{spirit_core}")
+        elif args.command == "roster":
+            for row in history.roster(args.on):
+                print("\t".join('' if row[field] is None else str(row[field]) for field in FIELDS))
+    finally:
+        history.close()
+
+if __name__ == '__main__':
+    main()
@@ -3,7 +3,8 @@
 import os
 import csv
 import argparse
-from bs4 import BeautifulSoup, Tag
+from html.parser import HTMLParser
+from typing import Iterator
 
 # Column indices (0-based) from the HTML <td> elements
 COL_PLAYER_NAME = 0         # Column A: Player
@@ -29,7 +30,205 @@ def sanitize_text(text: str | None) -> str:
         return ""
     return ' '.join(text.split()).strip()
 
-def get_cell_text(cell_tag: Tag | None) -> str:
+HEADERS = [
+    "Player Name", "Adventurer Name", "Adventurer URL", "Spirit Core (Current)",
+    "Race", "Sub-Race", "Tier 1 Class", "Tier 2 Class", "Tier 3 Class",
+    "Exepdition Departure", "Expedition Return", "IP Lockout End"
+]
+
+# Elements without an end tag; never pushed on the open-element stack
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+
+CHUNK_SIZE = 64 * 1024
+
+def joined_text(strings: list[str]) -> str:
+    """Same as BeautifulSoup get_text(separator=' ', strip=True), then sanitized."""
+    return sanitize_text(' '.join(piece for piece in (string.strip() for string in strings) if piece))
+
+class CensusCell:
+    """Text pieces of one <td>: all of it, its first span.s6 and its first link."""
+
+    __slots__ = ('strings', 's6_strings', 'link_strings', 'href')
+
+    def __init__(self):
+        self.strings: list[str] = []
+        self.s6_strings: list[str] | None = None
+        self.link_strings: list[str] | None = None
+        self.href = ''
+
+    def text(self) -> str:
+        return joined_text(self.s6_strings if self.s6_strings is not None else self.strings)
+
+class CensusRowParser(HTMLParser):
+    """
+    Streaming extractor for the census sheet's rows.
+
+    Tracks only the open elements inside the first table.waffle and turns each
+    direct <tr> of its <tbody> into a list of CensusCell as soon as the row
+    closes. Finished rows wait in self.rows until the caller drains them, so
+    memory stays bounded by one chunk of HTML plus one row.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.rows: list[list[CensusCell]] = []
+        self.found_table = False
+        self.found_tbody = False
+        self.tbody_depth = 0
+        self.stack: list[str] = []  # open elements inside the table (the table itself is stack[0])
+        self.done = False
+        self.row: list[CensusCell] | None = None
+        self.cell: CensusCell | None = None
+        self.cell_depth = 0
+        self.s6_depth = 0      # stack depth of the open first span.s6, 0 if none
+        self.link_depth = 0    # stack depth of the open first <a>, 0 if none
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if not self.stack:
+            classes = (dict(attrs).get('class') or '').split()
+            if tag == 'table' and 'waffle' in classes:
+                self.found_table = True
+                self.stack.append(tag)
+            return
+
+        parent = self.stack[-1]
+        if tag not in VOID_TAGS:
+            self.stack.append(tag)
+        depth = len(self.stack)
+
+        if tag == 'tbody' and not self.found_tbody:
+            self.found_tbody = True
+            self.tbody_depth = depth
+        elif tag == 'tr' and self.found_tbody and parent == 'tbody' and depth == self.tbody_depth + 1:
+            self.row = []
+        elif tag == 'td' and self.row is not None and parent == 'tr' and depth == self.tbody_depth + 2:
+            self.cell = CensusCell()
+            self.cell_depth = depth
+        elif self.cell is not None:
+            attributes = dict(attrs)
+            if tag == 'span' and self.cell.s6_strings is None and 's6' in (attributes.get('class') or '').split():
+                self.cell.s6_strings = []
+                self.s6_depth = depth
+            elif tag == 'a' and self.cell.link_strings is None:
+                self.cell.link_strings = []
+                self.cell.href = attributes.get('href') or ''
+                self.link_depth = depth
+
+    def handle_startendtag(self, tag, attrs):
+        # <br/> and friends carry no text; other self-closed tags open and close at once
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS and len(self.stack) > 1 and self.stack[-1] == tag:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if self.done or not self.stack or tag not in self.stack:
+            return
+        # Close up to and including the matching element
+        while self.stack:
+            depth = len(self.stack)
+            open_tag = self.stack.pop()
+            if depth == self.s6_depth:
+                self.s6_depth = 0
+            if depth == self.link_depth:
+                self.link_depth = 0
+            if self.cell is not None and depth == self.cell_depth:
+                self.row.append(self.cell)
+                self.cell = None
+            elif self.row is not None and open_tag == 'tr' and depth == self.tbody_depth + 1:
+                self.rows.append(self.row)
+                self.row = None
+            if open_tag == tag:
+                break
+        if not self.stack:
+            self.done = True
+
+    def handle_data(self, data):
+        if self.cell is None:
+            return
+        self.cell.strings.append(data)
+        if self.s6_depth:
+            self.cell.s6_strings.append(data)
+        if self.link_depth:
+            self.cell.link_strings.append(data)
+
+def census_row(cells: list) -> list[str] | None:
+    """
+    Build the TSV row for one census table row.
+
+    Args:
+        cells: CensusCell objects of the row's <td> elements
+
+    Returns:
+        The row, or None for short and playerless rows
+    """
+    if not cells or len(cells) <= MAX_EXPECTED_CELL_INDEX:
+        return None
+
+    # The player column is read without separators, like get_text(strip=True)
+    player_name = sanitize_text(''.join(string.strip() for string in cells[COL_PLAYER_NAME].strings))
+    if not player_name:
+        return None
+
+    adventurer_cell = cells[COL_ADVENTURER_NAME]
+    if adventurer_cell.link_strings is not None:
+        adventurer_name = sanitize_text(''.join(adventurer_cell.link_strings))
+        adventurer_url = adventurer_cell.href
+    else:
+        adventurer_name = adventurer_cell.text()
+        adventurer_url = ""
+
+    return [
+        player_name,
+        adventurer_name,
+        adventurer_url,
+        cells[COL_SPIRIT_CORE].text(),
+        cells[COL_RACE].text(),
+        cells[COL_SUB_RACE].text(),
+        cells[COL_TIER_1_CLASS].text(),
+        cells[COL_TIER_2_CLASS].text(),
+        cells[COL_TIER_3_CLASS].text(),
+        cells[COL_EXPEDITION_DEPARTURE].text(),
+        cells[COL_EXPEDITION_RETURN].text(),
+        cells[COL_IP_LOCKOUT_END].text(),
+    ]
+
+def iter_census_rows(input_html_path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[list[str]]:
+    """
+    Stream the character rows of a census HTML export.
+
+    The file is fed to CensusRowParser in chunks and rows are yielded as soon
+    as they are complete; the two header rows of the sheet are skipped.
+
+    Raises:
+        ValueError: If the file has no table.waffle or no tbody in it
+    """
+    parser = CensusRowParser()
+    table_row_index = 0
+    with open(input_html_path, 'r', encoding='utf-8') as f:
+        while not parser.done:
+            chunk = f.read(chunk_size)
+            if chunk:
+                parser.feed(chunk)
+            else:
+                parser.close()
+            for cells in parser.rows:
+                if table_row_index >= 2:
+                    row = census_row(cells)
+                    if row is not None:
+                        yield row
+                table_row_index += 1
+            parser.rows.clear()
+            if not chunk:
+                break
+
+    if not parser.found_table:
+        raise ValueError("Could not find the table with class 'waffle'.")
+    if not parser.found_tbody:
+        raise ValueError("Could not find tbody in the table.")
+
+def get_cell_text(cell_tag) -> str:
     if not cell_tag:
         return ""
     span_s6 = cell_tag.find('span', class_='s6')
@@ -39,27 +238,28 @@ def get_cell_text(cell_tag: Tag | None) -> str:
         text_content = cell_tag.get_text(separator=' ', strip=True)
     return sanitize_text(text_content)
 
-def convert_html_to_tsv(input_html_path: str, output_tsv_path: str):
-    if not os.path.exists(input_html_path):
-        print(f"Error: Input HTML file not found at {input_html_path}")
-        return
+def iter_census_rows_soup(input_html_path: str, backend: str | None = None) -> Iterator[list[str]]:
+    """
+    Extract the same rows from a full BeautifulSoup tree.
 
-    all_rows_data = []
+    Kept to cross-check the streaming extractor; needs BeautifulSoup and reads
+    the whole file into memory.
+    """
+    from bs4 import BeautifulSoup
 
     with open(input_html_path, 'r', encoding='utf-8') as f:
         html_content = f.read()
 
-    soup = BeautifulSoup(html_content, 'html.parser')
+    # Same switch as core.parser.make_soup; lxml is much faster on the full census sheet
+    soup = BeautifulSoup(html_content, backend or os.environ.get('SCRAPER_HTML_BACKEND', 'html.parser'))
 
     table = soup.find('table', class_='waffle')
     if not table:
-        print("Error: Could not find the table with class 'waffle'.")
-        return
+        raise ValueError("Could not find the table with class 'waffle'.")
 
     tbody = table.find('tbody')
     if not tbody:
-        print("Error: Could not find tbody in the table.")
-        return
+        raise ValueError("Could not find tbody in the table.")
 
     data_table_rows = tbody.find_all('tr', recursive=False)[2:]
 
@@ -75,9 +275,7 @@ def convert_html_to_tsv(input_html_path: str, output_tsv_path: str):
         player_name = sanitize_text(player_name_raw)
 
         if not player_name:
-            all_cells_empty_looking = all(not sanitize_text(cell.get_text()) for cell in cells)
-            if all_cells_empty_looking:
-                continue
+            continue
 
         adventurer_name = ""
         adventurer_url = ""
@@ -90,48 +288,62 @@ def convert_html_to_tsv(input_html_path: str, output_tsv_path: str):
             else:
                 adventurer_name = get_cell_text(adv_name_cell)
 
-        spirit_core = get_text_from_cell_idx(COL_SPIRIT_CORE)
-        race = get_text_from_cell_idx(COL_RACE)
-        sub_race = get_text_from_cell_idx(COL_SUB_RACE)
-        tier1_class = get_text_from_cell_idx(COL_TIER_1_CLASS)
-        tier2_class = get_text_from_cell_idx(COL_TIER_2_CLASS)
-        tier3_class = get_text_from_cell_idx(COL_TIER_3_CLASS)
-        expedition_departure = get_text_from_cell_idx(COL_EXPEDITION_DEPARTURE)
-        expedition_return = get_text_from_cell_idx(COL_EXPEDITION_RETURN)
-        ip_lockout_end = get_text_from_cell_idx(COL_IP_LOCKOUT_END)
-
-        if player_name:
-            all_rows_data.append([
-                player_name,
-                adventurer_name,
-                adventurer_url,
-                spirit_core,
-                race,
-                sub_race,
-                tier1_class,
-                tier2_class,
-                tier3_class,
-                expedition_departure,
-                expedition_return,
-                ip_lockout_end,
-            ])
-
-    headers = [
-        "Player Name", "Adventurer Name", "Adventurer URL", "Spirit Core (Current)",
-        "Race", "Sub-Race", "Tier 1 Class", "Tier 2 Class", "Tier 3 Class",
-        "Exepdition Departure", "Expedition Return", "IP Lockout End"
-    ]
+        yield [
+            player_name,
+            adventurer_name,
+            adventurer_url,
+            get_text_from_cell_idx(COL_SPIRIT_CORE),
+            get_text_from_cell_idx(COL_RACE),
+            get_text_from_cell_idx(COL_SUB_RACE),
+            get_text_from_cell_idx(COL_TIER_1_CLASS),
+            get_text_from_cell_idx(COL_TIER_2_CLASS),
+            get_text_from_cell_idx(COL_TIER_3_CLASS),
+            get_text_from_cell_idx(COL_EXPEDITION_DEPARTURE),
+            get_text_from_cell_idx(COL_EXPEDITION_RETURN),
+            get_text_from_cell_idx(COL_IP_LOCKOUT_END),
+        ]
+
+def convert_html_to_tsv(input_html_path: str, output_tsv_path: str, backend: str | None = None) -> int:
+    """
+    Convert a census HTML export to TSV, writing rows as they are extracted.
+
+    Args:
+        input_html_path: Google Sheets HTML export of the census
+        output_tsv_path: TSV file to write
+        backend: BeautifulSoup backend; None uses the streaming extractor
+
+    Returns:
+        Number of character rows written
+    """
+    if not os.path.exists(input_html_path):
+        print(f"Error: Input HTML file not found at {input_html_path}")
+        return 0
+
+    rows = iter_census_rows_soup(input_html_path, backend) if backend else iter_census_rows(input_html_path)
 
-    with open(output_tsv_path, 'w', newline='', encoding='utf-8') as tsvfile:
-        writer = csv.writer(tsvfile, delimiter='\t')
-        writer.writerow(headers)
-        writer.writerows(all_rows_data)
+    # Written next to the target and moved into place, so a failed run leaves no partial TSV
+    temp_path = output_tsv_path + '.tmp'
+    count = 0
+    try:
+        with open(temp_path, 'w', newline='', encoding='utf-8') as tsvfile:
+            writer = csv.writer(tsvfile, delimiter='\t')
+            writer.writerow(HEADERS)
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+    except ValueError as e:
+        os.remove(temp_path)
+        print(f"Error: {e}")
+        return 0
+    os.replace(temp_path, output_tsv_path)
 
     print(f"Successfully converted HTML to TSV at {output_tsv_path}")
+    return count
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description="Convert Mirane Census HTML to TSV.")
     parser.add_argument("input_html", help="Path to the input HTML file")
     parser.add_argument("-o", "--output", help="Path to output TSV file (default: mirane_census_output.tsv)", default="mirane_census_output.tsv")
+    parser.add_argument("--backend", choices=["html.parser", "lxml", "html5lib"], help="Extract with a full BeautifulSoup tree using this backend instead of streaming (for cross-checking)")
     args = parser.parse_args()
-    convert_html_to_tsv(args.input_html, args.output)
+    convert_html_to_tsv(args.input_html, args.output, backend=args.backend)
@@ -36,15 +36,58 @@ def build_class_map(rows):
 def escape(s):
     return s.replace("'", "''")
 
+DDL = [
+    "DROP TABLE IF EXISTS census_character_classes CASCADE;",
+    "DROP TABLE IF EXISTS census_classes CASCADE;",
+    "DROP TABLE IF EXISTS census_characters CASCADE;",
+    "CREATE TABLE census_classes(id SERIAL PRIMARY KEY, name TEXT UNIQUE NOT NULL, tier INT NOT NULL);",
+    "CREATE TABLE census_characters(id SERIAL PRIMARY KEY, created_at TIMESTAMP NOT NULL DEFAULT now(), player_name TEXT, adventurer_name TEXT, adventurer_url TEXT, spirit_core_current INT, race TEXT, sub_race TEXT, expedition_departure DATE, expedition_return DATE, ip_lockout_end DATE);",
+    "CREATE TABLE census_character_classes(character_id INT REFERENCES census_characters(id), class_id INT REFERENCES census_classes(id), PRIMARY KEY(character_id, class_id));",
+]
+
+CHARACTER_COLUMNS = ('player_name', 'adventurer_name', 'adventurer_url', 'spirit_core_current', 'race', 'sub_race',
+                     'expedition_departure', 'expedition_return', 'ip_lockout_end')
+
+def character_values(row):
+    """Column values of a census row (unescaped; None for NULL), in CHARACTER_COLUMNS order."""
+    # handle shifted columns for missing spirit core
+    raw_spirit = row.get('Spirit Core (Current)', '').strip()
+    raw_race = row.get('Race', '').strip()
+    raw_sub = row.get('Sub-Race', '').strip()
+    raw_t1 = row.get('Tier 1 Class', '').strip()
+    if not raw_spirit and raw_race.isdigit():
+        spirit_val = raw_race
+        race_val = raw_sub
+        sub_val = raw_t1
+    else:
+        spirit_val = raw_spirit or None
+        race_val = raw_race
+        sub_val = raw_sub
+    return (
+        row.get('Player Name',''),
+        row.get('Adventurer Name',''),
+        row.get('Adventurer URL',''),
+        spirit_val,
+        race_val,
+        sub_val,
+        row.get('Exepdition Departure','') or None,
+        row.get('Expedition Return','') or None,
+        row.get('IP Lockout End','') or None,
+    )
+
+def row_classes(row):
+    """Known class names of a census row, in column order."""
+    class_list = []
+    for col in ('Tier 1 Class','Tier 2 Class','Tier 3 Class'):
+        for raw in row.get(col, '').split(','):
+            cname = raw.strip()
+            if cname and cname in VALID_CLASSES:
+                class_list.append(cname)
+    return class_list
+
 def generate_sql(rows, class_map):
-    stmts = []
-    # DDL
-    stmts.append("DROP TABLE IF EXISTS census_character_classes CASCADE;")
-    stmts.append("DROP TABLE IF EXISTS census_classes CASCADE;")
-    stmts.append("DROP TABLE IF EXISTS census_characters CASCADE;")
-    stmts.append("CREATE TABLE census_classes(id SERIAL PRIMARY KEY, name TEXT UNIQUE NOT NULL, tier INT NOT NULL);")
-    stmts.append("CREATE TABLE census_characters(id SERIAL PRIMARY KEY, created_at TIMESTAMP NOT NULL DEFAULT now(), player_name TEXT, adventurer_name TEXT, adventurer_url TEXT, spirit_core_current INT, race TEXT, sub_race TEXT, expedition_departure DATE, expedition_return DATE, ip_lockout_end DATE);")
-    stmts.append("CREATE TABLE census_character_classes(character_id INT REFERENCES census_characters(id), class_id INT REFERENCES census_classes(id), PRIMARY KEY(character_id, class_id));")
+    """One INSERT per class and a CTE statement pair per character (ids assigned by the database)."""
+    stmts = list(DDL)
     # insert classes
     stmts.append("\n-- insert census_classes")
     for name, tier in class_map.items():
@@ -52,58 +95,112 @@ def generate_sql(rows, class_map):
     # insert characters
     stmts.append("\n-- insert characters and relationships")
     for idx, row in enumerate(rows, 1):
-        # handle shifted columns for missing spirit core
-        raw_spirit = row.get('Spirit Core (Current)', '').strip()
-        raw_race = row.get('Race', '').strip()
-        raw_sub = row.get('Sub-Race', '').strip()
-        raw_t1 = row.get('Tier 1 Class', '').strip()
-        if not raw_spirit and raw_race.isdigit():
-            spirit_val = raw_race
-            race_val = raw_sub
-            sub_val = raw_t1
-        else:
-            spirit_val = raw_spirit or None
-            race_val = raw_race
-            sub_val = raw_sub
-        vals = {
-            'player': escape(row.get('Player Name','')),
-            'adv': escape(row.get('Adventurer Name','')),
-            'url': escape(row.get('Adventurer URL','')),
-            'spirit': spirit_val,
-            'race': escape(race_val),
-            'sub': escape(sub_val),
-            'dep': row.get('Exepdition Departure','') or None,
-            'ret': row.get('Expedition Return','') or None,
-            'lock': row.get('IP Lockout End','') or None,
-        }
-        spirit = vals['spirit'] if vals['spirit'] is not None else 'NULL'
-        dep = f"'{vals['dep']}'" if vals['dep'] else 'NULL'
-        ret = f"'{vals['ret']}'" if vals['ret'] else 'NULL'
-        lock = f"'{vals['lock']}'" if vals['lock'] else 'NULL'
+        player, adv, url, spirit_val, race, sub, dep, ret, lock = character_values(row)
+        spirit = spirit_val if spirit_val is not None else 'NULL'
+        dep = f"'{dep}'" if dep else 'NULL'
+        ret = f"'{ret}'" if ret else 'NULL'
+        lock = f"'{lock}'" if lock else 'NULL'
         stmts.append(f"-- row {idx}")
         stmts.append("WITH c AS ("
                      f"INSERT INTO census_characters(player_name,adventurer_name,adventurer_url,spirit_core_current,race,sub_race,expedition_departure,expedition_return,ip_lockout_end) VALUES('"+
-                     f"{vals['player']}','{vals['adv']}','{vals['url']}',{spirit},'"+f"{vals['race']}','{vals['sub']}',{dep},{ret},{lock}) RETURNING id)"
+                     f"{escape(player)}','{escape(adv)}','{escape(url)}',{spirit},'"+f"{escape(race)}','{escape(sub)}',{dep},{ret},{lock}) RETURNING id)"
                     )
         # relationship
-        class_list = []
-        for col in ('Tier 1 Class','Tier 2 Class','Tier 3 Class'):
-            for raw in row.get(col, '').split(','):
-                cname = raw.strip()
-                if cname and cname in VALID_CLASSES:
-                    class_list.append(cname)
-        names = ",".join(f"'{escape(c)}'" for c in class_list)
+        names = ",".join(f"'{escape(c)}'" for c in row_classes(row))
         stmts.append(f"INSERT INTO census_character_classes(character_id,class_id) SELECT c.id, cl.id FROM c, census_classes cl WHERE cl.name IN ({names});")
     return "\n".join(stmts)
 
+def build_tables(rows, class_map):
+    """
+    Rows of the three census tables with ids assigned here instead of by the database.
+
+    Class ids follow class_map order and character ids the TSV order; class
+    links are resolved through an in-memory name -> id map.
+
+    Returns:
+        (class rows, character rows, character_class rows), each row starting with its id(s)
+    """
+    class_ids = {name: idx for idx, name in enumerate(class_map, 1)}
+    class_rows = [(class_ids[name], name, tier) for name, tier in class_map.items()]
+    character_rows = []
+    link_rows = []
+    for character_id, row in enumerate(rows, 1):
+        character_rows.append((character_id, *character_values(row)))
+        linked = set()
+        for name in row_classes(row):
+            class_id = class_ids.get(name)
+            if class_id is not None and class_id not in linked:
+                linked.add(class_id)
+                link_rows.append((character_id, class_id))
+    return class_rows, character_rows, link_rows
+
+def sql_literal(value, raw=False):
+    if value is None:
+        return 'NULL'
+    if raw or isinstance(value, int):
+        return str(value)
+    return f"'{escape(value)}'"
+
+def copy_value(value):
+    if value is None:
+        return '\\N'
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+def generate_bulk_sql(rows, class_map, copy=False):
+    """
+    One statement per table: multi-row INSERTs (or psql COPY blocks) with client-side ids.
+
+    Args:
+        rows: Census TSV rows
+        class_map: Class name -> tier, as from build_class_map
+        copy: Emit COPY ... FROM stdin blocks (psql only) instead of INSERTs
+    """
+    class_rows, character_rows, link_rows = build_tables(rows, class_map)
+    tables = [
+        ('census_classes', ('id', 'name', 'tier'), class_rows),
+        ('census_characters', ('id',) + CHARACTER_COLUMNS, character_rows),
+        ('census_character_classes', ('character_id', 'class_id'), link_rows),
+    ]
+    # spirit_core_current is written unquoted, as in the per-row output
+    spirit_index = 1 + CHARACTER_COLUMNS.index('spirit_core_current')
+    stmts = list(DDL)
+    for table, columns, table_rows in tables:
+        stmts.append(f"\n-- insert {table}")
+        if not table_rows:
+            continue
+        if copy:
+            stmts.append(f"COPY {table}({','.join(columns)}) FROM stdin;")
+            stmts.extend('\t'.join(copy_value(value) for value in table_row) for table_row in table_rows)
+            stmts.append("\\.")
+        else:
+            values = ",\n".join(
+                "(" + ",".join(sql_literal(value, raw=(table == 'census_characters' and i == spirit_index))
+                               for i, value in enumerate(table_row)) + ")"
+                for table_row in table_rows)
+            stmts.append(f"INSERT INTO {table}({','.join(columns)}) VALUES\n{values};")
+    # Explicit ids leave the SERIAL sequences behind; move them past the loaded rows
+    stmts.append("\n-- advance id sequences")
+    stmts.append("SELECT setval(pg_get_serial_sequence('census_classes','id'), "
+                 f"{max(len(class_rows), 1)}, {'true' if class_rows else 'false'}), "
+                 "setval(pg_get_serial_sequence('census_characters','id'), "
+                 f"{max(len(character_rows), 1)}, {'true' if character_rows else 'false'});")
+    return "\n".join(stmts)
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('tsv', help='input TSV path')
     parser.add_argument('sql', help='output SQL file path')
+    parser.add_argument('--per-row', action='store_true', help='emit a statement pair per character (the old output) instead of one statement per table')
+    parser.add_argument('--copy', action='store_true', help='emit COPY FROM stdin blocks instead of INSERTs (psql only)')
     args = parser.parse_args()
+    if args.per_row and args.copy:
+        parser.error('--copy cannot be combined with --per-row')
     rows = parse_tsv(args.tsv)
     classes = build_class_map(rows)
-    sql = generate_sql(rows, classes)
+    if args.per_row:
+        sql = generate_sql(rows, classes)
+    else:
+        sql = generate_bulk_sql(rows, classes, copy=args.copy)
     with open(args.sql, 'w', encoding='utf-8') as f:
         f.write(sql)
     print(f'SQL written to {args.sql}')
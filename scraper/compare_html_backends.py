@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Differential check for the HTML backends used by the parsers.
+
+Runs every parser over the same saved HTML once per backend (selected through
+SCRAPER_HTML_BACKEND, see core.parser.make_soup) and compares the output files
+byte for byte. Only generated_at timestamps are ignored. A faster backend is
+safe to switch on for a version once this reports no differences.
+
+Usage:
+    python compare_html_backends.py --version 0.10.1 [--backends html.parser lxml] [--data-types TYPE1 TYPE2 ...]
+"""
+
+import argparse
+import logging
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from core.parser import HTML_BACKENDS
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Parser CLI module per data type (arguments are built by parser_command)
+PARSER_MODULES = {
+    'keywords': 'parsers.keyword_parser',
+    'abilities': 'parsers.ability_parser',
+    'monster-abilities': 'parsers.ability_parser',
+    'races': 'parsers.race_parser',
+    'items': 'parsers.item_parser',
+    'breakthroughs': 'parsers.breakthrough_parser',
+    'classes': 'parsers.class_parser',
+    'monsters': 'parsers.monster_parser',
+}
+
+# Lines that legitimately differ between two runs
+VOLATILE_LINE = re.compile(rb'^\s*"?generated_at"?\s*:.*$', re.MULTILINE)
+
+
+def parser_command(data_type: str, html_root: Path, version: str, output_dir: Path) -> List[str]:
+    """Build the parser CLI invocation for one data type."""
+    cmd = [sys.executable, '-m', PARSER_MODULES[data_type]]
+    if data_type == 'races':
+        cmd += ['--input-base-dir', str(html_root)]
+    else:
+        cmd.append(str(html_root / version / data_type))
+    cmd += ['--version', version, '--output-dir', str(output_dir)]
+    if data_type == 'monster-abilities':
+        cmd.append('--monster')
+    return cmd
+
+
+def run_backend(backend: str, data_types: List[str], html_root: Path, version: str,
+                output_dir: Path) -> Dict[str, float]:
+    """Parse every data type with one backend, returning seconds spent per type."""
+    env = {**os.environ, 'SCRAPER_HTML_BACKEND': backend}
+    timings = {}
+    
+    for data_type in data_types:
+        start = time.perf_counter()
+        result = subprocess.run(parser_command(data_type, html_root, version, output_dir),
+                                capture_output=True, text=True, env=env)
+        timings[data_type] = time.perf_counter() - start
+        
+        if result.returncode != 0:
+            logger.error(f"❌ {backend}: {data_type} parser failed: {result.stderr.strip()[-500:]}")
+        else:
+            logger.info(f"{backend}: parsed {data_type} in {timings[data_type]:.2f}s")
+    
+    return timings
+
+
+def read_normalized(path: Path) -> bytes:
+    """Read an output file with volatile lines blanked out."""
+    return VOLATILE_LINE.sub(b'', path.read_bytes())
+
+
+def compare_trees(reference: Path, candidate: Path) -> List[Tuple[str, str]]:
+    """
+    Compare two parser output trees.
+    
+    Args:
+        reference: Output directory of the reference backend
+        candidate: Output directory of the backend being checked
+    
+    Returns:
+        List of (relative path, problem) tuples; empty when the outputs match
+    """
+    ref_files = {p.relative_to(reference) for p in reference.rglob('*') if p.is_file()}
+    cand_files = {p.relative_to(candidate) for p in candidate.rglob('*') if p.is_file()}
+    
+    problems = []
+    for rel in sorted(ref_files - cand_files):
+        problems.append((str(rel), 'missing'))
+    for rel in sorted(cand_files - ref_files):
+        problems.append((str(rel), 'unexpected'))
+    for rel in sorted(ref_files & cand_files):
+        if read_normalized(reference / rel) != read_normalized(candidate / rel):
+            problems.append((str(rel), 'differs'))
+    
+    return problems
+
+
+def resolve_version(html_root: Path, version: str) -> str:
+    """Resolve 'latest' to the version directory the symlink points at."""
+    latest = html_root / version
+    if version == 'latest' and latest.is_symlink():
+        return latest.resolve().name
+    return version
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Check that all HTML backends produce identical parser output")
+    parser.add_argument('--version', default='latest', help='Game version to parse')
+    parser.add_argument('--html-dir', default='scraped_html', help='Base directory of fetched HTML')
+    parser.add_argument('--backends', nargs='+', choices=HTML_BACKENDS, default=['html.parser', 'lxml'],
+                        help='Backends to compare; the first one is the reference')
+    parser.add_argument('--data-types', nargs='+', choices=list(PARSER_MODULES),
+                        default=list(PARSER_MODULES), help='Data types to compare (default: all)')
+    parser.add_argument('--keep', action='store_true', help='Keep the output directories for inspection')
+    args = parser.parse_args()
+    
+    html_root = Path(args.html_dir)
+    version = resolve_version(html_root, args.version)
+    work_dir = Path(tempfile.mkdtemp(prefix='backend-check-'))
+    
+    timings = {}
+    for backend in args.backends:
+        timings[backend] = run_backend(backend, args.data_types, html_root, version, work_dir / backend)
+    
+    reference = args.backends[0]
+    failed = False
+    for backend in args.backends[1:]:
+        for data_type in args.data_types:
+            problems = compare_trees(work_dir / reference / version / data_type,
+                                     work_dir / backend / version / data_type)
+            speedup = timings[reference][data_type] / max(timings[backend][data_type], 1e-9)
+            if problems:
+                failed = True
+                logger.error(f"❌ {backend} vs {reference}: {data_type} has {len(problems)} differing files")
+                for rel, problem in problems[:20]:
+                    logger.error(f"    {problem}: {rel}")
+            else:
+                logger.info(f"✅ {backend} matches {reference} for {data_type} ({speedup:.1f}x)")
+    
+    if args.keep:
+        logger.info(f"Outputs kept in {work_dir}")
+    else:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,25 @@
 """
 Core scraper modules providing base functionality.
+
+Submodules are imported on first use, so light ones (storage) can be used by
+the exporters and converters without pulling in Selenium or BeautifulSoup.
 """
-from .fetcher import BaseFetcher
-from .parser import BaseParser
-from .utils import *
+from importlib import import_module
+
+__all__ = ['BaseFetcher', 'BaseParser']
+
+_EXPORTS = {
+    'BaseFetcher': '.fetcher',
+    'BaseParser': '.parser',
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(import_module(_EXPORTS[name], __name__), name)
 
-__all__ = ['BaseFetcher', 'BaseParser']
\ No newline at end of file
+    # Utilities used to be star-imported here
+    utils = import_module('.utils', __name__)
+    if hasattr(utils, name):
+        return getattr(utils, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Capture of the JSON payloads behind the Lyrian Chronicles pages.
+
+The Angular site loads its data over XHR. A browser fetcher run with
+``--capture-api`` records every JSON payload the app receives on the list page
+and one detail page (see BaseFetcher.capture_api_payloads) and saves them as
+``_api_capture.json`` next to the HTML. These recordings are what per-type
+JSON mappers would be written and tested against; until such mappers exist,
+data is still fetched and parsed from the rendered HTML.
+"""
+import json
+import time
+import logging
+from pathlib import Path
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_FILENAME = "_api_capture.json"
+
+# Injected before any page script runs; records every JSON body the app
+# receives through fetch() or XMLHttpRequest into window.__lcApiCapture.
+CAPTURE_SCRIPT = """
+(function () {
+    if (window.__lcApiCapture) return;
+    var captured = window.__lcApiCapture = [];
+
+    function record(url, text) {
+        try { captured.push({url: url, body: JSON.parse(text)}); } catch (e) {}
+    }
+
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function () {
+            return originalFetch.apply(this, arguments).then(function (response) {
+                response.clone().text().then(function (text) { record(response.url, text); });
+                return response;
+            });
+        };
+    }
+
+    var originalOpen = XMLHttpRequest.prototype.open;
+    XMLHttpRequest.prototype.open = function (method, url) {
+        this.__lcUrl = url;
+        return originalOpen.apply(this, arguments);
+    };
+
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        this.addEventListener('load', function () {
+            var url = this.responseURL || this.__lcUrl;
+            if (this.responseType === '' || this.responseType === 'text') {
+                record(url, this.responseText);
+            } else if (this.responseType === 'json' && this.response !== null) {
+                captured.push({url: url, body: this.response});
+            }
+        });
+        return originalSend.apply(this, arguments);
+    };
+})();
+"""
+
+# Drains the payloads captured so far (splice keeps the hook's array reference)
+DRAIN_CAPTURE_SCRIPT = "return (window.__lcApiCapture || []).splice(0);"
+
+
+def save_capture(output_dir: Path, pages: Dict[str, List[Dict[str, Any]]]) -> Path:
+    """
+    Write captured payloads to ``_api_capture.json``.
+    
+    Args:
+        output_dir: The data type's fetch directory
+        pages: Page URL -> captured ``{'url', 'body'}`` payloads received on that page
+    
+    Returns:
+        Path to the saved file
+    """
+    path = Path(output_dir) / CAPTURE_FILENAME
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'captured_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'pages': [{'page': page, 'payloads': payloads} for page, payloads in pages.items()],
+        }, f, indent=2, ensure_ascii=False)
+    logger.info(f"Saved {sum(len(payloads) for payloads in pages.values())} captured payloads to {path}")
+    return path
+
+
+def add_api_arguments(parser) -> None:
+    """Add the ``--capture-api`` option shared by fetcher CLIs."""
+    parser.add_argument('--capture-api', action='store_true',
+                        help='Record the JSON payloads behind this data type instead of fetching')
@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+Changelog between two game versions of the parsed data.
+
+For every data type the two versions are compared file by file on content
+hashes (manifests of the release store, or file hashes of two parsed_data
+directories). Both hash the files without their volatile ``version`` and
+``generated_at`` fields, so records that were only re-parsed for the new
+version are never loaded. Only the records that differ are parsed and
+classified as:
+
+- added / removed: an id exists in one version only
+- renamed: a removed and an added record that are the same entity under a new
+  id, matched on identical content or on text similarity (candidates are only
+  scored when they share a name token or description opening, which keeps
+  matching near-linear)
+- modified: same id, with a field-level diff; cost, keyword, requirement and
+  description changes are tagged so they can be highlighted
+
+The changelog renders as YAML, Markdown, or a JSON-lines feed with one event
+per change.
+"""
+import re
+import json
+import difflib
+import logging
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .entity_index import ENTITY_TYPES, normalize_name
+from .release_store import VOLATILE_FIELDS, ReleaseStore, hash_bytes, normalize_content
+from .storage import RecordStore, dump_yaml, iter_record_files
+
+logger = logging.getLogger(__name__)
+
+# Change kinds highlighted in the changelog, in display order
+CHANGE_KINDS = ('cost', 'keywords', 'requirements', 'description', 'other')
+
+DEFAULT_RENAME_THRESHOLD = 0.8
+
+
+def change_kind(field: str) -> str:
+    """Classify a top-level field for highlighting."""
+    if 'cost' in field:
+        return 'cost'
+    if field == 'keywords':
+        return 'keywords'
+    if 'requirement' in field or field == 'prerequisites':
+        return 'requirements'
+    if 'description' in field:
+        return 'description'
+    return 'other'
+
+
+def _unwrap(record: Any) -> Dict[str, Any]:
+    """Class files wrap their record in a 'class' key."""
+    if isinstance(record, dict) and isinstance(record.get('class'), dict):
+        return record['class']
+    return record if isinstance(record, dict) else {}
+
+
+def _content_hash(record: Dict[str, Any], exclude: Iterable[str] = ()) -> str:
+    """Hash of a record without volatile (and optionally identifying) fields."""
+    skipped = set(VOLATILE_FIELDS).union(exclude)
+    content = {key: value for key, value in record.items() if key not in skipped}
+    return hash_bytes(json.dumps(content, sort_keys=True, default=str).encode('utf-8'))
+
+
+class DirectorySource:
+    """Records of one version read from parsed_data/<version>."""
+    
+    def __init__(self, data_dir: Union[str, Path], version: str):
+        self.version = version
+        self.version_dir = Path(data_dir) / version
+        if not self.version_dir.is_dir():
+            raise FileNotFoundError(f"Version directory not found: {self.version_dir}")
+        self.record_store = RecordStore()
+    
+    def files(self, data_type: str) -> Dict[str, str]:
+        """Record paths (relative to the type directory) -> content hash, as the release store hashes them."""
+        type_dir = self.version_dir / data_type
+        if not type_dir.is_dir():
+            return {}
+        return {
+            path.relative_to(type_dir).as_posix(): hash_bytes(normalize_content(path.name, path.read_bytes()))
+            for path in iter_record_files(type_dir)
+        }
+    
+    def load(self, data_type: str, path: str, content_hash: str) -> Any:
+        return self.record_store.load(self.version_dir / data_type / path)
+
+
+class StoreSource:
+    """Records of one version read from the content-addressed release store."""
+    
+    def __init__(self, store: ReleaseStore, version: str):
+        self.store = store
+        self.version = store.resolve_version(version)
+    
+    def files(self, data_type: str) -> Dict[str, str]:
+        return {
+            path: blob_hash for path, blob_hash in self.store.files(data_type, self.version).items()
+            if path.endswith('.yaml') and not path.endswith('_index.yaml')
+        }
+    
+    def load(self, data_type: str, path: str, content_hash: str) -> Any:
+        return self.store.load_blob(content_hash)
+
+
+def diff_records(old: Dict[str, Any], new: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Field-level differences between two versions of a record.
+    
+    Returns:
+        One change per differing top-level field, with its kind, the old and new
+        values, and for list fields the entries added and removed
+    """
+    changes = []
+    for field in list(old) + [key for key in new if key not in old]:
+        if field in VOLATILE_FIELDS or field == 'id':
+            continue
+        old_value, new_value = old.get(field), new.get(field)
+        if old_value == new_value:
+            continue
+        
+        change = {'field': field, 'kind': change_kind(field), 'old': old_value, 'new': new_value}
+        if isinstance(old_value, list) and isinstance(new_value, list):
+            old_keys = [json.dumps(item, sort_keys=True, default=str) for item in old_value]
+            new_keys = [json.dumps(item, sort_keys=True, default=str) for item in new_value]
+            old_set, new_set = set(old_keys), set(new_keys)
+            change['added'] = [item for item, key in zip(new_value, new_keys) if key not in old_set]
+            change['removed'] = [item for item, key in zip(old_value, old_keys) if key not in new_set]
+        changes.append(change)
+    return changes
+
+
+def _similarity_text(record: Dict[str, Any]) -> str:
+    keywords = ' '.join(sorted(str(keyword) for keyword in record.get('keywords') or []))
+    return f"{record.get('name', '')}\n{keywords}\n{record.get('description') or ''}"
+
+
+def _blocking_keys(record: Dict[str, Any]) -> set:
+    """Keys a rename pair must share before it is scored."""
+    keys = {f"name:{token}" for token in normalize_name(record.get('name', '')).split('_') if len(token) > 2}
+    description = re.sub(r'\s+', ' ', str(record.get('description') or '')).strip().lower()
+    if description:
+        keys.add(f"description:{description[:48]}")
+    return keys
+
+
+def match_renames(removed: Dict[str, Dict[str, Any]], added: Dict[str, Dict[str, Any]],
+                  threshold: float = DEFAULT_RENAME_THRESHOLD) -> List[Tuple[str, str, float]]:
+    """
+    Pair removed and added records that are the same entity under a new id.
+    
+    Args:
+        removed: id -> record only in the old version
+        added: id -> record only in the new version
+        threshold: Minimum similarity (0-1) for a rename
+    
+    Returns:
+        (old id, new id, similarity) per rename, best matches first
+    """
+    pairs = []
+    taken_old, taken_new = set(), set()
+    
+    # Identical content under a different id or name
+    by_content = defaultdict(list)
+    for new_id, record in added.items():
+        by_content[_content_hash(record, exclude=('id', 'name'))].append(new_id)
+    for old_id, record in removed.items():
+        candidates = [new_id for new_id in by_content.get(_content_hash(record, exclude=('id', 'name')), [])
+                      if new_id not in taken_new]
+        if candidates:
+            pairs.append((old_id, candidates[0], 1.0))
+            taken_old.add(old_id)
+            taken_new.add(candidates[0])
+    
+    # Similar text, scored only within shared blocks
+    blocks = defaultdict(set)
+    for new_id, record in added.items():
+        if new_id not in taken_new:
+            for key in _blocking_keys(record):
+                blocks[key].add(new_id)
+    
+    scored = []
+    texts = {new_id: _similarity_text(record) for new_id, record in added.items()}
+    for old_id, record in removed.items():
+        if old_id in taken_old:
+            continue
+        candidates = set().union(*(blocks.get(key, set()) for key in _blocking_keys(record)))
+        old_text = _similarity_text(record)
+        for new_id in candidates:
+            matcher = difflib.SequenceMatcher(None, old_text, texts[new_id], autojunk=False)
+            if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+                continue
+            score = matcher.ratio()
+            if score >= threshold:
+                scored.append((score, old_id, new_id))
+    
+    for score, old_id, new_id in sorted(scored, key=lambda entry: (-entry[0], entry[1], entry[2])):
+        if old_id not in taken_old and new_id not in taken_new:
+            pairs.append((old_id, new_id, round(score, 3)))
+            taken_old.add(old_id)
+            taken_new.add(new_id)
+    return pairs
+
+
+def compare_type(old_source, new_source, data_type: str,
+                 rename_threshold: float = DEFAULT_RENAME_THRESHOLD) -> Dict[str, Any]:
+    """
+    Compare one data type between two versions.
+    
+    Returns:
+        Dict with 'added', 'removed', 'renamed' and 'modified' entries
+    """
+    old_files, new_files = old_source.files(data_type), new_source.files(data_type)
+    
+    # Files with identical content on both sides are never loaded
+    unchanged = {path for path in old_files.keys() & new_files.keys() if old_files[path] == new_files[path]}
+    
+    def load_changed(source, files) -> Dict[str, Dict[str, Any]]:
+        records = {}
+        for path, content_hash in files.items():
+            if path in unchanged:
+                continue
+            record = _unwrap(source.load(data_type, path, content_hash))
+            records[str(record.get('id') or Path(path).stem)] = record
+        return records
+    
+    old_records = load_changed(old_source, old_files)
+    new_records = load_changed(new_source, new_files)
+    
+    modified = []
+    for entity_id in sorted(old_records.keys() & new_records.keys()):
+        old, new = old_records[entity_id], new_records[entity_id]
+        if _content_hash(old) == _content_hash(new):
+            continue
+        modified.append({'id': entity_id, 'name': new.get('name'), 'changes': diff_records(old, new)})
+    
+    removed = {entity_id: old_records[entity_id] for entity_id in sorted(old_records.keys() - new_records.keys())}
+    added = {entity_id: new_records[entity_id] for entity_id in sorted(new_records.keys() - old_records.keys())}
+    
+    renamed = []
+    for old_id, new_id, similarity in match_renames(removed, added, rename_threshold):
+        old, new = removed.pop(old_id), added.pop(new_id)
+        renamed.append({
+            'old_id': old_id, 'new_id': new_id,
+            'old_name': old.get('name'), 'new_name': new.get('name'),
+            'similarity': similarity,
+            'changes': [change for change in diff_records(old, new) if change['field'] != 'name'],
+        })
+    
+    return {
+        'added': [{'id': entity_id, 'name': added[entity_id].get('name')} for entity_id in sorted(added)],
+        'removed': [{'id': entity_id, 'name': removed[entity_id].get('name')} for entity_id in sorted(removed)],
+        'renamed': sorted(renamed, key=lambda entry: entry['old_id']),
+        'modified': modified,
+        'unchanged': len(unchanged),
+    }
+
+
+def build_changelog(old_source, new_source, data_types: Optional[List[str]] = None,
+                    rename_threshold: float = DEFAULT_RENAME_THRESHOLD) -> Dict[str, Any]:
+    """
+    Compare every data type between two versions.
+    
+    Args:
+        old_source: DirectorySource or StoreSource of the base version
+        new_source: Source of the version compared against it
+        data_types: Types to compare (default: all)
+        rename_threshold: Minimum similarity for rename matches
+    
+    Returns:
+        Changelog dict keyed by data type
+    """
+    changelog = {'from': old_source.version, 'to': new_source.version, 'types': {}}
+    for data_type in data_types or ENTITY_TYPES:
+        result = compare_type(old_source, new_source, data_type, rename_threshold)
+        changelog['types'][data_type] = result
+        logger.info(f"{data_type}: {len(result['added'])} added, {len(result['removed'])} removed, "
+                    f"{len(result['renamed'])} renamed, {len(result['modified'])} modified, "
+                    f"{result['unchanged']} unchanged")
+    return changelog
+
+
+def _format_value(value: Any, limit: int = 120) -> str:
+    if value is None or value == '' or value == []:
+        return '*(none)*'
+    text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False, default=str)
+    text = re.sub(r'\s+', ' ', text)
+    return f"`{text[:limit]}{'…' if len(text) > limit else ''}`"
+
+
+def _format_change(change: Dict[str, Any]) -> str:
+    if 'added' in change:
+        parts = [f"+{_format_value(item)}" for item in change['added']]
+        parts += [f"-{_format_value(item)}" for item in change['removed']]
+        if parts:
+            return f"**{change['field']}**: {', '.join(parts)}"
+    return f"**{change['field']}**: {_format_value(change['old'])} → {_format_value(change['new'])}"
+
+
+def to_markdown(changelog: Dict[str, Any]) -> str:
+    """Render a changelog as Markdown, highlighted change kinds first."""
+    lines = [f"# Changes from {changelog['from']} to {changelog['to']}", ""]
+    for data_type, result in changelog['types'].items():
+        if not any(result[key] for key in ('added', 'removed', 'renamed', 'modified')):
+            continue
+        lines += [f"## {data_type.replace('-', ' ').title()}", ""]
+        
+        if result['added']:
+            lines.append(f"### Added ({len(result['added'])})")
+            lines += [f"- {entry['name'] or entry['id']} (`{entry['id']}`)" for entry in result['added']]
+            lines.append("")
+        if result['removed']:
+            lines.append(f"### Removed ({len(result['removed'])})")
+            lines += [f"- {entry['name'] or entry['id']} (`{entry['id']}`)" for entry in result['removed']]
+            lines.append("")
+        if result['renamed']:
+            lines.append(f"### Renamed ({len(result['renamed'])})")
+            for entry in result['renamed']:
+                lines.append(f"- {entry['old_name']} → {entry['new_name']} "
+                             f"(`{entry['old_id']}` → `{entry['new_id']}`, {entry['similarity']:.0%} similar)")
+                lines += [f"  - {_format_change(change)}" for change in entry['changes']]
+            lines.append("")
+        if result['modified']:
+            lines.append(f"### Modified ({len(result['modified'])})")
+            order = {kind: position for position, kind in enumerate(CHANGE_KINDS)}
+            for entry in result['modified']:
+                lines.append(f"- {entry['name'] or entry['id']} (`{entry['id']}`)")
+                for change in sorted(entry['changes'], key=lambda change: order[change['kind']]):
+                    lines.append(f"  - {_format_change(change)}")
+            lines.append("")
+    return "\n".join(lines)
+
+
+def iter_feed(changelog: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+    """Yield one event per change (one per changed field for modifications)."""
+    base = {'from': changelog['from'], 'to': changelog['to']}
+    for data_type, result in changelog['types'].items():
+        for entry in result['added']:
+            yield {**base, 'type': data_type, 'change': 'added', 'id': entry['id'], 'name': entry['name']}
+        for entry in result['removed']:
+            yield {**base, 'type': data_type, 'change': 'removed', 'id': entry['id'], 'name': entry['name']}
+        for entry in result['renamed']:
+            yield {**base, 'type': data_type, 'change': 'renamed', 'id': entry['new_id'],
+                   'old_id': entry['old_id'], 'name': entry['new_name'], 'old_name': entry['old_name'],
+                   'similarity': entry['similarity']}
+        for entry in result['modified']:
+            for change in entry['changes']:
+                yield {**base, 'type': data_type, 'change': 'modified', 'id': entry['id'],
+                       'name': entry['name'], 'field': change['field'], 'kind': change['kind'],
+                       'old': change['old'], 'new': change['new']}
+
+
+def to_feed(changelog: Dict[str, Any]) -> str:
+    """Render a changelog as JSON lines."""
+    return "".join(json.dumps(event, ensure_ascii=False, default=str) + "\n" for event in iter_feed(changelog))
+
+
+def main():
+    """Write the changelog between two versions."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Changelog of parsed data between two game versions")
+    parser.add_argument('old_version', help='Base version (e.g. 0.10.1)')
+    parser.add_argument('new_version', help='Newer version (e.g. 0.10.2 or latest)')
+    parser.add_argument('--data-dir', default='parsed_data', help='Parsed data root (default: parsed_data)')
+    parser.add_argument('--store', help='Read versions from this release store instead (e.g. parsed_data/_store)')
+    parser.add_argument('--data-types', nargs='+', choices=ENTITY_TYPES, help='Types to compare (default: all)')
+    parser.add_argument('--format', choices=['markdown', 'yaml', 'feed'], default='markdown',
+                        help='Output format (default: markdown)')
+    parser.add_argument('--output', help='Output file (default: stdout)')
+    parser.add_argument('--rename-threshold', type=float, default=DEFAULT_RENAME_THRESHOLD,
+                        help=f'Minimum similarity for renames (default: {DEFAULT_RENAME_THRESHOLD})')
+    args = parser.parse_args()
+    
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
+    if args.store:
+        store = ReleaseStore(args.store)
+        old_source, new_source = StoreSource(store, args.old_version), StoreSource(store, args.new_version)
+    else:
+        old_source = DirectorySource(args.data_dir, args.old_version)
+        new_source = DirectorySource(args.data_dir, args.new_version)
+    
+    changelog = build_changelog(old_source, new_source, args.data_types, args.rename_threshold)
+    
+    if args.format == 'yaml':
+        output = dump_yaml(changelog)
+    elif args.format == 'feed':
+        output = to_feed(changelog)
+    else:
+        output = to_markdown(changelog)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+        logger.info(f"Wrote changelog to {args.output}")
+    else:
+        print(output, end='')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+In-memory index of every parsed entity of one game version.
+
+Built once per run from parsed_data/<version>, it holds an id -> record map per
+data type and a normalized-name -> id map, so converters and exporters can
+resolve cross-entity references (class -> ability, ability -> keyword,
+monster -> monster ability, ...) in constant time, and every dangling
+reference of a version can be reported in one pass.
+"""
+import re
+import logging
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from .storage import RecordStore, iter_record_files
+
+logger = logging.getLogger(__name__)
+
+ENTITY_TYPES = (
+    'keywords', 'abilities', 'monster-abilities', 'classes',
+    'races', 'items', 'breakthroughs', 'monsters',
+)
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normalize an entity name for lookup.
+    
+    Same rules as core.utils.sanitize_id (which most ids are built with),
+    repeated here so the index does not need BeautifulSoup.
+    """
+    clean_name = str(name).strip().lower()
+    clean_name = re.sub(r'[^\w\s-]', '', clean_name)
+    clean_name = re.sub(r'[-\s]+', '_', clean_name)
+    clean_name = re.sub(r'_+', '_', clean_name)
+    return clean_name.strip('_')
+
+
+class DanglingReference(NamedTuple):
+    """A reference from one entity to an entity that does not exist."""
+    
+    source_type: str
+    source_id: str
+    field: str
+    target_type: str
+    reference: str
+
+
+# A reference extractor yields (field, target type, referenced id or name)
+Reference = Tuple[str, str, Any]
+
+
+def _class_references(record: Dict[str, Any]) -> Iterator[Reference]:
+    for level in record.get('progression') or []:
+        for benefit in (level.get('benefits') or []) if isinstance(level, dict) else []:
+            if isinstance(benefit, dict) and benefit.get('type') == 'ability' and benefit.get('ability_id'):
+                yield 'progression', 'abilities', benefit['ability_id']
+    for ref in record.get('ability_references') or []:
+        if isinstance(ref, dict) and ref.get('id'):
+            yield 'ability_references', 'abilities', ref['id']
+
+
+def _ability_references(record: Dict[str, Any]) -> Iterator[Reference]:
+    for keyword in record.get('keywords') or []:
+        yield 'keywords', 'keywords', keyword
+    for ability in record.get('associated_abilities') or []:
+        if isinstance(ability, dict) and ability.get('id'):
+            yield 'associated_abilities', 'abilities', ability['id']
+    if record.get('parent_ability'):
+        yield 'parent_ability', 'abilities', record['parent_ability']
+
+
+def _race_references(record: Dict[str, Any]) -> Iterator[Reference]:
+    for benefit in record.get('benefits') or []:
+        if isinstance(benefit, dict) and benefit.get('type') == 'ability' and benefit.get('id'):
+            yield 'benefits', 'abilities', benefit['id']
+    if record.get('primary_race'):
+        yield 'primary_race', 'races', record['primary_race']
+
+
+def _monster_references(record: Dict[str, Any]) -> Iterator[Reference]:
+    for field in ('abilities', 'active_actions'):
+        for entry in record.get(field) or []:
+            ref = entry.get('id') if isinstance(entry, dict) else entry
+            if ref:
+                yield field, 'monster-abilities', ref
+
+
+REFERENCE_EXTRACTORS: Dict[str, Callable[[Dict[str, Any]], Iterator[Reference]]] = {
+    'classes': _class_references,
+    'abilities': _ability_references,
+    'races': _race_references,
+    'monsters': _monster_references,
+}
+
+
+class EntityIndex:
+    """Id and name lookups over every entity of one version."""
+    
+    def __init__(self):
+        # data type -> id -> record
+        self.records: Dict[str, Dict[str, Dict[str, Any]]] = {data_type: {} for data_type in ENTITY_TYPES}
+        # data type -> normalized name -> id
+        self.names: Dict[str, Dict[str, str]] = {data_type: {} for data_type in ENTITY_TYPES}
+    
+    @classmethod
+    def build(cls, version_dir: Union[str, Path], store: Optional[RecordStore] = None) -> "EntityIndex":
+        """
+        Index every record under a parsed data version directory.
+        
+        Args:
+            version_dir: e.g. parsed_data/0.10.1
+            store: Record store to load through (one is created if omitted)
+        
+        Returns:
+            The populated index
+        """
+        version_dir = Path(version_dir)
+        index = cls()
+        store = store or RecordStore()
+        
+        for data_type in ENTITY_TYPES:
+            type_dir = version_dir / data_type
+            if not type_dir.exists():
+                continue
+            for path in iter_record_files(type_dir):
+                try:
+                    index.add(data_type, store.load(path))
+                except Exception as e:
+                    logger.warning(f"Could not index {path}: {e}")
+        
+        counts = ', '.join(f"{len(records)} {data_type}" for data_type, records in index.records.items() if records)
+        logger.info(f"Indexed {version_dir}: {counts or 'no records'}")
+        return index
+    
+    def add(self, data_type: str, record: Dict[str, Any]):
+        """Add one record as stored in its YAML file (class records are unwrapped)."""
+        if data_type == 'classes' and isinstance(record, dict) and 'class' in record:
+            record = record['class']
+        if not isinstance(record, dict) or not record.get('id'):
+            return
+        
+        entity_id = str(record['id'])
+        self.records[data_type].setdefault(entity_id, record)
+        
+        names = self.names[data_type]
+        names.setdefault(normalize_name(entity_id), entity_id)
+        if record.get('name'):
+            names.setdefault(normalize_name(record['name']), entity_id)
+    
+    def get(self, data_type: str, entity_id: str) -> Optional[Dict[str, Any]]:
+        """Return the record with this id, or None."""
+        return self.records[data_type].get(entity_id)
+    
+    def resolve(self, data_type: str, reference: Any) -> Optional[str]:
+        """
+        Resolve an id or a display name to an entity id.
+        
+        Returns:
+            The id of the matching entity, or None if nothing matches
+        """
+        if reference is None:
+            return None
+        reference = str(reference)
+        if reference in self.records[data_type]:
+            return reference
+        return self.names[data_type].get(normalize_name(reference))
+    
+    def name_of(self, data_type: str, reference: Any) -> Optional[str]:
+        """Return the display name of a referenced entity, or None."""
+        entity_id = self.resolve(data_type, reference)
+        return self.records[data_type][entity_id].get('name') if entity_id else None
+    
+    def dangling_references(self) -> List[DanglingReference]:
+        """Check every known reference field of every record in one pass."""
+        dangling = []
+        for source_type, extract in REFERENCE_EXTRACTORS.items():
+            for source_id, record in self.records[source_type].items():
+                for field, target_type, reference in extract(record):
+                    if self.resolve(target_type, reference) is None:
+                        dangling.append(DanglingReference(source_type, source_id, field, target_type, str(reference)))
+        return dangling
+    
+    def log_dangling_references(self, limit: int = 5) -> List[DanglingReference]:
+        """
+        Log a summary of dangling references per source and target type.
+        
+        Args:
+            limit: Example references shown per group
+        
+        Returns:
+            All dangling references
+        """
+        dangling = self.dangling_references()
+        if not dangling:
+            logger.info("No dangling references")
+            return dangling
+        
+        groups = defaultdict(list)
+        for ref in dangling:
+            groups[(ref.source_type, ref.field, ref.target_type)].append(ref.reference)
+        
+        logger.warning(f"{len(dangling)} dangling references:")
+        for (source_type, field, target_type), references in sorted(groups.items()):
+            examples = sorted(set(references))[:limit]
+            logger.warning(f"  {source_type}.{field} -> {target_type}: {len(references)} "
+                           f"(e.g. {', '.join(examples)})")
+        return dangling
+
+
+def main():
+    """Report dangling references in a parsed data version."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Check cross-entity references in parsed data")
+    parser.add_argument('version_dir', help='Parsed data version directory (e.g. parsed_data/0.10.1)')
+    parser.add_argument('--all', action='store_true', help='List every dangling reference')
+    args = parser.parse_args()
+    
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
+    index = EntityIndex.build(args.version_dir)
+    dangling = index.log_dangling_references()
+    if args.all:
+        for ref in dangling:
+            print(f"{ref.source_type}/{ref.source_id}\t{ref.field}\t{ref.target_type}\t{ref.reference}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,22 +4,374 @@ Base fetcher class for scraping Lyrian Chronicles data.
 Handles version management and common HTML fetching logic.
 """
 import os
+import json
 import time
+import queue
+import hashlib
 import logging
+import threading
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Any, Sequence, Tuple
 from pathlib import Path
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 from bs4 import BeautifulSoup
 
 logger = logging.getLogger(__name__)
 
+# Title shown by the site until the Angular app has bootstrapped
+LOADING_TITLE = "Loading: Angel's Sword Studios"
+
+# Shared by the readiness and panel-expansion scripts: true when every Angular
+# testability reports stable. Production builds may not expose testabilities,
+# in which case the DOM checks alone decide readiness.
+_ANGULAR_STABLE_JS = """
+function angularStable() {
+    var getAll = window.getAllAngularTestabilities;
+    if (typeof getAll !== 'function') return true;
+    return getAll().every(function (t) { return t.isStable(); });
+}
+"""
+
+# Async script resolving once the page is rendered: document loaded, Angular
+# stable, every selector present and the serialized DOM containing the markers.
+# Re-checks on DOM mutations (plus a slow fallback poll for stability changes)
+# and gives up after the timeout, reporting which conditions are still missing.
+READY_SCRIPT = _ANGULAR_STABLE_JS + """
+var selectors = arguments[0], markers = arguments[1], anyMarkers = arguments[2];
+var minLength = arguments[3], timeoutMs = arguments[4];
+var done = arguments[arguments.length - 1];
+var loadingTitle = arguments[5];
+var finished = false, scheduled = false, observer, poll, timer;
+
+function missing() {
+    var out = [];
+    if (document.readyState !== 'complete') out.push('document');
+    if (document.title.indexOf(loadingTitle) !== -1) out.push('loading title');
+    if (!angularStable()) out.push('angular');
+    selectors.forEach(function (sel) { if (!document.querySelector(sel)) out.push(sel); });
+    if (markers.length || anyMarkers.length || minLength) {
+        var html = document.documentElement.outerHTML;
+        markers.forEach(function (m) { if (html.indexOf(m) === -1) out.push(m); });
+        if (anyMarkers.length && !anyMarkers.some(function (m) { return html.indexOf(m) !== -1; })) {
+            out.push('any of: ' + anyMarkers.join(' | '));
+        }
+        if (html.length < minLength) out.push('length ' + html.length + ' < ' + minLength);
+    }
+    return out;
+}
+
+function finish(ready) {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearInterval(poll);
+    clearTimeout(timer);
+    done({ready: ready, missing: ready ? [] : missing()});
+}
+
+function check() {
+    scheduled = false;
+    if (!finished && missing().length === 0) finish(true);
+}
+
+function schedule() {
+    if (!scheduled) { scheduled = true; setTimeout(check, 25); }
+}
+
+observer = new MutationObserver(schedule);
+observer.observe(document, {childList: true, subtree: true, characterData: true});
+poll = setInterval(check, 250);
+timer = setTimeout(function () { finish(false); }, timeoutMs);
+check();
+"""
+
+# Async script expanding every collapsed mat-expansion-panel in one round trip,
+# then waiting for the panels to report expanded and Angular to settle.
+EXPAND_PANELS_SCRIPT = _ANGULAR_STABLE_JS + """
+var timeoutMs = arguments[0];
+var done = arguments[arguments.length - 1];
+var headers = Array.prototype.slice.call(document.querySelectorAll('mat-expansion-panel-header'));
+var deadline = Date.now() + timeoutMs;
+var clicked = 0;
+
+function panelOf(header) { return header.closest('mat-expansion-panel') || header.parentElement; }
+
+headers.forEach(function (header) {
+    var panel = panelOf(header);
+    if (panel && !panel.classList.contains('mat-expanded')) {
+        header.click();
+        clicked++;
+    }
+});
+
+function settled() {
+    return angularStable() && headers.every(function (header) {
+        var panel = panelOf(header);
+        return !panel || panel.classList.contains('mat-expanded');
+    });
+}
+
+(function check() {
+    var ok = settled();
+    if (ok || Date.now() > deadline) {
+        done({total: headers.length, clicked: clicked, settled: ok});
+    } else {
+        requestAnimationFrame(check);
+    }
+})();
+"""
+
+
+class RateLimiter:
+    """
+    Global politeness limit shared by all fetch workers.
+    
+    Hands out request slots at least ``min_interval`` seconds apart, no matter
+    how many threads are asking, so adding workers never increases the request
+    rate seen by the server beyond one page per interval.
+    """
+    
+    def __init__(self, min_interval: float):
+        self.min_interval = max(0.0, min_interval)
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+    
+    def wait(self):
+        """Block until the caller's request slot comes up."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        
+        remaining = slot - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+
+
+class DriverPool:
+    """
+    Bounded pool of WebDriver sessions for parallel detail-page fetching.
+    
+    Sessions are started lazily up to ``size``. An optional seed driver (the
+    fetcher's own session) fills the first slot and is never quit by the pool.
+    """
+    
+    def __init__(self, factory: Callable[[], webdriver.Chrome], size: int,
+                 seed: Optional[webdriver.Chrome] = None):
+        """
+        Initialize the pool.
+        
+        Args:
+            factory: Callable that starts a new WebDriver session
+            size: Maximum number of concurrent sessions
+            seed: Existing session to reuse as the first slot
+        """
+        self._factory = factory
+        self.size = max(1, size)
+        self._idle: "queue.LifoQueue[webdriver.Chrome]" = queue.LifoQueue()
+        self._owned: List[webdriver.Chrome] = []
+        self._lock = threading.Lock()
+        self._count = 0
+        
+        if seed is not None:
+            self._idle.put(seed)
+            self._count = 1
+    
+    @contextmanager
+    def session(self) -> Iterator[webdriver.Chrome]:
+        """Borrow a session for the duration of the ``with`` block."""
+        driver = self.acquire()
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+    
+    def release(self, driver: webdriver.Chrome):
+        """Return a session taken with acquire() to the pool."""
+        self._idle.put(driver)
+    
+    def acquire(self) -> webdriver.Chrome:
+        """Take a session, starting one if the pool has room or waiting for one otherwise."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        
+        with self._lock:
+            can_create = self._count < self.size
+            if can_create:
+                self._count += 1
+        
+        if not can_create:
+            return self._idle.get()
+        
+        try:
+            driver = self._factory()
+        except Exception:
+            with self._lock:
+                self._count -= 1
+            raise
+        
+        with self._lock:
+            self._owned.append(driver)
+        logger.debug(f"Started pooled WebDriver session {self._count}/{self.size}")
+        return driver
+    
+    def close(self):
+        """Quit every session started by the pool."""
+        with self._lock:
+            owned, self._owned = self._owned, []
+        
+        for driver in owned:
+            try:
+                driver.quit()
+            except Exception as e:
+                logger.warning(f"Error closing pooled WebDriver: {e}")
+        
+        if owned:
+            logger.info(f"Closed {len(owned)} pooled WebDriver sessions")
+
+
+class FetchManifest:
+    """
+    Per-data-type record of fetched detail pages, used for incremental refetching.
+    
+    Stored as ``_manifest.json`` next to the HTML files. Each entry keeps the
+    page URL, fetch time, a hash of the saved HTML and the fields the item had
+    on the list page, so unchanged items can be skipped on the next run.
+    """
+    
+    FILENAME = "_manifest.json"
+    
+    def __init__(self, output_dir: Path):
+        """
+        Load the manifest for an output directory (empty if none exists yet).
+        
+        Args:
+            output_dir: Directory holding the fetched HTML for one data type
+        """
+        self.output_dir = Path(output_dir)
+        self.path = self.output_dir / self.FILENAME
+        self._lock = threading.Lock()
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f).get('items', {})
+                logger.debug(f"Loaded {len(self.entries)} manifest entries from {self.path}")
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable fetch manifest {self.path}: {e}")
+    
+    @staticmethod
+    def normalize_fields(fields: Dict[str, Any]) -> Dict[str, Any]:
+        """Round-trip list-page fields through JSON so they compare equal to stored ones."""
+        return json.loads(json.dumps(fields, sort_keys=True, default=str))
+    
+    @staticmethod
+    def hash_file(path: Path) -> str:
+        """Return the SHA-256 hex digest of a file's contents."""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(65536), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    def is_fresh(self, item_id: str, url: str, list_fields: Dict[str, Any],
+                 max_age: Optional[float]) -> bool:
+        """
+        Check whether an item can be skipped.
+        
+        Args:
+            item_id: Item identifier
+            url: Absolute detail page URL
+            list_fields: Normalized list-page fields for the item
+            max_age: Maximum age in seconds before refetching (None never expires)
+            
+        Returns:
+            True if the saved page exists, its list fields are unchanged and it is young enough
+        """
+        entry = self.entries.get(item_id)
+        if not entry:
+            return False
+        
+        if entry.get('url') != url or entry.get('list_fields') != list_fields:
+            return False
+        
+        if not (self.output_dir / entry.get('file', '')).is_file():
+            return False
+        
+        if max_age is not None and time.time() - entry.get('fetched_at', 0) > max_age:
+            return False
+        
+        return True
+    
+    def html_path(self, item_id: str) -> str:
+        """Return the saved HTML path recorded for an item."""
+        return str(self.output_dir / self.entries[item_id]['file'])
+    
+    def record(self, item_id: str, url: str, list_fields: Dict[str, Any], html_path: str) -> bool:
+        """
+        Record a successful fetch.
+        
+        Returns:
+            True if the page content changed since the previous fetch
+        """
+        path = Path(html_path)
+        content_hash = self.hash_file(path)
+        
+        with self._lock:
+            previous = self.entries.get(item_id, {})
+            self.entries[item_id] = {
+                'url': url,
+                'file': path.name,
+                'fetched_at': time.time(),
+                'content_hash': content_hash,
+                'list_fields': list_fields,
+            }
+        
+        return previous.get('content_hash') != content_hash
+    
+    def forget(self, item_id: str):
+        """Drop an item so the next run refetches it (e.g. after saving a partial page)."""
+        with self._lock:
+            self.entries.pop(item_id, None)
+    
+    def save(self):
+        """Write the manifest to disk atomically."""
+        with self._lock:
+            payload = {'items': dict(sorted(self.entries.items()))}
+        
+        tmp_path = self.path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        logger.debug(f"Saved fetch manifest to {self.path}")
+
+
+def create_chrome_driver() -> webdriver.Chrome:
+    """Start a headless Chrome WebDriver session configured for scraping."""
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--window-size=1920,1080")
+    
+    try:
+        driver = webdriver.Chrome(options=chrome_options)
+        driver.set_page_load_timeout(30)
+        logger.info("Chrome WebDriver initialized successfully")
+        return driver
+    except Exception as e:
+        logger.error(f"Failed to initialize Chrome WebDriver: {e}")
+        raise
+
 
 class BaseFetcher(ABC):
     """
@@ -28,11 +380,29 @@ class BaseFetcher(ABC):
     - Version-based URL construction
     - HTML saving with proper directory structure
     - Common UI element interactions (expanding panels, etc.)
+    - Parallel detail-page fetching over a pool of WebDriver sessions
+    
+    Inside fetch workers ``self.driver`` resolves to the session borrowed by the
+    current thread, so subclass overrides of ``fetch_detail_page`` and the wait
+    helpers work unchanged when fetching in parallel.
     """
     
     BASE_URL = "https://rpg.angelssword.com/game"
     DEFAULT_VERSION = "latest"
     
+    # Saved pages older than this are refetched even if the list page is unchanged
+    DEFAULT_MAX_AGE = 7 * 24 * 3600
+    
+    # List-page fields that change without the detail page changing (e.g. ordering)
+    MANIFEST_VOLATILE_FIELDS: Tuple[str, ...] = ()
+    
+    # Sessions shared across fetchers in one process (set by the update pipeline);
+    # when set, fetchers borrow their main session here instead of starting Chrome
+    driver_pool: Optional[DriverPool] = None
+    
+    # Set by the update pipeline on Ctrl-C; detail pages not yet started are skipped
+    stop_event: Optional[threading.Event] = None
+    
     def __init__(self, version: Optional[str] = None, output_base_dir: str = "scraped_html"):
         """
         Initialize the fetcher with version support.
@@ -49,12 +419,26 @@ class BaseFetcher(ABC):
         self.output_dir = Path(output_base_dir) / self.version / self.get_data_type()
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Initialize WebDriver
-        self.driver = self._init_driver()
+        # Called as on_page_saved(item_id, html_path) for every detail page fetch_items
+        # saves or keeps, from the fetch worker (so a blocking callback slows fetching)
+        self.on_page_saved: Optional[Callable[[str, str], Any]] = None
+        
+        # Initialize WebDriver (worker threads get their own via _local)
+        self._local = threading.local()
+        self.driver = self._borrow_driver()
         logger.info(f"Initialized {self.__class__.__name__} for version: {self.version}")
         logger.info(f"Base URL: {self.base_url}")
         logger.info(f"Output directory: {self.output_dir}")
     
+    @property
+    def driver(self) -> webdriver.Chrome:
+        """WebDriver for the current thread (a pooled session inside fetch workers)."""
+        return getattr(self._local, 'driver', None) or self._driver
+    
+    @driver.setter
+    def driver(self, value: webdriver.Chrome):
+        self._driver = value
+    
     @abstractmethod
     def get_data_type(self) -> str:
         """
@@ -83,31 +467,40 @@ class BaseFetcher(ABC):
     
     def _init_driver(self) -> webdriver.Chrome:
         """Initialize and configure Chrome WebDriver."""
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
-        
-        try:
-            driver = webdriver.Chrome(options=chrome_options)
-            driver.set_page_load_timeout(30)
-            logger.info("Chrome WebDriver initialized successfully")
-            return driver
-        except Exception as e:
-            logger.error(f"Failed to initialize Chrome WebDriver: {e}")
-            raise
+        return create_chrome_driver()
+    
+    def _borrow_driver(self) -> webdriver.Chrome:
+        """Take the main session from the shared driver pool if one is set, else start Chrome."""
+        self._driver_pool = BaseFetcher.driver_pool
+        if self._driver_pool is not None:
+            logger.info("Borrowing WebDriver from shared pool")
+            return self._driver_pool.acquire()
+        return self._init_driver()
+    
+    def _return_driver(self) -> bool:
+        """Hand a borrowed main session back to the shared pool; False if the session is our own."""
+        pool = getattr(self, '_driver_pool', None)
+        if pool is None:
+            return False
+        if self._driver is not None:
+            pool.release(self._driver)
+            self._driver = None
+            logger.info("WebDriver returned to shared pool")
+        return True
     
     def __del__(self):
         """Clean up WebDriver on deletion."""
         if hasattr(self, 'driver'):
+            if self._return_driver():
+                return
             self.driver.quit()
             logger.info("WebDriver closed")
     
     def cleanup(self):
         """Explicitly clean up resources."""
         if hasattr(self, 'driver'):
+            if self._return_driver():
+                return
             self.driver.quit()
             logger.info("WebDriver closed via cleanup()")
     
@@ -181,7 +574,6 @@ class BaseFetcher(ABC):
             # Save metadata if provided
             if metadata:
                 metadata_path = self.output_dir / f"{item_id}.meta.json"
-                import json
                 with open(metadata_path, 'w', encoding='utf-8') as f:
                     json.dump(metadata, f, indent=2, ensure_ascii=False)
                 logger.debug(f"Saved metadata to {metadata_path}")
@@ -192,48 +584,137 @@ class BaseFetcher(ABC):
             logger.error(f"Error fetching detail page for {item_id}: {e}")
             return ""
     
+    def wait_until_ready(self, selectors: Sequence[str] = ("body",), markers: Sequence[str] = (),
+                         any_markers: Sequence[str] = (), min_length: int = 0,
+                         timeout: float = 30.0) -> bool:
+        """
+        Wait until the current page has actually rendered.
+        
+        Runs READY_SCRIPT in the browser, which resolves as soon as the document
+        is loaded, the loading title is gone, Angular is stable and all of the
+        given conditions hold. Conditions are evaluated inside the page, so the
+        page source is never transferred just to poll it.
+        
+        Args:
+            selectors: CSS selectors that must all match an element
+            markers: Substrings that must all appear in the serialized DOM
+            any_markers: Substrings of which at least one must appear
+            min_length: Minimum length of the serialized DOM
+            timeout: Seconds to wait before giving up
+            
+        Returns:
+            True if the page became ready, False on timeout
+        """
+        try:
+            self.driver.set_script_timeout(timeout + 5)
+            result = self.driver.execute_async_script(
+                READY_SCRIPT, list(selectors), list(markers), list(any_markers),
+                min_length, int(timeout * 1000), LOADING_TITLE
+            )
+        except (TimeoutException, WebDriverException) as e:
+            logger.warning(f"Readiness check failed: {e}")
+            return False
+        
+        if not result or not result.get('ready'):
+            still_missing = ', '.join(result.get('missing', [])) if result else 'unknown'
+            logger.warning(f"Page not ready after {timeout}s, still waiting for: {still_missing}")
+            return False
+        
+        return True
+    
+    def mark_page_incomplete(self, reason: str):
+        """
+        Flag the detail page being fetched on this thread as not fully rendered.
+        
+        Detail waits call this when their readiness check fails and they save the
+        page anyway; fetch_items then keeps the page out of the fetch manifest so
+        the next run fetches it again.
+        
+        Args:
+            reason: What the page was still missing, for the log
+        """
+        self._local.page_ready = False
+        logger.warning(f"Detail page incomplete: {reason}")
+    
+    def capture_api_payloads(self) -> Optional[Path]:
+        """
+        Record the JSON payloads behind this data type.
+        
+        Loads the list page (and one detail page, if items have their own pages)
+        with a hook that records every JSON payload the app receives, and saves
+        them per page to ``_api_capture.json``.
+        
+        Returns:
+            Path to the saved capture, or None if the app received no JSON
+        """
+        from .api import CAPTURE_SCRIPT, DRAIN_CAPTURE_SCRIPT, save_capture
+        
+        self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': CAPTURE_SCRIPT})
+        
+        items = self.fetch_list_page()
+        pages = {self.get_list_url(): self.driver.execute_script(DRAIN_CAPTURE_SCRIPT) or []}
+        logger.info(f"Captured {len(pages[self.get_list_url()])} JSON payloads from the list page")
+        
+        sample = next((item for item in items if item.get('url') and item['url'] != self.get_list_url()), None)
+        if sample:
+            url = sample['url']
+            if url.startswith('/'):
+                url = f"https://rpg.angelssword.com{url}"
+            
+            self.driver.get(url)
+            self._wait_for_detail_page()
+            pages[url] = self.driver.execute_script(DRAIN_CAPTURE_SCRIPT) or []
+            logger.info(f"Captured {len(pages[url])} JSON payloads from {url}")
+        
+        if not any(pages.values()):
+            logger.error(f"No JSON payloads were captured for {self.get_data_type()}")
+            return None
+        
+        return save_capture(self.output_dir, pages)
+    
     def _wait_for_list_page(self):
         """Wait for list page to load. Override in subclasses for specific wait conditions."""
-        # Default: wait for body to be present
-        WebDriverWait(self.driver, 10).until(
-            EC.presence_of_element_located((By.TAG_NAME, "body"))
-        )
+        self.wait_until_ready(timeout=10)
     
     def _wait_for_detail_page(self):
         """Wait for detail page to load. Override in subclasses for specific wait conditions."""
-        # Default: wait for body to be present
-        WebDriverWait(self.driver, 10).until(
-            EC.presence_of_element_located((By.TAG_NAME, "body"))
-        )
+        if not self.wait_until_ready(timeout=10):
+            self.mark_page_incomplete("page did not finish loading")
     
-    def _expand_all_panels(self):
-        """Expand all mat-expansion-panels on the page."""
-        try:
-            panels = self.driver.find_elements(By.CSS_SELECTOR, "mat-expansion-panel-header")
-            logger.debug(f"Found {len(panels)} expansion panels to expand")
+    def _expand_all_panels(self, timeout: float = 15.0) -> int:
+        """
+        Expand all mat-expansion-panels on the page in a single script call.
+        
+        Args:
+            timeout: Seconds to wait for the expanded panels to settle
             
-            for i, panel in enumerate(panels):
-                try:
-                    # Check if panel is already expanded
-                    panel_element = panel.find_element(By.XPATH, "..")
-                    classes = panel_element.get_attribute("class")
-                    if "mat-expanded" not in classes:
-                        self.driver.execute_script("arguments[0].click();", panel)
-                        logger.debug(f"Expanded panel {i+1}")
-                        time.sleep(0.3)  # Small delay for animation
-                except Exception as e:
-                    logger.warning(f"Error expanding panel {i+1}: {e}")
-                    
-        except Exception as e:
-            logger.warning(f"Error finding/expanding panels: {e}")
+        Returns:
+            Number of panels that were expanded
+        """
+        try:
+            self.driver.set_script_timeout(timeout + 5)
+            result = self.driver.execute_async_script(EXPAND_PANELS_SCRIPT, int(timeout * 1000))
+        except (TimeoutException, WebDriverException) as e:
+            logger.warning(f"Error expanding panels: {e}")
+            return 0
+        
+        logger.debug(f"Expanded {result['clicked']} of {result['total']} expansion panels")
+        if not result.get('settled'):
+            logger.warning(f"Expansion panels did not settle within {timeout}s")
+        return result['clicked']
     
-    def fetch_all(self, limit: Optional[int] = None, delay: float = 2.0) -> Dict[str, str]:
+    def fetch_all(self, limit: Optional[int] = None, delay: float = 2.0,
+                  workers: int = 1, max_age: Optional[float] = DEFAULT_MAX_AGE,
+                  force: bool = False) -> Dict[str, str]:
         """
         Fetch all items of this type.
         
         Args:
             limit: Maximum number of items to fetch (None for all)
-            delay: Delay between requests in seconds
+            delay: Minimum interval between page requests in seconds, shared by all workers
+            workers: Number of WebDriver sessions fetching detail pages in parallel
+            max_age: Refetch saved pages older than this many seconds (None never expires)
+            force: Refetch every item, ignoring the fetch manifest
             
         Returns:
             Dictionary mapping item IDs to their HTML file paths
@@ -249,7 +730,35 @@ class BaseFetcher(ABC):
             items = items[:limit]
             logger.info(f"Limiting to {limit} items")
         
-        results = {}
+        return self.fetch_items(items, delay=delay, workers=workers, max_age=max_age, force=force)
+    
+    def fetch_items(self, items: List[Dict[str, Any]], delay: float = 2.0,
+                    workers: int = 1, max_age: Optional[float] = DEFAULT_MAX_AGE,
+                    force: bool = False) -> Dict[str, str]:
+        """
+        Fetch detail pages for the given list items over a pool of WebDriver sessions.
+        
+        Items whose list-page fields match the fetch manifest and whose saved page
+        is younger than ``max_age`` are skipped. Each remaining item is fetched
+        independently: a failure is logged and skipped without affecting the others.
+        Only pages that passed their readiness check are recorded in the manifest;
+        failed or incomplete pages are dropped from it so the next run refetches them.
+        
+        Args:
+            items: Items from the list page; each needs 'id' and 'url' and is saved as metadata
+            delay: Minimum interval between page requests in seconds, shared by all workers
+            workers: Number of WebDriver sessions fetching in parallel
+            max_age: Refetch saved pages older than this many seconds (None never expires)
+            force: Refetch every item, ignoring the fetch manifest
+            
+        Returns:
+            Dictionary mapping item IDs to their HTML file paths (fetched or unchanged), in list order
+        """
+        manifest = FetchManifest(self.output_dir)
+        
+        jobs: List[Tuple[str, str, Dict[str, Any]]] = []
+        list_fields: Dict[str, Dict[str, Any]] = {}
+        results: Dict[str, str] = {}
         for i, item in enumerate(items):
             item_id = item.get('id', f'item_{i}')
             url = item.get('url', '')
@@ -262,13 +771,92 @@ class BaseFetcher(ABC):
             if url.startswith('/'):
                 url = f"https://rpg.angelssword.com{url}"
             
-            html_path = self.fetch_detail_page(url, item_id, item)
-            if html_path:
-                results[item_id] = html_path
+            fields = FetchManifest.normalize_fields(
+                {k: v for k, v in item.items() if k not in self.MANIFEST_VOLATILE_FIELDS}
+            )
+            if not force and manifest.is_fresh(item_id, url, fields, max_age):
+                results[item_id] = manifest.html_path(item_id)
+                if self.on_page_saved:
+                    self.on_page_saved(item_id, results[item_id])
+                continue
             
-            # Be polite to the server
-            if i < len(items) - 1:
-                time.sleep(delay)
+            list_fields[item_id] = fields
+            jobs.append((item_id, url, item))
+        
+        if results:
+            logger.info(f"Skipping {len(results)} unchanged items (fetch manifest)")
+        
+        if not jobs:
+            return results
+        
+        workers = max(1, min(workers, len(jobs)))
+        limiter = RateLimiter(delay)
+        pool = DriverPool(self._init_driver, workers, seed=self._driver)
+        logger.info(f"Fetching {len(jobs)} detail pages with {workers} worker(s), "
+                    f"at most one request every {limiter.min_interval}s")
+        
+        fetched: Dict[str, str] = {}
+        changed = 0
+        incomplete = 0
+        try:
+            with ThreadPoolExecutor(max_workers=workers,
+                                    thread_name_prefix=f"fetch-{self.get_data_type()}") as executor:
+                futures = {
+                    executor.submit(self._fetch_pooled, pool, limiter, url, item_id, item): (item_id, url)
+                    for item_id, url, item in jobs
+                }
+                for future in as_completed(futures):
+                    item_id, url = futures[future]
+                    try:
+                        html_path, ready = future.result()
+                    except Exception as e:
+                        logger.error(f"Failed to fetch {item_id}: {e}")
+                        manifest.forget(item_id)
+                        continue
+                    if not html_path:
+                        manifest.forget(item_id)
+                        continue
+                    fetched[item_id] = html_path
+                    if not ready:
+                        # Keep the partial page for this run but refetch it next time
+                        logger.warning(f"Not recording {item_id} in the fetch manifest: page was incomplete")
+                        manifest.forget(item_id)
+                        incomplete += 1
+                    elif manifest.record(item_id, url, list_fields[item_id], html_path):
+                        changed += 1
+        finally:
+            pool.close()
+            manifest.save()
+        
+        results.update(fetched)
+        order = {item.get('id', f'item_{i}'): i for i, item in enumerate(items)}
+        results = dict(sorted(results.items(), key=lambda entry: order.get(entry[0], len(order))))
+        logger.info(f"Fetched {len(fetched)} items successfully ({changed} with changed content, "
+                    f"{incomplete} incomplete)")
+        return results
+    
+    def _fetch_pooled(self, pool: DriverPool, limiter: RateLimiter, url: str,
+                      item_id: str, metadata: Dict[str, Any]) -> Tuple[str, bool]:
+        """
+        Fetch one detail page on a session borrowed from the pool.
+        
+        Returns:
+            Tuple of (saved HTML path or "", whether the page passed its readiness check)
+        """
+        if self.stop_event is not None and self.stop_event.is_set():
+            return "", False
+        
+        with pool.session() as driver:
+            self._local.driver = driver
+            self._local.page_ready = True
+            try:
+                limiter.wait()
+                html_path = self.fetch_detail_page(url, item_id, metadata)
+                ready = self._local.page_ready
+            finally:
+                self._local.driver = None
         
-        logger.info(f"Fetched {len(results)} items successfully")
-        return results
\ No newline at end of file
+        # Hand the page on outside the session so a blocked consumer doesn't hold a browser
+        if html_path and self.on_page_saved:
+            self.on_page_saved(item_id, html_path)
+        return html_path, ready
@@ -3,15 +3,350 @@
 Base parser class for converting HTML to structured YAML data.
 """
 import os
-import yaml
+import sys
+import json
+import pickle
+import signal
+import hashlib
 import logging
+import threading
+import multiprocessing
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any, Union
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Any, Sequence, Tuple, Union
 from pathlib import Path
 from bs4 import BeautifulSoup
 
+from .storage import write_yaml_file
+
 logger = logging.getLogger(__name__)
 
+# HTML backends selectable for BeautifulSoup. html.parser is pure Python and the
+# slowest; lxml builds the same tree from its C parser several times faster.
+HTML_BACKENDS = ("html.parser", "lxml", "html5lib")
+DEFAULT_HTML_BACKEND = "html.parser"
+
+# Read from the environment so parse worker processes and parser subprocesses pick it up too
+_html_backend = os.environ.get("SCRAPER_HTML_BACKEND", DEFAULT_HTML_BACKEND)
+
+
+def set_html_backend(backend: str):
+    """
+    Select the HTML backend used by make_soup for this process and its children.
+    
+    Args:
+        backend: One of HTML_BACKENDS
+    """
+    global _html_backend
+    if backend not in HTML_BACKENDS:
+        raise ValueError(f"Unknown HTML backend: {backend} (choose from {', '.join(HTML_BACKENDS)})")
+    _html_backend = backend
+    os.environ["SCRAPER_HTML_BACKEND"] = backend
+
+
+def get_html_backend() -> str:
+    """Return the HTML backend currently used by make_soup."""
+    return _html_backend
+
+
+def make_soup(markup: Union[str, bytes], backend: Optional[str] = None) -> BeautifulSoup:
+    """
+    Parse markup with the configured HTML backend.
+    
+    Args:
+        markup: HTML document
+        backend: Override the configured backend for this call
+        
+    Returns:
+        BeautifulSoup document
+    """
+    return BeautifulSoup(markup, backend or _html_backend)
+
+
+# Source fingerprint per parser class, computed once per process
+_fingerprints: Dict[type, str] = {}
+
+
+def parser_fingerprint(parser_cls: type) -> str:
+    """
+    Hash the source of a parser class and everything it inherits from.
+    
+    Any edit to the parser module, a base class or core.utils changes the
+    fingerprint, which invalidates that parser's cached results.
+    
+    Args:
+        parser_cls: Parser class
+        
+    Returns:
+        Hex digest of the source files
+    """
+    if parser_cls not in _fingerprints:
+        files = {Path(__file__).with_name("utils.py")}
+        for cls in parser_cls.__mro__:
+            module_file = getattr(sys.modules.get(cls.__module__), "__file__", None)
+            if module_file and Path(module_file).suffix == ".py":
+                files.add(Path(module_file))
+        
+        digest = hashlib.sha256()
+        for path in sorted(files):
+            digest.update(path.name.encode("utf-8"))
+            digest.update(path.read_bytes())
+        _fingerprints[parser_cls] = digest.hexdigest()
+    
+    return _fingerprints[parser_cls]
+
+
+class ParseCache:
+    """
+    Content-addressed cache of parse results.
+    
+    Entries are keyed by the HTML content hash, the parser class, the parser's
+    source fingerprint and the HTML backend, so a hit is only possible when
+    neither the page nor the code that parses it changed. Results are pickled
+    under ``<cache_dir>/<key[:2]>/<key>.pickle``; hits refresh the entry's mtime
+    and the least recently used entries are evicted once the cache grows past
+    ``max_bytes``.
+    """
+    
+    DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+    
+    def __init__(self, cache_dir: Union[str, Path], max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._size: Optional[int] = None
+    
+    @staticmethod
+    def key(html_content: str, parser_cls: type, *parts: str) -> str:
+        """
+        Build the cache key for one parse.
+        
+        Args:
+            html_content: HTML being parsed
+            parser_cls: Parser class doing the parsing
+            *parts: Any other inputs the result depends on (metadata, file name)
+            
+        Returns:
+            Hex digest key
+        """
+        digest = hashlib.sha256(html_content.encode("utf-8"))
+        for part in (parser_cls.__qualname__, parser_fingerprint(parser_cls), get_html_backend(), *parts):
+            digest.update(b"\0")
+            digest.update(part.encode("utf-8"))
+        return digest.hexdigest()
+    
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.pickle"
+    
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Return (hit, result) for a key."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                result = pickle.load(f)
+        except FileNotFoundError:
+            return False, None
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable cache entry {path.name}: {e}")
+            return False, None
+        
+        # Touch the entry so eviction drops the least recently used ones first
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return True, result
+    
+    def put(self, key: str, result: Any):
+        """Store a parse result, evicting old entries if the cache is over budget."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        
+        # Write atomically so parallel parse workers never read a partial entry
+        temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+        
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._entries())
+        else:
+            self._size += len(data)
+        
+        if self._size > self.max_bytes:
+            self.evict()
+    
+    def _entries(self) -> List[Tuple[Path, int, float]]:
+        """List (path, size, mtime) for every cache entry."""
+        entries = []
+        for path in self.cache_dir.glob("*/*.pickle"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+    
+    def evict(self, target_bytes: Optional[int] = None):
+        """
+        Delete least recently used entries until the cache fits.
+        
+        Args:
+            target_bytes: Size to shrink to (defaults to 90% of max_bytes)
+        """
+        if target_bytes is None:
+            target_bytes = int(self.max_bytes * 0.9)
+        
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for path, size, _ in entries:
+            if total <= target_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        
+        self._size = total
+        if removed:
+            logger.info(f"Evicted {removed} parse cache entries ({total} bytes kept)")
+    
+    def clear(self):
+        """Remove every cache entry."""
+        self.evict(target_bytes=0)
+
+
+# Parser instance owned by a process-pool worker (set once per worker by _init_parse_worker)
+_worker_parser: Optional["BaseParser"] = None
+
+# Parse pools are spawned rather than forked: the update pipeline starts them
+# while fetch threads (and their WebDriver connections) are running
+_POOL_CONTEXT = multiprocessing.get_context("spawn")
+
+
+def _init_parse_worker(parser: "BaseParser"):
+    """Process-pool initializer: keep one copy of the parser per worker."""
+    global _worker_parser
+    _worker_parser = parser
+    
+    # Ctrl-C is handled by the parent, which cancels queued work and shuts the pool down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _run_parse_task(task: Tuple[str, Path, tuple],
+                    parser: Optional["BaseParser"] = None) -> Tuple[Any, Optional[str]]:
+    """Run one parser method call (in a worker unless a parser is given), returning (result, error)."""
+    method_name, path, args = task
+    try:
+        return getattr(parser or _worker_parser, method_name)(path, *args), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+class ParseStream:
+    """
+    Parse pages on a process pool while they are still being fetched.
+    
+    Fetch workers call ``submit`` as each page is saved. Once ``max_pending``
+    pages are queued, ``submit`` blocks, so fetching cannot run arbitrarily far
+    ahead of parsing. Workers run the same per-file parser method as the batch
+    path. Per-file outputs are therefore identical, and the results land in the
+    parse cache, so the batch pass that follows only assembles the index files.
+    """
+    
+    def __init__(self, parser: "BaseParser", method_name: str, *args: Any,
+                 jobs: int = 1, max_pending: Optional[int] = None):
+        """
+        Start the parse pool.
+        
+        Args:
+            parser: Parser whose method is called for each page (copied to every worker)
+            method_name: Per-file parser method, as used with map_files
+            *args: Extra arguments passed to every call
+            jobs: Number of worker processes
+            max_pending: Pages queued or in progress before submit blocks (default 4 per worker)
+        """
+        self.method_name = method_name
+        self.args = args
+        self.jobs = max(1, jobs)
+        self.submitted = 0
+        self.errors: Dict[str, str] = {}
+        
+        self._slots = threading.BoundedSemaphore(max_pending or self.jobs * 4)
+        self._lock = threading.Lock()
+        self._seen = set()
+        self._closed = False
+        
+        self._executor = ProcessPoolExecutor(max_workers=self.jobs, mp_context=_POOL_CONTEXT,
+                                             initializer=_init_parse_worker, initargs=(parser,))
+        logger.info(f"Streaming pages to {self.jobs} parse worker(s) via {method_name}")
+    
+    def submit(self, html_path: Union[str, Path]) -> bool:
+        """
+        Queue a saved page for parsing, blocking while the queue is full.
+        
+        Args:
+            html_path: Page that was just saved
+            
+        Returns:
+            True if the page was queued, False if it was already queued or the stream is closed
+        """
+        path = Path(html_path)
+        with self._lock:
+            if self._closed or path in self._seen:
+                return False
+            self._seen.add(path)
+        
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(_run_parse_task, (self.method_name, path, self.args))
+        except RuntimeError:
+            # Pool shut down while this page waited for a slot
+            self._slots.release()
+            return False
+        
+        with self._lock:
+            self.submitted += 1
+        future.add_done_callback(lambda f: self._finished(path, f))
+        return True
+    
+    def _finished(self, path: Path, future: Future):
+        self._slots.release()
+        if future.cancelled():
+            return
+        
+        try:
+            _, error = future.result()
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        
+        if error:
+            with self._lock:
+                self.errors[str(path)] = error
+            logger.warning(f"Streamed parse of {path.name} failed: {error}")
+    
+    def close(self, cancel: bool = False):
+        """
+        Stop accepting pages and shut the pool down.
+        
+        Args:
+            cancel: Drop queued pages instead of waiting for them (used on Ctrl-C)
+        """
+        with self._lock:
+            self._closed = True
+        self._executor.shutdown(wait=True, cancel_futures=cancel)
+        logger.info(f"Parse stream closed: {self.submitted} pages parsed while fetching, "
+                    f"{len(self.errors)} errors{' (cancelled)' if cancel else ''}")
+    
+    def __enter__(self) -> "ParseStream":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close(cancel=exc_type is not None)
+
 
 class BaseParser(ABC):
     """
@@ -45,6 +380,12 @@ class BaseParser(ABC):
             latest_link.symlink_to(version_dir.name)
             logger.info(f"Updated 'latest' symlink to point to {version}")
         
+        # Parse cache shared by all versions; SCRAPER_PARSE_CACHE=0 turns it off
+        self.parse_cache: Optional[ParseCache] = None
+        if os.environ.get("SCRAPER_PARSE_CACHE", "1") != "0":
+            max_mb = int(os.environ.get("SCRAPER_PARSE_CACHE_MB", ParseCache.DEFAULT_MAX_BYTES // (1024 * 1024)))
+            self.parse_cache = ParseCache(self.base_output_dir / ".cache", max_bytes=max_mb * 1024 * 1024)
+        
         logger.info(f"Initialized {self.__class__.__name__}")
         logger.info(f"Version: {self.version}")
         logger.info(f"Output directory: {self.output_dir}")
@@ -68,6 +409,34 @@ class BaseParser(ABC):
         """
         pass
     
+    def cached_parse(self, html_content: str, parse: Callable[[], Any], *key_parts: str) -> Any:
+        """
+        Run a parse of some HTML, reusing the cached result when possible.
+        
+        Exceptions raised by ``parse`` propagate and nothing is cached, so
+        failed parses are retried on the next run.
+        
+        Args:
+            html_content: HTML the result is derived from
+            parse: Callable producing the result on a cache miss
+            *key_parts: Other inputs the result depends on (metadata, file name)
+            
+        Returns:
+            Parse result
+        """
+        if self.parse_cache is None:
+            return parse()
+        
+        key = ParseCache.key(html_content, type(self), *key_parts)
+        hit, result = self.parse_cache.get(key)
+        if hit:
+            logger.debug(f"Parse cache hit for {key[:12]}")
+            return result
+        
+        result = parse()
+        self.parse_cache.put(key, result)
+        return result
+    
     def parse_file(self, html_path: str, metadata_path: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
         Parse an HTML file into structured data.
@@ -86,18 +455,17 @@ class BaseParser(ABC):
             with open(html_path, 'r', encoding='utf-8') as f:
                 html_content = f.read()
             
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
             # Load metadata if provided
             metadata = None
             if metadata_path and os.path.exists(metadata_path):
-                import json
                 with open(metadata_path, 'r', encoding='utf-8') as f:
                     metadata = json.load(f)
                 logger.debug(f"Loaded metadata from {metadata_path}")
             
-            # Parse the content
-            data = self.parse_detail(soup, metadata)
+            # Parse the content (skipped when this HTML was already parsed by the same code)
+            data = self.cached_parse(html_content,
+                                     lambda: self.parse_detail(make_soup(html_content), metadata),
+                                     json.dumps(metadata, sort_keys=True))
             
             if data:
                 logger.info(f"Successfully parsed {html_path}")
@@ -124,21 +492,97 @@ class BaseParser(ABC):
         output_path = self.output_dir / f"{output_name}.yaml"
         
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                yaml.dump(data, f, default_flow_style=False, allow_unicode=True, sort_keys=False)
+            write_yaml_file(output_path, data)
             logger.info(f"Saved to {output_path}")
             return str(output_path)
         except Exception as e:
             logger.error(f"Error saving to YAML: {e}")
             return ""
     
-    def parse_directory(self, html_dir: str, output_format: str = "yaml") -> Dict[str, str]:
+    def map_files(self, method_name: str, paths: Sequence[Path], *args: Any,
+                  jobs: int = 1) -> Iterator[Tuple[Path, Any, Optional[str]]]:
+        """
+        Call ``self.<method_name>(path, *args)`` for every path.
+        
+        With ``jobs > 1`` the calls fan out over a process pool, each worker
+        holding its own copy of this parser. Results are yielded in input order
+        either way, so anything built from them (index files) is deterministic.
+        Exceptions are caught per file and reported instead of stopping the run.
+        
+        Args:
+            method_name: Name of the parser method to call for each file
+            paths: Files to process
+            *args: Extra arguments passed to every call
+            jobs: Number of worker processes (1 runs in-process)
+            
+        Yields:
+            Tuples of (path, result, error message or None)
+        """
+        tasks = [(method_name, path, args) for path in paths]
+        
+        if jobs <= 1 or len(tasks) <= 1:
+            for task in tasks:
+                result, error = _run_parse_task(task, self)
+                yield task[1], result, error
+            return
+        
+        jobs = min(jobs, len(tasks))
+        chunksize = max(1, len(tasks) // (jobs * 4))
+        logger.info(f"Parsing {len(tasks)} files with {jobs} worker processes")
+        
+        executor = ProcessPoolExecutor(max_workers=jobs, mp_context=_POOL_CONTEXT,
+                                       initializer=_init_parse_worker, initargs=(self,))
+        try:
+            for task, (result, error) in zip(tasks, executor.map(_run_parse_task, tasks, chunksize=chunksize)):
+                yield task[1], result, error
+        finally:
+            # On Ctrl-C or an abandoned iteration, drop the files not yet started
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    def save_output(self, data: Dict[str, Any], output_name: str, output_format: str = "yaml") -> str:
+        """
+        Save parsed data in the requested format.
+        
+        Args:
+            data: Data dictionary to save
+            output_name: Name for the output file (without extension)
+            output_format: Output format ("yaml" or "json")
+            
+        Returns:
+            Path to the saved file
+        """
+        if output_format == "yaml":
+            return self.to_yaml(data, output_name)
+        
+        output_path = self.output_dir / f"{output_name}.json"
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        return str(output_path)
+    
+    def _parse_and_save(self, html_file: Path, output_format: str) -> Optional[Tuple[str, str]]:
+        """Parse one saved HTML page and write its output file."""
+        # Check for corresponding metadata file
+        meta_file = html_file.with_suffix('.meta.json')
+        metadata_path = str(meta_file) if meta_file.exists() else None
+        
+        # Parse the file
+        data = self.parse_file(str(html_file), metadata_path)
+        
+        if not data:
+            return None
+        
+        # Use the ID from the data if available, otherwise use filename
+        item_id = data.get('id', html_file.stem)
+        return item_id, self.save_output(data, item_id, output_format)
+    
+    def parse_directory(self, html_dir: str, output_format: str = "yaml", jobs: int = 1) -> Dict[str, str]:
         """
         Parse all HTML files in a directory.
         
         Args:
             html_dir: Directory containing HTML files
             output_format: Output format ("yaml" or "json")
+            jobs: Number of worker processes to parse with
             
         Returns:
             Dictionary mapping item IDs to output file paths
@@ -149,35 +593,20 @@ class BaseParser(ABC):
             return {}
         
         results = {}
-        html_files = list(html_path.glob("*.html"))
+        html_files = sorted(html_path.glob("*.html"))
         
         # Filter out special files like _list_page.html
         html_files = [f for f in html_files if not f.name.startswith("_")]
         
         logger.info(f"Found {len(html_files)} HTML files to parse")
         
-        for html_file in html_files:
-            # Check for corresponding metadata file
-            meta_file = html_file.with_suffix('.meta.json')
-            metadata_path = str(meta_file) if meta_file.exists() else None
-            
-            # Parse the file
-            data = self.parse_file(str(html_file), metadata_path)
+        for html_file, parsed, error in self.map_files('_parse_and_save', html_files, output_format, jobs=jobs):
+            if error:
+                logger.error(f"Error parsing {html_file}: {error}")
+                continue
             
-            if data:
-                # Use the ID from the data if available, otherwise use filename
-                item_id = data.get('id', html_file.stem)
-                
-                if output_format == "yaml":
-                    output_path = self.to_yaml(data, item_id)
-                else:
-                    # JSON output
-                    output_path = self.output_dir / f"{item_id}.json"
-                    import json
-                    with open(output_path, 'w', encoding='utf-8') as f:
-                        json.dump(data, f, indent=2, ensure_ascii=False)
-                    output_path = str(output_path)
-                
+            if parsed:
+                item_id, output_path = parsed
                 if output_path:
                     results[item_id] = output_path
         
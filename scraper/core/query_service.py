@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Read-only JSON query service over one parsed data version.
+
+The version directory is loaded once into an EntityIndex plus lookup tables
+(record type, tier and keyword -> ids, and the cross-entity links of
+entity_index.REFERENCE_EXTRACTORS in both directions), with every record
+serialized to JSON up front, so requests are answered from memory with the
+standard library HTTP server.
+
+Endpoints (all GET):
+    /                               version and record counts
+    /<type>                         records, filtered by ?name= ?q= ?type= ?tier= ?keyword= (+ ?limit= ?offset=)
+    /<type>/<id or name>            one record
+    /<type>/<id or name>/<type>     linked records: class -> abilities, ability -> keywords,
+                                    monster -> monster-abilities, or the reverse
+                                    (keyword -> abilities, ability -> classes, ...)
+
+Every response carries an ETag naming the loaded version; clients sending it
+back in If-None-Match get a 304. The data directory is polled and reloaded in
+the background when parsed_data/latest moves to another version or the files
+of the current version are parsed again in place.
+"""
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from .entity_index import ENTITY_TYPES, REFERENCE_EXTRACTORS, EntityIndex, normalize_name
+from .storage import iter_record_files
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+
+def _json(data: Any) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=str).encode('utf-8')
+
+
+def version_tag(version_dir: Path) -> str:
+    """Short hash of every record file's path, size and mtime (changes whenever a file does)."""
+    digest = hashlib.sha256()
+    for data_type in ENTITY_TYPES:
+        type_dir = version_dir / data_type
+        for path in iter_record_files(type_dir) if type_dir.exists() else []:
+            stat = path.stat()
+            digest.update(f"{path.relative_to(version_dir).as_posix()}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()[:16]
+
+
+class DataSnapshot:
+    """Immutable in-memory view of one version; replaced as a whole on reload."""
+    
+    def __init__(self, version_dir: Union[str, Path]):
+        """
+        Args:
+            version_dir: e.g. parsed_data/0.10.1 (symlinks are resolved)
+        """
+        self.version_dir = Path(version_dir).resolve()
+        self.version = self.version_dir.name
+        self.tag = version_tag(self.version_dir)
+        self.etag = f'"{self.version}-{self.tag}"'
+        self.loaded_at = time.time()
+        
+        self.index = EntityIndex.build(self.version_dir)
+        
+        # data type -> id -> serialized record
+        self.json: Dict[str, Dict[str, bytes]] = {}
+        # data type -> sorted ids, and lowercase name per id for ?q=
+        self.ids: Dict[str, List[str]] = {}
+        self.lower_names: Dict[str, Dict[str, str]] = {}
+        # data type -> facet value -> set of ids
+        self.by_type: Dict[str, Dict[str, set]] = defaultdict(lambda: defaultdict(set))
+        self.by_tier: Dict[str, Dict[int, set]] = defaultdict(lambda: defaultdict(set))
+        self.by_keyword: Dict[str, Dict[str, set]] = defaultdict(lambda: defaultdict(set))
+        # (data type, id) -> target type -> linked ids, in reference order
+        self.links: Dict[Tuple[str, str], Dict[str, List[str]]] = defaultdict(lambda: defaultdict(list))
+        self.backlinks: Dict[Tuple[str, str], Dict[str, List[str]]] = defaultdict(lambda: defaultdict(list))
+        # (source type, target type) pairs that have forward links
+        self.link_pairs: set = set()
+        
+        for data_type, records in self.index.records.items():
+            self.ids[data_type] = sorted(records)
+            self.json[data_type] = {entity_id: _json(record) for entity_id, record in records.items()}
+            self.lower_names[data_type] = {
+                entity_id: str(record.get('name') or entity_id).lower() for entity_id, record in records.items()
+            }
+            for entity_id, record in records.items():
+                if isinstance(record.get('type'), str):
+                    self.by_type[data_type][record['type']].add(entity_id)
+                if isinstance(record.get('tier'), int):
+                    self.by_tier[data_type][record['tier']].add(entity_id)
+                for keyword in record.get('keywords') or []:
+                    self.by_keyword[data_type][self.keyword_key(keyword)].add(entity_id)
+        
+        for source_type, extract in REFERENCE_EXTRACTORS.items():
+            for source_id, record in self.index.records[source_type].items():
+                for _, target_type, reference in extract(record):
+                    target_id = self.index.resolve(target_type, reference)
+                    if target_id is None:
+                        continue
+                    forward = self.links[(source_type, source_id)][target_type]
+                    if target_id not in forward:
+                        forward.append(target_id)
+                        self.backlinks[(target_type, target_id)][source_type].append(source_id)
+                    self.link_pairs.add((source_type, target_type))
+        
+        self.summary = _json({
+            'version': self.version,
+            'tag': self.tag,
+            'loaded_at': self.loaded_at,
+            'counts': {data_type: len(ids) for data_type, ids in self.ids.items()},
+        })
+    
+    def keyword_key(self, keyword: Any) -> str:
+        """Keyword id if the keyword resolves, else its normalized name."""
+        return self.index.resolve('keywords', keyword) or normalize_name(keyword)
+    
+    def resolve(self, data_type: str, reference: str) -> Optional[str]:
+        return self.index.resolve(data_type, reference)
+    
+    def filter(self, data_type: str, name: Optional[str] = None, q: Optional[str] = None,
+               type: Optional[str] = None, tier: Optional[int] = None,
+               keywords: Optional[List[str]] = None) -> List[str]:
+        """Ids of a data type matching every given filter, sorted."""
+        candidates: Optional[set] = None
+        
+        def narrow(ids):
+            nonlocal candidates
+            candidates = set(ids) if candidates is None else candidates & ids
+        
+        if name is not None:
+            entity_id = self.resolve(data_type, name)
+            narrow({entity_id} if entity_id else set())
+        if type is not None:
+            narrow(self.by_type[data_type].get(type, set()))
+        if tier is not None:
+            narrow(self.by_tier[data_type].get(tier, set()))
+        for keyword in keywords or []:
+            narrow(self.by_keyword[data_type].get(self.keyword_key(keyword), set()))
+        
+        ids = self.ids[data_type] if candidates is None else sorted(candidates)
+        if q:
+            needle = q.lower()
+            names = self.lower_names[data_type]
+            ids = [entity_id for entity_id in ids if needle in names[entity_id]]
+        return ids
+    
+    def linked(self, data_type: str, entity_id: str, target_type: str) -> List[str]:
+        """Forward links if this type references the target type, else records referencing this one."""
+        if (data_type, target_type) in self.link_pairs:
+            return self.links.get((data_type, entity_id), {}).get(target_type, [])
+        return self.backlinks.get((data_type, entity_id), {}).get(target_type, [])
+
+
+class QueryService:
+    """Holds the current snapshot and swaps in a new one when the data directory changes."""
+    
+    def __init__(self, data_dir: Union[str, Path] = "parsed_data/latest", watch_interval: float = 5.0):
+        """
+        Args:
+            data_dir: Version directory, usually the parsed_data/latest symlink
+            watch_interval: Seconds between checks of the data directory (0 disables reloading)
+        """
+        self.data_dir = Path(data_dir)
+        self.watch_interval = watch_interval
+        self.snapshot = DataSnapshot(self.data_dir)
+        logger.info(f"Loaded {self.snapshot.version} ({self.snapshot.etag})")
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+    
+    def reload_if_changed(self) -> bool:
+        """
+        Load the data directory again if it points at another version or its files changed.
+        
+        The version tag of the current target is recomputed on every check, so
+        a version re-parsed in place is reloaded (with a new ETag) as well.
+        
+        Returns:
+            True if a new snapshot was swapped in
+        """
+        try:
+            target = self.data_dir.resolve(strict=True)
+            tag = version_tag(target)
+        except OSError as e:
+            logger.warning(f"Cannot read {self.data_dir}: {e}")
+            return False
+        if target == self.snapshot.version_dir and tag == self.snapshot.tag:
+            return False
+        
+        if target == self.snapshot.version_dir:
+            logger.info(f"{target.name} changed on disk, reloading")
+        else:
+            logger.info(f"{self.data_dir} moved to {target.name}, reloading")
+        try:
+            snapshot = DataSnapshot(target)
+        except Exception as e:
+            logger.error(f"Reload of {target} failed, still serving {self.snapshot.version}: {e}")
+            return False
+        # Requests in flight keep the snapshot they started with
+        self.snapshot = snapshot
+        logger.info(f"Serving {snapshot.version} ({snapshot.etag})")
+        return True
+    
+    def start_watching(self):
+        if self.watch_interval <= 0 or self._watcher is not None:
+            return
+        
+        def watch():
+            while not self._stop.wait(self.watch_interval):
+                self.reload_if_changed()
+        
+        self._watcher = threading.Thread(target=watch, name="query-service-reload", daemon=True)
+        self._watcher.start()
+    
+    def stop(self):
+        self._stop.set()
+    
+    def handle(self, path: str, query: Dict[str, List[str]]) -> Tuple[int, bytes, DataSnapshot]:
+        """
+        Answer one GET request.
+        
+        Returns:
+            (HTTP status, JSON body, snapshot it was answered from)
+        """
+        snapshot = self.snapshot
+        parts = [unquote(part) for part in path.strip('/').split('/') if part]
+        
+        if not parts:
+            return 200, snapshot.summary, snapshot
+        
+        data_type = parts[0]
+        if data_type not in snapshot.ids:
+            return 404, _json({'error': f"Unknown data type: {data_type}"}), snapshot
+        
+        if len(parts) == 1:
+            try:
+                tier = int(query['tier'][0]) if 'tier' in query else None
+                limit = min(int(query.get('limit', [DEFAULT_LIMIT])[0]), MAX_LIMIT)
+                offset = max(int(query.get('offset', [0])[0]), 0)
+            except ValueError:
+                return 400, _json({'error': "tier, limit and offset must be integers"}), snapshot
+            ids = snapshot.filter(
+                data_type,
+                name=query.get('name', [None])[0],
+                q=query.get('q', [None])[0],
+                type=query.get('type', [None])[0],
+                tier=tier,
+                keywords=query.get('keyword'),
+            )
+            return 200, self._list_body(snapshot, data_type, ids, limit, offset), snapshot
+        
+        entity_id = snapshot.resolve(data_type, parts[1])
+        if entity_id is None:
+            return 404, _json({'error': f"No {data_type} record {parts[1]}"}), snapshot
+        
+        if len(parts) == 2:
+            return 200, snapshot.json[data_type][entity_id], snapshot
+        
+        if len(parts) == 3 and parts[2] in snapshot.ids:
+            target_type = parts[2]
+            ids = snapshot.linked(data_type, entity_id, target_type)
+            return 200, self._list_body(snapshot, target_type, ids, MAX_LIMIT, 0), snapshot
+        
+        return 404, _json({'error': f"Unknown path: {path}"}), snapshot
+    
+    @staticmethod
+    def _list_body(snapshot: DataSnapshot, data_type: str, ids: List[str], limit: int, offset: int) -> bytes:
+        # Records are pre-serialized; only the envelope is built per request
+        records = snapshot.json[data_type]
+        page = ids[offset:offset + limit]
+        return (b'{"version":' + _json(snapshot.version) + b',"data_type":' + _json(data_type)
+                + b',"total":' + str(len(ids)).encode() + b',"offset":' + str(offset).encode()
+                + b',"results":[' + b','.join(records[entity_id] for entity_id in page) + b']}')
+
+
+class QueryRequestHandler(BaseHTTPRequestHandler):
+    """GET-only handler answering from the server's QueryService."""
+    
+    protocol_version = "HTTP/1.1"
+    server_version = "LyrianQuery/1"
+    # Headers and body go out in separate writes; without this, keep-alive clients stall on delayed ACKs
+    disable_nagle_algorithm = True
+    
+    def do_GET(self):
+        service: QueryService = self.server.service
+        url = urlsplit(self.path)
+        status, body, snapshot = service.handle(url.path, parse_qs(url.query))
+        
+        if status == 200 and snapshot.etag in (self.headers.get('If-None-Match') or ''):
+            self.send_response(304)
+            self.send_header('ETag', snapshot.etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', snapshot.etag)
+        self.send_header('X-Data-Version', snapshot.version)
+        # Clients may keep responses but must revalidate; a 304 costs one header round trip
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+def serve(data_dir: Union[str, Path] = "parsed_data/latest", host: str = "127.0.0.1", port: int = 8765,
+          watch_interval: float = 5.0):
+    """Load the data and serve it until interrupted."""
+    service = QueryService(data_dir, watch_interval=watch_interval)
+    service.start_watching()
+    
+    server = ThreadingHTTPServer((host, port), QueryRequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    logger.info(f"Serving {service.snapshot.version} on http://{host}:{server.server_address[1]}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down")
+    finally:
+        service.stop()
+        server.server_close()
+
+
+def main():
+    """Serve a parsed data version over HTTP."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Read-only JSON query service over parsed game data")
+    parser.add_argument('--data-dir', default='parsed_data/latest',
+                        help='Version directory to serve (default: parsed_data/latest)')
+    parser.add_argument('--host', default='127.0.0.1', help='Address to bind (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='Port (default: 8765)')
+    parser.add_argument('--watch-interval', type=float, default=5.0,
+                        help='Seconds between checks for a moved latest symlink, 0 to disable (default: 5)')
+    args = parser.parse_args()
+    
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
+    serve(args.data_dir, host=args.host, port=args.port, watch_interval=args.watch_interval)
+
+
+if __name__ == "__main__":
+    main()
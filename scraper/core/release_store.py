@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+Content-addressed store for versioned game data.
+
+``parsed_data/<version>/`` (and ``scraped_html/<version>/``) hold a full copy of
+every file for every release, although most records are unchanged between
+releases. A ReleaseStore keeps each distinct file once, as a zlib-compressed
+blob named by the sha256 of its contents, and each version as a manifest
+mapping relative paths to blob hashes:
+
+    parsed_data/_store/
+    ├── blobs/ab/cdef...     # one blob per distinct file content
+    └── manifests/
+        ├── 0.10.1.json      # {"files": {"items/sword.yaml": "abcdef...", ...}}
+        └── 0.10.2.json
+
+Snapshotting a new release only writes blobs for files that changed, and
+comparing two versions is a comparison of their manifests. The top-level
+``version`` and ``generated_at`` fields of YAML files change with every parse
+without the content changing, so they are stripped before a file is hashed and
+stored; the manifest's own version and creation time stand in for them. The
+query API (records, get, changes) reads any data type at any stored version
+without a checked-out tree; checkout rebuilds the tree when one is needed.
+"""
+import os
+import re
+import json
+import zlib
+import hashlib
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from .storage import Corpus, load_yaml
+
+logger = logging.getLogger(__name__)
+
+# Derived files that are rebuilt from the records and never stored
+SKIPPED_FILES = {Corpus.DATA_FILENAME, Corpus.INDEX_FILENAME}
+
+# Top-level fields that change with every parse without the record changing
+VOLATILE_FIELDS = ('version', 'generated_at')
+
+_VOLATILE_LINE = re.compile(
+    rb'^(?:' + b'|'.join(field.encode() for field in VOLATILE_FIELDS) + rb'):[^\n]*(?:\n|$)', re.MULTILINE
+)
+
+
+def version_key(version: str) -> Tuple:
+    """Sort key for version strings: 0.10.2 > 0.10.1 > 0.9.0, non-numeric last."""
+    try:
+        return (0, tuple(int(part) for part in version.split('.')))
+    except ValueError:
+        return (1, version)
+
+
+def hash_bytes(data: bytes) -> str:
+    """Content address of a file."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def normalize_content(name: str, data: bytes) -> bytes:
+    """
+    Strip top-level volatile fields from a YAML file's contents.
+    
+    Args:
+        name: File name (only ``.yaml`` files are changed)
+        data: Raw file contents
+    
+    Returns:
+        The contents as stored and hashed by the release store
+    """
+    if not name.endswith('.yaml'):
+        return data
+    return _VOLATILE_LINE.sub(b'', data)
+
+
+def record_id(record: Any) -> Optional[str]:
+    """Id of a parsed record (class files wrap their record in a 'class' key)."""
+    inner = record.get("class", record) if isinstance(record, dict) else None
+    if isinstance(inner, dict) and inner.get("id") is not None:
+        return str(inner["id"])
+    return None
+
+
+def is_record_path(path: str) -> bool:
+    """True for record files (YAML, not a ``*_index.yaml`` summary)."""
+    return path.endswith(".yaml") and not path.endswith("_index.yaml")
+
+
+class ReleaseStore:
+    """Blobs plus one manifest per version for a versioned data tree."""
+    
+    FORMAT = 2
+    
+    def __init__(self, root: Union[str, Path] = "parsed_data/_store"):
+        """
+        Args:
+            root: Store directory (created on first snapshot)
+        """
+        self.root = Path(root)
+        self.blob_dir = self.root / "blobs"
+        self.manifest_dir = self.root / "manifests"
+        self._manifests: Dict[str, Dict[str, str]] = {}
+        # Per version: data type -> record id -> path relative to the type directory
+        self._ids: Dict[str, Dict[str, Dict[str, str]]] = {}
+        # Parsed records by blob hash; unchanged records are shared across versions
+        self._records: Dict[str, Any] = {}
+    
+    # -- blobs ---------------------------------------------------------------
+    
+    def _blob_path(self, blob_hash: str) -> Path:
+        return self.blob_dir / blob_hash[:2] / blob_hash[2:]
+    
+    def has_blob(self, blob_hash: str) -> bool:
+        """True if the store holds this content."""
+        return self._blob_path(blob_hash).exists()
+    
+    def put_blob(self, data: bytes) -> Tuple[str, bool]:
+        """
+        Store file contents.
+        
+        Returns:
+            (blob hash, True if the blob was new)
+        """
+        blob_hash = hash_bytes(data)
+        path = self._blob_path(blob_hash)
+        if path.exists():
+            return blob_hash, False
+        
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(path.name + ".tmp")
+        with open(temp_path, "wb") as f:
+            f.write(zlib.compress(data))
+        os.replace(temp_path, path)
+        return blob_hash, True
+    
+    def read_blob(self, blob_hash: str) -> bytes:
+        """Return the contents stored under a hash."""
+        with open(self._blob_path(blob_hash), "rb") as f:
+            return zlib.decompress(f.read())
+    
+    def load_blob(self, blob_hash: str) -> Any:
+        """Parse a YAML blob (cached by hash; treat the result as read-only)."""
+        if blob_hash not in self._records:
+            self._records[blob_hash] = load_yaml(self.read_blob(blob_hash).decode("utf-8"))
+        return self._records[blob_hash]
+    
+    # -- manifests -----------------------------------------------------------
+    
+    def _manifest_path(self, version: str) -> Path:
+        return self.manifest_dir / f"{version}.json"
+    
+    def versions(self) -> List[str]:
+        """Stored versions, oldest first."""
+        if not self.manifest_dir.exists():
+            return []
+        return sorted((path.stem for path in self.manifest_dir.glob("*.json")), key=version_key)
+    
+    def resolve_version(self, version: str) -> str:
+        """
+        Resolve 'latest' to the newest stored version.
+        
+        Raises:
+            KeyError: If the version is not stored
+        """
+        if version == "latest":
+            versions = self.versions()
+            if not versions:
+                raise KeyError(f"No versions stored in {self.root}")
+            return versions[-1]
+        if not self._manifest_path(version).exists():
+            raise KeyError(f"Version {version} is not stored in {self.root}")
+        return version
+    
+    def _load_manifest(self, version: str) -> str:
+        """Read a version's manifest into the caches; returns the resolved version."""
+        version = self.resolve_version(version)
+        if version not in self._manifests:
+            with open(self._manifest_path(version), "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("format") != self.FORMAT:
+                raise ValueError(f"Unsupported manifest format in {self._manifest_path(version)}; "
+                                 f"snapshot the version again")
+            self._manifests[version] = manifest["files"]
+            self._ids[version] = manifest["ids"]
+        return version
+    
+    def manifest(self, version: str) -> Dict[str, str]:
+        """Map of relative path -> blob hash for a version."""
+        return self._manifests[self._load_manifest(version)]
+    
+    def ids(self, data_type: str, version: str = "latest") -> Dict[str, str]:
+        """Record id -> path (relative to the data type directory) for one data type."""
+        return self._ids[self._load_manifest(version)].get(data_type.rstrip("/"), {})
+    
+    def snapshot(self, version_dir: Union[str, Path], version: Optional[str] = None) -> Dict[str, int]:
+        """
+        Store every file of a version directory and write its manifest.
+        
+        Args:
+            version_dir: e.g. parsed_data/0.10.1 (a 'latest' symlink is resolved)
+            version: Version name (defaults to the resolved directory name)
+        
+        Returns:
+            Counts of files, new blobs and bytes written
+        """
+        version_dir = Path(version_dir).resolve()
+        version = version or version_dir.name
+        if not version_dir.is_dir():
+            raise FileNotFoundError(f"Version directory not found: {version_dir}")
+        
+        files: Dict[str, str] = {}
+        ids: Dict[str, Dict[str, str]] = {}
+        stats = {"files": 0, "new_blobs": 0, "bytes_written": 0}
+        for path in sorted(version_dir.rglob("*")):
+            if not path.is_file() or path.name in SKIPPED_FILES or path.name.endswith(".tmp"):
+                continue
+            relative = path.relative_to(version_dir).as_posix()
+            blob_hash, is_new = self.put_blob(normalize_content(path.name, path.read_bytes()))
+            files[relative] = blob_hash
+            stats["files"] += 1
+            
+            # Index record ids so get() loads one blob instead of the whole type
+            data_type, _, type_path = relative.partition("/")
+            if type_path and is_record_path(type_path):
+                entity_id = record_id(self.load_blob(blob_hash))
+                if entity_id is not None:
+                    ids.setdefault(data_type, {}).setdefault(entity_id, type_path)
+            if is_new:
+                stats["new_blobs"] += 1
+                stats["bytes_written"] += self._blob_path(blob_hash).stat().st_size
+        
+        self.manifest_dir.mkdir(parents=True, exist_ok=True)
+        manifest_path = self._manifest_path(version)
+        temp_path = manifest_path.with_suffix(".json.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "format": self.FORMAT,
+                "version": version,
+                "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "files": files,
+                "ids": ids,
+            }, f, indent=1, sort_keys=True)
+        os.replace(temp_path, manifest_path)
+        self._manifests[version] = files
+        self._ids[version] = ids
+        
+        logger.info(f"Stored {version}: {stats['files']} files, {stats['new_blobs']} new blobs "
+                    f"({stats['bytes_written']} bytes)")
+        return stats
+    
+    # -- queries -------------------------------------------------------------
+    
+    def files(self, data_type: str, version: str = "latest") -> Dict[str, str]:
+        """Paths (relative to the data type directory) -> blob hash for one data type."""
+        prefix = data_type.rstrip("/") + "/"
+        return {
+            path[len(prefix):]: blob_hash
+            for path, blob_hash in self.manifest(version).items()
+            if path.startswith(prefix)
+        }
+    
+    def records(self, data_type: str, version: str = "latest") -> Iterator[Tuple[str, Any]]:
+        """
+        Yield (relative path, record) for every record of a data type at a version.
+        
+        Index files (``*_index.yaml``) and non-YAML files are skipped.
+        """
+        for path, blob_hash in sorted(self.files(data_type, version).items()):
+            if is_record_path(path):
+                yield path, self.load_blob(blob_hash)
+    
+    def get(self, data_type: str, entity_id: str, version: str = "latest") -> Optional[Any]:
+        """Return the record with this id at a version, or None."""
+        path = self.ids(data_type, version).get(entity_id)
+        if path is None:
+            return None
+        return self.load_blob(self.manifest(version)[f"{data_type.rstrip('/')}/{path}"])
+    
+    def changes(self, old_version: str, new_version: str,
+                data_type: Optional[str] = None) -> Dict[str, List[str]]:
+        """
+        Compare two versions by blob hash (no file is read).
+        
+        Blobs are hashed without the volatile fields, so a record that was only
+        re-parsed for the new version is not reported as modified.
+        
+        Args:
+            old_version: Base version
+            new_version: Version compared against it
+            data_type: Limit to one data type
+        
+        Returns:
+            Sorted relative paths that were 'added', 'removed' and 'modified'
+        """
+        if data_type:
+            old, new = self.files(data_type, old_version), self.files(data_type, new_version)
+        else:
+            old, new = self.manifest(old_version), self.manifest(new_version)
+        return {
+            "added": sorted(new.keys() - old.keys()),
+            "removed": sorted(old.keys() - new.keys()),
+            "modified": sorted(path for path in old.keys() & new.keys() if old[path] != new[path]),
+        }
+    
+    def checkout(self, version: str, destination: Union[str, Path]) -> int:
+        """
+        Rebuild a version's directory tree.
+        
+        Files already matching their blob are left alone; files the version
+        does not contain are not removed. Files are written as stored, without
+        their volatile fields.
+        
+        Returns:
+            Number of files written
+        """
+        destination = Path(destination)
+        written = 0
+        for path, blob_hash in self.manifest(version).items():
+            target = destination / path
+            if target.exists() and hash_bytes(normalize_content(target.name, target.read_bytes())) == blob_hash:
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(self.read_blob(blob_hash))
+            written += 1
+        logger.info(f"Checked out {self.resolve_version(version)} to {destination} ({written} files written)")
+        return written
+    
+    def gc(self) -> int:
+        """
+        Delete blobs no stored manifest refers to.
+        
+        Returns:
+            Number of blobs removed
+        """
+        referenced = set()
+        for version in self.versions():
+            referenced.update(self.manifest(version).values())
+        
+        removed = 0
+        for path in self.blob_dir.glob("*/*") if self.blob_dir.exists() else []:
+            if path.parent.name + path.name not in referenced:
+                path.unlink()
+                removed += 1
+        logger.info(f"Removed {removed} unreferenced blobs")
+        return removed
+    
+    def stats(self) -> Dict[str, int]:
+        """Manifest, file and blob counts plus blob bytes on disk."""
+        versions = self.versions()
+        blobs = [path for path in self.blob_dir.glob("*/*")] if self.blob_dir.exists() else []
+        return {
+            "versions": len(versions),
+            "files": sum(len(self.manifest(version)) for version in versions),
+            "blobs": len(blobs),
+            "blob_bytes": sum(path.stat().st_size for path in blobs),
+        }
+
+
+def main():
+    """Snapshot, query and restore versions of a data tree."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Content-addressed store for versioned parsed data")
+    parser.add_argument('--store', default='parsed_data/_store', help='Store directory (default: parsed_data/_store)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    snapshot_parser = subparsers.add_parser('snapshot', help='Store version directories')
+    snapshot_parser.add_argument('version_dirs', nargs='+', help='e.g. parsed_data/0.10.1')
+    
+    subparsers.add_parser('list', help='List stored versions and disk usage')
+    
+    show_parser = subparsers.add_parser('show', help='Print the records of a data type at a version')
+    show_parser.add_argument('data_type', help='e.g. items')
+    show_parser.add_argument('--version', default='latest')
+    show_parser.add_argument('--id', help='Only the record with this id')
+    
+    diff_parser = subparsers.add_parser('diff', help='List files changed between two versions')
+    diff_parser.add_argument('old_version')
+    diff_parser.add_argument('new_version')
+    diff_parser.add_argument('--data-type', help='Limit to one data type')
+    
+    checkout_parser = subparsers.add_parser('checkout', help='Rebuild a version directory')
+    checkout_parser.add_argument('version')
+    checkout_parser.add_argument('destination', help='e.g. parsed_data/0.10.1')
+    
+    subparsers.add_parser('gc', help='Delete unreferenced blobs')
+    
+    args = parser.parse_args()
+    
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
+    store = ReleaseStore(args.store)
+    
+    if args.command == 'snapshot':
+        for version_dir in args.version_dirs:
+            store.snapshot(version_dir)
+    elif args.command == 'list':
+        for version in store.versions():
+            print(f"{version}\t{len(store.manifest(version))} files")
+        stats = store.stats()
+        print(f"{stats['blobs']} blobs ({stats['blob_bytes']} bytes) for {stats['files']} files "
+              f"in {stats['versions']} versions")
+    elif args.command == 'show':
+        from .storage import dump_yaml
+        if args.id:
+            record = store.get(args.data_type, args.id, args.version)
+            if record is None:
+                logger.error(f"No {args.data_type} record {args.id} in {args.version}")
+            else:
+                print(dump_yaml(record), end='')
+        else:
+            for path, record in store.records(args.data_type, args.version):
+                print(f"--- # {path}")
+                print(dump_yaml(record), end='')
+    elif args.command == 'diff':
+        changes = store.changes(args.old_version, args.new_version, args.data_type)
+        for kind, marker in (('added', 'A'), ('removed', 'D'), ('modified', 'M')):
+            for path in changes[kind]:
+                print(f"{marker}\t{path}")
+    elif args.command == 'checkout':
+        store.checkout(args.version, args.destination)
+    elif args.command == 'gc':
+        store.gc()
+
+
+if __name__ == "__main__":
+    main()
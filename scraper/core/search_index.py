@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+Embedded full-text search over one parsed data version.
+
+The index is a SQLite database with an FTS5 table (parsed_data/_search/<version>.sqlite)
+holding three columns per record, weighted like the search_vector columns of
+yaml2supabase/schema.py: name (A), description (B) and tags (C: keywords,
+roles, item or monster type). Queries match words by prefix, fall back to the
+closest indexed words for terms that match nothing, and can be filtered and
+faceted by data type, record type, tier and keyword. Keyword facets hold
+normalized keyword names, so filters match regardless of case or spacing.
+
+Each indexed file is stored with its size and mtime, so update() re-reads only
+files a parser changed since the last run; update_latest_data.py calls it after
+every parse.
+"""
+import re
+import difflib
+import logging
+import sqlite3
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .entity_index import ENTITY_TYPES, normalize_name
+from .storage import RecordStore, iter_record_files
+
+logger = logging.getLogger(__name__)
+
+FORMAT = 2
+
+# Relative weights of the A/B/C columns (Postgres ts_rank defaults for A, B and C)
+WEIGHTS = {'name': 1.0, 'description': 0.4, 'tags': 0.2}
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS meta(key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS documents(
+    doc INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    data_type TEXT NOT NULL,
+    entity_id TEXT,
+    name TEXT,
+    type TEXT,
+    tier INTEGER
+);
+CREATE INDEX IF NOT EXISTS documents_by_type ON documents(data_type);
+CREATE TABLE IF NOT EXISTS facets(
+    doc INTEGER NOT NULL,
+    facet TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY(facet, value, doc)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS facets_by_doc ON facets(doc);
+CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5(
+    {', '.join(WEIGHTS)},
+    tokenize = 'porter unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS search_vocab USING fts5vocab(search_fts, 'row');
+"""
+
+WORD_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+
+def _text(value: Any) -> str:
+    """Flatten strings out of nested lists and dicts (descriptions are not always plain strings)."""
+    if value is None:
+        return ''
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        return ' '.join(_text(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return ' '.join(_text(item) for item in value)
+    return str(value)
+
+
+def _keywords(record: Dict[str, Any]) -> List[str]:
+    return [str(keyword) for keyword in record.get('keywords') or [] if keyword]
+
+
+# Per data type: description (B) and tags (C) of a record, as in the schema's search_vector
+DOCUMENT_FIELDS = {
+    'classes': lambda record: (record.get('description'),
+                               [record.get('main_role'), record.get('secondary_role')]),
+    'abilities': lambda record: (record.get('description'), _keywords(record)),
+    'monster-abilities': lambda record: (record.get('description'), _keywords(record)),
+    'items': lambda record: (record.get('description'), [record.get('type'), record.get('subtype')]),
+    'monsters': lambda record: ([record.get('appearance', record.get('description')),
+                                 record.get('habitat', record.get('lore'))],
+                                [record.get('type'), record.get('danger_level')]),
+    'races': lambda record: (record.get('description'), [record.get('type')]),
+}
+
+
+def document_fields(data_type: str, record: Dict[str, Any]) -> Tuple[str, str, str]:
+    """Name, description and tags text of a record."""
+    description, tags = DOCUMENT_FIELDS.get(data_type, lambda record: (record.get('description'), []))(record)
+    return _text(record.get('name') or record.get('id')), _text(description), _text(tags)
+
+
+def _unwrap(data_type: str, record: Any) -> Any:
+    if data_type == 'classes' and isinstance(record, dict) and 'class' in record:
+        return record['class']
+    return record
+
+
+def default_index_path(version_dir: Union[str, Path]) -> Path:
+    """parsed_data/_search/<version>.sqlite, with 'latest' resolved to its version."""
+    version_dir = Path(version_dir).resolve()
+    return version_dir.parent / '_search' / f"{version_dir.name}.sqlite"
+
+
+class SearchIndex:
+    """FTS5 index over the records of one parsed data version."""
+    
+    def __init__(self, version_dir: Union[str, Path], index_path: Optional[Union[str, Path]] = None):
+        """
+        Args:
+            version_dir: e.g. parsed_data/0.10.1
+            index_path: Index database (default: parsed_data/_search/<version>.sqlite)
+        """
+        self.version_dir = Path(version_dir)
+        self.index_path = Path(index_path) if index_path else default_index_path(self.version_dir)
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        self.conn = sqlite3.connect(str(self.index_path), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        stored_format = None
+        try:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'format'").fetchone()
+            stored_format = int(row[0]) if row else None
+        except sqlite3.OperationalError:
+            pass
+        if stored_format not in (None, FORMAT):
+            logger.info(f"Search index {self.index_path} has format {stored_format}, rebuilding")
+            self._drop()
+        self.conn.executescript(SCHEMA)
+        self.conn.execute("INSERT OR REPLACE INTO meta(key, value) VALUES('format', ?)", (str(FORMAT),))
+        self.conn.commit()
+        
+        self._vocabulary: Optional[List[str]] = None
+    
+    def _drop(self):
+        for table in ('search_vocab', 'search_fts', 'facets', 'documents', 'meta'):
+            self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+    
+    def close(self):
+        self.conn.close()
+    
+    # ---- building ----
+    
+    def _delete(self, docs: Iterable[int]):
+        docs = [(doc,) for doc in docs]
+        self.conn.executemany("DELETE FROM search_fts WHERE rowid = ?", docs)
+        self.conn.executemany("DELETE FROM facets WHERE doc = ?", docs)
+        self.conn.executemany("DELETE FROM documents WHERE doc = ?", docs)
+    
+    def _add(self, data_type: str, relative: str, path: Path, record: Any) -> bool:
+        stat = path.stat()
+        record = _unwrap(data_type, record)
+        if not isinstance(record, dict):
+            return False
+        
+        tier = record.get('tier')
+        doc = self.conn.execute(
+            "INSERT INTO documents(path, size, mtime_ns, data_type, entity_id, name, type, tier) "
+            "VALUES(?, ?, ?, ?, ?, ?, ?, ?)",
+            (relative, stat.st_size, stat.st_mtime_ns, data_type,
+             str(record['id']) if record.get('id') is not None else None,
+             _text(record.get('name')) or None,
+             str(record['type']) if isinstance(record.get('type'), str) else None,
+             tier if isinstance(tier, int) else None)).lastrowid
+        self.conn.execute(f"INSERT INTO search_fts(rowid, {', '.join(WEIGHTS)}) VALUES(?, ?, ?, ?)",
+                          (doc, *document_fields(data_type, record)))
+        
+        facets = {('data_type', data_type)}
+        if isinstance(record.get('type'), str):
+            facets.add(('type', record['type']))
+        if isinstance(tier, int):
+            facets.add(('tier', str(tier)))
+        facets.update(('keyword', normalize_name(keyword)) for keyword in _keywords(record))
+        self.conn.executemany("INSERT OR IGNORE INTO facets(doc, facet, value) VALUES(?, ?, ?)",
+                              [(doc, facet, value) for facet, value in facets])
+        return True
+    
+    def update(self, data_types: Optional[Iterable[str]] = None, full: bool = False,
+               store: Optional[RecordStore] = None) -> Dict[str, int]:
+        """
+        Bring the index up to date with the version directory.
+        
+        Only files added, changed (size or mtime) or removed since the last
+        update are touched.
+        
+        Args:
+            data_types: Data types to refresh (default: all)
+            full: Re-index every file
+            store: Record store to load through (one is created if omitted)
+        
+        Returns:
+            Counts of 'added', 'updated', 'removed' and 'unchanged' files
+        """
+        store = store or RecordStore()
+        counts = {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0}
+        
+        with self.conn:
+            for data_type in data_types or ENTITY_TYPES:
+                indexed = {
+                    row['path']: row for row in self.conn.execute(
+                        "SELECT doc, path, size, mtime_ns FROM documents WHERE data_type = ?", (data_type,))
+                }
+                type_dir = self.version_dir / data_type
+                for path in iter_record_files(type_dir) if type_dir.exists() else []:
+                    relative = path.relative_to(self.version_dir).as_posix()
+                    previous = indexed.pop(relative, None)
+                    stat = path.stat()
+                    if (previous is not None and not full and previous['size'] == stat.st_size
+                            and previous['mtime_ns'] == stat.st_mtime_ns):
+                        counts['unchanged'] += 1
+                        continue
+                    if previous is not None:
+                        self._delete([previous['doc']])
+                    try:
+                        record = store.load(path)
+                    except Exception as e:
+                        logger.warning(f"Could not index {path}: {e}")
+                        continue
+                    if self._add(data_type, relative, path, record):
+                        counts['updated' if previous is not None else 'added'] += 1
+                
+                # Files that disappeared since the last update
+                self._delete(row['doc'] for row in indexed.values())
+                counts['removed'] += len(indexed)
+        
+        if counts['added'] or counts['updated'] or counts['removed']:
+            self.conn.execute("INSERT INTO search_fts(search_fts) VALUES('optimize')")
+            self.conn.commit()
+            self._vocabulary = None
+        logger.info(f"Search index {self.index_path}: {counts['added']} added, {counts['updated']} updated, "
+                    f"{counts['removed']} removed, {counts['unchanged']} unchanged")
+        return counts
+    
+    # ---- querying ----
+    
+    @property
+    def vocabulary(self) -> List[str]:
+        """Every indexed word, as stemmed by the tokenizer, for fuzzy matching."""
+        if self._vocabulary is None:
+            self._vocabulary = [row[0] for row in self.conn.execute("SELECT term FROM search_vocab")]
+        return self._vocabulary
+    
+    def _term_matches(self, term: str) -> bool:
+        return self.conn.execute("SELECT 1 FROM search_fts WHERE search_fts MATCH ? LIMIT 1",
+                                 (f'"{term}"*',)).fetchone() is not None
+    
+    def match_expression(self, query: str, prefix: bool = True, fuzzy: bool = True) -> Optional[str]:
+        """
+        FTS5 MATCH expression for a plain-text query.
+        
+        Every word must match (as a prefix unless prefix=False). With fuzzy,
+        a word matching nothing is replaced by the closest indexed words. Those
+        are stems, and stemming a stem again can shorten it (as a whole word,
+        'firebal' finds nothing), so they are matched as prefixes.
+        
+        Returns:
+            The expression, or None if the query has no searchable words
+        """
+        parts = []
+        for term in WORD_PATTERN.findall(query.lower()):
+            pattern = f'"{term}"*' if prefix else f'"{term}"'
+            if fuzzy and not self._term_matches(term):
+                close = difflib.get_close_matches(term, self.vocabulary, n=3, cutoff=0.75)
+                if close:
+                    pattern = '(' + ' OR '.join(f'"{word}"*' for word in close) + ')'
+            parts.append(pattern)
+        return ' AND '.join(parts) if parts else None
+    
+    def _filters(self, data_types: Optional[Iterable[str]], type: Optional[str],
+                 tier: Optional[int], keywords: Optional[Iterable[str]]) -> Tuple[str, list]:
+        clauses = []
+        params: list = []
+        data_types = list(data_types or [])
+        if data_types:
+            clauses.append(f"d.data_type IN ({', '.join('?' * len(data_types))})")
+            params.extend(data_types)
+        if type:
+            clauses.append("d.type = ?")
+            params.append(type)
+        if tier is not None:
+            clauses.append("d.tier = ?")
+            params.append(tier)
+        for keyword in keywords or []:
+            clauses.append("EXISTS (SELECT 1 FROM facets f WHERE f.facet = 'keyword' AND f.value = ? AND f.doc = d.doc)")
+            params.append(normalize_name(keyword))
+        return ''.join(f" AND {clause}" for clause in clauses), params
+    
+    def search(self, query: str, data_types: Optional[Iterable[str]] = None, type: Optional[str] = None,
+               tier: Optional[int] = None, keywords: Optional[Iterable[str]] = None, limit: int = 20,
+               prefix: bool = True, fuzzy: bool = True) -> List[Dict[str, Any]]:
+        """
+        Search the index, best matches first.
+        
+        Args:
+            query: Plain-text query
+            data_types: Only these data types (e.g. ['abilities'])
+            type: Only records with this type field (e.g. 'key_ability')
+            tier: Only records of this tier
+            keywords: Only records carrying all these keywords (case and spacing are ignored)
+            limit: Maximum results
+            prefix: Match words by prefix
+            fuzzy: Replace words that match nothing by close indexed words
+        
+        Returns:
+            Results with data_type, id, name, type, tier, path, score (higher is better) and snippet
+        """
+        expression = self.match_expression(query, prefix=prefix, fuzzy=fuzzy)
+        if expression is None:
+            return []
+        where, params = self._filters(data_types, type, tier, keywords)
+        rows = self.conn.execute(
+            "SELECT d.data_type, d.entity_id, d.name, d.type, d.tier, d.path, "
+            f"bm25(search_fts, {', '.join(str(weight) for weight in WEIGHTS.values())}) AS rank, "
+            "snippet(search_fts, 1, '[', ']', '...', 12) AS snippet "
+            "FROM search_fts JOIN documents d ON d.doc = search_fts.rowid "
+            f"WHERE search_fts MATCH ?{where} ORDER BY rank LIMIT ?",
+            (expression, *params, limit)).fetchall()
+        return [{
+            'data_type': row['data_type'],
+            'id': row['entity_id'],
+            'name': row['name'],
+            'type': row['type'],
+            'tier': row['tier'],
+            'path': row['path'],
+            'score': round(-row['rank'], 4),
+            'snippet': row['snippet'],
+        } for row in rows]
+    
+    def facets(self, query: Optional[str] = None, data_types: Optional[Iterable[str]] = None,
+               type: Optional[str] = None, tier: Optional[int] = None,
+               keywords: Optional[Iterable[str]] = None, prefix: bool = True,
+               fuzzy: bool = True) -> Dict[str, Dict[str, int]]:
+        """
+        Count matching records per facet value (data_type, type, tier, keyword).
+        
+        Takes the same query and filters as search(); without a query every
+        indexed record counts.
+        """
+        where, params = self._filters(data_types, type, tier, keywords)
+        if query:
+            expression = self.match_expression(query, prefix=prefix, fuzzy=fuzzy)
+            if expression is None:
+                return {}
+            matched = ("SELECT d.doc FROM search_fts JOIN documents d ON d.doc = search_fts.rowid "
+                       f"WHERE search_fts MATCH ?{where}")
+            params = [expression, *params]
+        else:
+            matched = f"SELECT d.doc FROM documents d WHERE 1{where}"
+        counts: Dict[str, Dict[str, int]] = defaultdict(dict)
+        for row in self.conn.execute(
+                f"SELECT facet, value, COUNT(*) FROM facets WHERE doc IN ({matched}) "
+                "GROUP BY facet, value ORDER BY facet, COUNT(*) DESC, value", params):
+            counts[row[0]][row[1]] = row[2]
+        return dict(counts)
+    
+    def stats(self) -> Dict[str, int]:
+        """Indexed records per data type."""
+        return {row[0]: row[1] for row in self.conn.execute(
+            "SELECT data_type, COUNT(*) FROM documents GROUP BY data_type ORDER BY data_type")}
+
+
+def main():
+    """Build or query the search index of a parsed data version."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Full-text search over parsed game data")
+    parser.add_argument('--data-dir', default='parsed_data/latest',
+                        help='Parsed data version directory (default: parsed_data/latest)')
+    parser.add_argument('--index', help='Index database (default: parsed_data/_search/<version>.sqlite)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    build_parser = subparsers.add_parser('build', help='Index new and changed files')
+    build_parser.add_argument('--data-types', nargs='+', choices=ENTITY_TYPES, help='Only these data types')
+    build_parser.add_argument('--full', action='store_true', help='Re-index every file')
+    
+    search_parser = subparsers.add_parser('search', help='Search the index')
+    search_parser.add_argument('query', nargs='+')
+    search_parser.add_argument('--data-types', nargs='+', choices=ENTITY_TYPES, help='Only these data types')
+    search_parser.add_argument('--type', help='Only records with this type (e.g. key_ability)')
+    search_parser.add_argument('--tier', type=int, help='Only records of this tier')
+    search_parser.add_argument('--keyword', action='append', dest='keywords', help='Only records with this keyword (repeatable)')
+    search_parser.add_argument('--limit', type=int, default=20)
+    search_parser.add_argument('--exact', action='store_true', help='Whole words only, no prefix or fuzzy matching')
+    search_parser.add_argument('--facets', action='store_true', help='Also print facet counts')
+    
+    args = parser.parse_args()
+    
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
+    index = SearchIndex(args.data_dir, args.index)
+    try:
+        if args.command == 'build':
+            index.update(args.data_types, full=args.full)
+            for data_type, count in index.stats().items():
+                print(f"{data_type}\t{count}")
+        elif args.command == 'search':
+            query = ' '.join(args.query)
+            options = dict(data_types=args.data_types, type=args.type, tier=args.tier, keywords=args.keywords,
+                           prefix=not args.exact, fuzzy=not args.exact)
+            for result in index.search(query, limit=args.limit, **options):
+                print(f"{result['score']:8.3f}  {result['data_type']:<18} {result['id'] or '':<30} {result['name']}")
+                if result['snippet']:
+                    print(f"{'':10}{result['snippet']}")
+            if args.facets:
+                for facet, values in index.facets(query, **options).items():
+                    print(f"{facet}: " + ', '.join(f"{value} ({count})" for value, count in values.items()))
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
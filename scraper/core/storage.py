@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Storage layer for parsed data.
+
+YAML is read and written with libyaml (CSafeLoader / CSafeDumper) when PyYAML
+was built with it, falling back to the pure-Python classes otherwise.
+
+Each data type directory can also carry a consolidated corpus: every record in
+one JSON-lines file (``_corpus.jsonl``) plus an offset index
+(``_corpus.index.json``) naming the YAML file each record came from, with that
+file's size and mtime. Readers such as RecordStore serve a YAML file from the
+corpus while it is unchanged on disk and fall back to the file otherwise, so
+the per-file YAML tree stays the editable export view.
+"""
+import os
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, IO, Iterator, List, Optional, Tuple, Union
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+# libyaml-backed loader/dumper when available (several times faster)
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+SafeDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+YAML_DUMP_OPTIONS = {"default_flow_style": False, "allow_unicode": True, "sort_keys": False}
+
+
+def load_yaml(stream: Union[str, IO]) -> Any:
+    """Parse a YAML document with the fastest safe loader available."""
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def load_yaml_file(path: Union[str, Path]) -> Any:
+    """Load one YAML file."""
+    with open(path, "r", encoding="utf-8") as f:
+        return load_yaml(f)
+
+
+def dump_yaml(data: Any, stream: Optional[IO] = None) -> Optional[str]:
+    """
+    Serialize data as block-style YAML.
+    
+    Uses the safe libyaml dumper; data it cannot represent (enums, objects)
+    falls back to the full pure-Python dumper the parsers always used.
+    
+    Args:
+        data: Data to serialize
+        stream: File to write to; None returns the YAML as a string
+    
+    Returns:
+        YAML string when no stream is given
+    """
+    try:
+        text = yaml.dump(data, Dumper=SafeDumper, **YAML_DUMP_OPTIONS)
+    except yaml.representer.RepresenterError:
+        text = yaml.dump(data, Dumper=yaml.Dumper, **YAML_DUMP_OPTIONS)
+    
+    if stream is None:
+        return text
+    stream.write(text)
+    return None
+
+
+def write_yaml_file(path: Union[str, Path], data: Any):
+    """Write one YAML file."""
+    text = dump_yaml(data)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def _is_json_safe(value: Any) -> bool:
+    """True if JSON round-trips the value unchanged (str keys, JSON scalar types only)."""
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return True
+    if isinstance(value, list):
+        return all(_is_json_safe(item) for item in value)
+    if isinstance(value, dict):
+        return all(isinstance(key, str) and _is_json_safe(item) for key, item in value.items())
+    return False
+
+
+def iter_record_files(directory: Path) -> List[Path]:
+    """List the record YAML files under a data type directory (index files excluded)."""
+    return sorted(
+        path for path in directory.glob("**/*.yaml")
+        if not path.name.endswith("_index.yaml")
+    )
+
+
+class Corpus:
+    """
+    Consolidated JSON-lines copy of one data type directory's YAML records.
+    
+    The index maps each source file (relative path) to the byte offset and
+    length of its record in the data file, along with the source's size and
+    mtime at build time so stale entries can be detected.
+    """
+    
+    DATA_FILENAME = "_corpus.jsonl"
+    INDEX_FILENAME = "_corpus.index.json"
+    FORMAT = 1
+    
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+        self.data_path = self.directory / self.DATA_FILENAME
+        self.index_path = self.directory / self.INDEX_FILENAME
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._handle: Optional[IO[bytes]] = None
+    
+    def exists(self) -> bool:
+        """True if both the data file and index are present."""
+        return self.data_path.exists() and self.index_path.exists()
+    
+    @property
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        """Index entries keyed by source path relative to the directory."""
+        if self._entries is None:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("format") != self.FORMAT:
+                raise ValueError(f"Unsupported corpus format in {self.index_path}")
+            self._entries = {entry["path"]: entry for entry in index["records"]}
+        return self._entries
+    
+    @classmethod
+    def build(cls, directory: Union[str, Path]) -> "Corpus":
+        """
+        Write the corpus for every record YAML file in a directory.
+        
+        Records JSON cannot represent exactly (non-string keys, dates) are left
+        out of the corpus; readers load those from their YAML file.
+        
+        Args:
+            directory: Data type directory (e.g. parsed_data/0.10.1/items)
+        
+        Returns:
+            The new corpus
+        """
+        corpus = cls(directory)
+        records = []
+        skipped = 0
+        
+        temp_data = corpus.data_path.with_suffix(".jsonl.tmp")
+        with open(temp_data, "wb") as out:
+            for path in iter_record_files(corpus.directory):
+                stat = path.stat()
+                data = load_yaml_file(path)
+                if not _is_json_safe(data):
+                    skipped += 1
+                    continue
+                
+                line = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+                records.append({
+                    "path": path.relative_to(corpus.directory).as_posix(),
+                    "id": data.get("id") if isinstance(data, dict) else None,
+                    "offset": out.tell(),
+                    "length": len(line),
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                })
+                out.write(line)
+        
+        temp_index = corpus.index_path.with_suffix(".json.tmp")
+        with open(temp_index, "w", encoding="utf-8") as f:
+            json.dump({"format": cls.FORMAT, "records": records}, f, ensure_ascii=False)
+        
+        # Data first, then index: a reader never sees an index pointing past the data
+        os.replace(temp_data, corpus.data_path)
+        os.replace(temp_index, corpus.index_path)
+        
+        logger.info(f"Built corpus for {corpus.directory} with {len(records)} records"
+                    + (f" ({skipped} left as YAML only)" if skipped else ""))
+        return corpus
+    
+    def is_current(self, path: Path) -> bool:
+        """True if the corpus holds an up-to-date copy of this YAML file."""
+        entry = self.entries.get(self._relative(path))
+        if entry is None:
+            return False
+        try:
+            stat = path.stat()
+        except OSError:
+            return False
+        return stat.st_size == entry["size"] and stat.st_mtime_ns == entry["mtime_ns"]
+    
+    def read(self, path: Path) -> Any:
+        """
+        Read the record stored for a YAML file.
+        
+        Raises:
+            KeyError: If the file is not in the corpus
+        """
+        entry = self.entries[self._relative(path)]
+        if self._handle is None:
+            self._handle = open(self.data_path, "rb")
+        self._handle.seek(entry["offset"])
+        return json.loads(self._handle.read(entry["length"]))
+    
+    def __iter__(self) -> Iterator[Tuple[Path, Any]]:
+        """Yield (YAML path, record) for every corpus record in one sequential pass."""
+        entries = sorted(self.entries.values(), key=lambda entry: entry["offset"])
+        with open(self.data_path, "rb") as f:
+            for entry in entries:
+                yield self.directory / entry["path"], json.loads(f.readline())
+    
+    def close(self):
+        """Close the data file if it was opened for random access."""
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+    
+    def _relative(self, path: Path) -> str:
+        try:
+            return Path(path).relative_to(self.directory).as_posix()
+        except ValueError:
+            return Path(path).as_posix()
+
+
+class RecordStore:
+    """
+    Loads record YAML files, serving them from their data type's corpus when current.
+    
+    The corpus for a file is looked up in its directory and up to two parents
+    (races keep records in primary/ and sub/). Files missing from the corpus or
+    changed since it was built are read from YAML, so results always match the
+    YAML tree.
+    """
+    
+    def __init__(self):
+        self._corpora: Dict[Path, Optional[Corpus]] = {}
+    
+    def _corpus_for(self, path: Path) -> Optional[Corpus]:
+        for directory in list(path.parents)[:3]:
+            if directory not in self._corpora:
+                corpus = Corpus(directory)
+                self._corpora[directory] = corpus if corpus.exists() else None
+            if self._corpora[directory] is not None:
+                return self._corpora[directory]
+        return None
+    
+    def load(self, path: Union[str, Path]) -> Any:
+        """Load one record file."""
+        path = Path(path)
+        corpus = self._corpus_for(path)
+        if corpus is not None:
+            try:
+                if corpus.is_current(path):
+                    return corpus.read(path)
+            except (OSError, ValueError, KeyError) as e:
+                logger.debug(f"Corpus read failed for {path}, using YAML: {e}")
+        return load_yaml_file(path)
+    
+    def close(self):
+        """Close every corpus opened by this store."""
+        for corpus in self._corpora.values():
+            if corpus is not None:
+                corpus.close()
+        self._corpora.clear()
+
+
+def main():
+    """Build corpora for parsed data type directories."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Build per-type JSON-lines corpora from parsed YAML")
+    parser.add_argument("directories", nargs="+",
+                        help="Data type directories (e.g. parsed_data/latest/items) or version directories")
+    args = parser.parse_args()
+    
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
+    for directory in map(Path, args.directories):
+        if not directory.is_dir():
+            logger.error(f"Directory not found: {directory}")
+            continue
+        
+        # A version directory holds one subdirectory per data type
+        has_records = any(directory.glob("*.yaml"))
+        targets = [directory] if has_records else sorted(d for d in directory.iterdir() if d.is_dir())
+        for target in targets:
+            Corpus.build(target)
+
+
+if __name__ == "__main__":
+    main()
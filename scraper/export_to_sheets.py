@@ -20,6 +20,8 @@ from exporters.sheets.classes_exporter import ClassesExporter
 from exporters.sheets.abilities_exporter import AbilitiesExporter
 from exporters.sheets.items_exporter import ItemsExporter
 from exporters.sheets.generic_exporter import GenericExporter
+from exporters.sheets.batch import SheetsBatch
+from exporters.sheets.rate_limit import DEFAULT_QUOTAS, configure_default_limiter
 
 # Configure logging
 logging.basicConfig(
@@ -125,11 +127,36 @@ def main():
         action="store_true",
         help="Keep the spreadsheet private (overrides --public)"
     )
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help="Update the existing spreadsheet in place, writing only changed rows (keeps sheet IDs stable)"
+    )
+    parser.add_argument(
+        "--read-quota",
+        type=int,
+        default=DEFAULT_QUOTAS['read'],
+        help=f"Sheets read requests per minute to stay under (default: {DEFAULT_QUOTAS['read']})"
+    )
+    parser.add_argument(
+        "--write-quota",
+        type=int,
+        default=DEFAULT_QUOTAS['write'],
+        help=f"Sheets write requests per minute to stay under (default: {DEFAULT_QUOTAS['write']})"
+    )
+    parser.add_argument(
+        "--no-batch",
+        action="store_true",
+        help="Send each sheet operation as its own API call instead of batching the whole export"
+    )
     
     args = parser.parse_args()
     
-    # Handle --update flag
-    if args.update and not args.spreadsheet_id:
+    if args.sync and args.no_batch:
+        parser.error("--sync needs batching; drop --no-batch")
+    
+    # Handle --update flag (a sync always targets the saved spreadsheet)
+    if (args.update or args.sync) and not args.spreadsheet_id:
         args.spreadsheet_id = load_spreadsheet_id(args.version)
         if args.spreadsheet_id:
             logger.info(f"Using saved spreadsheet ID for version {args.version}: {args.spreadsheet_id}")
@@ -149,6 +176,8 @@ def main():
     logger.info(f"Data types: {args.data_types}")
     logger.info(f"Public access: {make_public}")
     
+    rate_limiter = configure_default_limiter(quotas={'read': args.read_quota, 'write': args.write_quota})
+    
     try:
         # Create the main exporter (using ClassesExporter as base since they all inherit from BaseSheetsExporter)
         main_exporter = ClassesExporter(
@@ -160,12 +189,21 @@ def main():
         spreadsheet_id = main_exporter.create_or_update_spreadsheet(
             title=args.title, 
             spreadsheet_id=args.spreadsheet_id,
-            public=make_public
+            public=make_public,
+            keep_sheets=args.sync
         )
         
         action = "Updated" if args.spreadsheet_id else "Created"
         logger.info(f"{action} spreadsheet with ID: {spreadsheet_id}")
         
+        # All exporters queue their sheet operations on one batch, flushed at the end
+        batch = None
+        if not args.no_batch:
+            batch = SheetsBatch(main_exporter.service, spreadsheet_id,
+                                execute=main_exporter._execute_with_retry)
+            main_exporter.batch = batch
+            main_exporter.sync = args.sync
+        
         # Create summary sheet first
         main_exporter.create_summary_sheet()
         
@@ -180,6 +218,8 @@ def main():
         # Set the spreadsheet ID for all exporters
         for exporter in exporters.values():
             exporter.spreadsheet_id = spreadsheet_id
+            exporter.batch = batch
+            exporter.sync = args.sync
         
         # Export data based on selected types
         if "all" in args.data_types:
@@ -187,9 +227,14 @@ def main():
         else:
             export_selected_data(exporters, args.data_types, args.detailed)
         
+        if batch is not None:
+            logger.info("Sending batched sheet updates...")
+            batch.flush()
+        
         # Save spreadsheet ID for future use
         save_spreadsheet_id(spreadsheet_id, args.version)
         
+        rate_limiter.log_stats()
         logger.info("Export completed successfully!")
         logger.info(f"Spreadsheet URL: https://docs.google.com/spreadsheets/d/{spreadsheet_id}")
         print(f"\n✅ Export completed!")
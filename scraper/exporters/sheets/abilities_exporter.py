@@ -50,11 +50,7 @@ class AbilitiesExporter(BaseSheetsExporter):
             all_data.append(row)
         
         # Create and populate sheet
-        self.add_sheet(sheet_name)
-        self.clear_sheet(sheet_name)
-        self.write_data(sheet_name, all_data)
-        self.format_headers(sheet_name, len(headers))
-        self.auto_resize_columns(sheet_name)
+        self.write_sheet(sheet_name, all_data, len(headers))
         
         logger.info(f"Successfully exported {len(files)} abilities to {sheet_name}")
     
@@ -195,11 +191,7 @@ class AbilitiesExporter(BaseSheetsExporter):
                 row = self._extract_ability_row_for_type(ability_data, ability_type)
                 all_data.append(row)
             
-            self.add_sheet(sheet_name)
-            self.clear_sheet(sheet_name)
-            self.write_data(sheet_name, all_data)
-            self.format_headers(sheet_name, len(headers))
-            self.auto_resize_columns(sheet_name)
+            self.write_sheet(sheet_name, all_data, len(headers))
         
         logger.info(f"Successfully exported abilities by type to {len(abilities_by_type)} sheets")
     
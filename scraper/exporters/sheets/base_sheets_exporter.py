@@ -7,16 +7,20 @@ This provides common functionality for all data type exporters.
 
 import logging
 import os
-import time
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-import yaml
+
+from core.entity_index import EntityIndex
+from core.storage import RecordStore
 
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+from .batch import SheetsBatch
+from .rate_limit import ApiRateLimiter, get_default_limiter, throttled_request_builder
+
 
 logger = logging.getLogger(__name__)
 
@@ -24,18 +28,29 @@ logger = logging.getLogger(__name__)
 class BaseSheetsExporter:
     """Base class for exporting data to Google Sheets."""
     
-    def __init__(self, credentials_path: Optional[str] = None, version: str = "0.10.1"):
+    def __init__(self, credentials_path: Optional[str] = None, version: str = "0.10.1",
+                 rate_limiter: Optional[ApiRateLimiter] = None):
         """
         Initialize the exporter.
         
         Args:
             credentials_path: Path to Google service account credentials JSON
             version: Game version to export data from
+            rate_limiter: Limiter pacing every API request (default: the shared one)
         """
         self.version = version
+        self.rate_limiter = rate_limiter or get_default_limiter()
         self.credentials_path = credentials_path or self._find_credentials()
         self.service = None
         self.spreadsheet_id = None
+        # When set, sheet operations are queued here and sent by batch.flush()
+        self.batch: Optional[SheetsBatch] = None
+        # Update existing sheets in place with only the changed rows (needs a batch)
+        self.sync = False
+        # Sheet title -> sheet id, read once per spreadsheet
+        self._sheet_ids: Optional[Dict[str, int]] = None
+        self.record_store = RecordStore()
+        self._entity_index: Optional[EntityIndex] = None
         
         # Base paths
         self.project_root = Path(__file__).parent.parent.parent.parent
@@ -73,14 +88,17 @@ class BaseSheetsExporter:
                     'https://www.googleapis.com/auth/drive'
                 ]
             )
-            self.service = build('sheets', 'v4', credentials=credentials)
-            self.drive_service = build('drive', 'v3', credentials=credentials)
+            # Every request of both services is paced and retried by the rate limiter
+            request_builder = throttled_request_builder(self.rate_limiter)
+            self.service = build('sheets', 'v4', credentials=credentials, requestBuilder=request_builder)
+            self.drive_service = build('drive', 'v3', credentials=credentials, requestBuilder=request_builder)
             logger.info("Google Sheets and Drive services initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize Google services: {e}")
             raise
     
-    def create_or_update_spreadsheet(self, title: str, spreadsheet_id: str = None, public: bool = True) -> str:
+    def create_or_update_spreadsheet(self, title: str, spreadsheet_id: str = None, public: bool = True,
+                                     keep_sheets: bool = False) -> str:
         """
         Create a new Google Spreadsheet or update an existing one.
         
@@ -88,13 +106,14 @@ class BaseSheetsExporter:
             title: Title for the spreadsheet
             spreadsheet_id: Existing spreadsheet ID to update (if None, creates new)
             public: Whether to make the spreadsheet publicly viewable
+            keep_sheets: Keep the existing sheets (and their ids) for an incremental sync
             
         Returns:
             Spreadsheet ID
         """
         if spreadsheet_id:
             # Update existing spreadsheet
-            return self._update_existing_spreadsheet(spreadsheet_id, title, public)
+            return self._update_existing_spreadsheet(spreadsheet_id, title, public, keep_sheets)
         else:
             # Create new spreadsheet
             return self._create_new_spreadsheet(title, public)
@@ -129,7 +148,8 @@ class BaseSheetsExporter:
             logger.error(f"Failed to create spreadsheet: {e}")
             raise
     
-    def _update_existing_spreadsheet(self, spreadsheet_id: str, title: str, public: bool) -> str:
+    def _update_existing_spreadsheet(self, spreadsheet_id: str, title: str, public: bool,
+                                     keep_sheets: bool = False) -> str:
         """Update an existing spreadsheet."""
         try:
             self.spreadsheet_id = spreadsheet_id
@@ -152,8 +172,9 @@ class BaseSheetsExporter:
             logger.info(f"Updated spreadsheet: {title} (ID: {self.spreadsheet_id})")
             logger.info(f"URL: https://docs.google.com/spreadsheets/d/{self.spreadsheet_id}")
             
-            # Clear all existing sheets except summary
-            self._clear_all_sheets_except_summary()
+            # Clear all existing sheets except summary (a sync updates them in place)
+            if not keep_sheets:
+                self._clear_all_sheets_except_summary()
             
             # Make it publicly viewable if requested
             if public:
@@ -198,6 +219,7 @@ class BaseSheetsExporter:
                 ).execute()
                 
                 logger.info(f"Deleted {len(requests)} existing sheets")
+                self._sheet_ids = None
                 
         except HttpError as e:
             logger.warning(f"Failed to clear existing sheets: {e}")
@@ -233,6 +255,10 @@ class BaseSheetsExporter:
     
     def add_sheet(self, sheet_name: str):
         """Add a new sheet to the spreadsheet."""
+        if self.batch is not None:
+            self.batch.add_sheet(sheet_name)
+            return
+        
         try:
             request = {
                 'addSheet': {
@@ -248,6 +274,7 @@ class BaseSheetsExporter:
             ).execute()
             
             logger.info(f"Added sheet: {sheet_name}")
+            self._sheet_ids = None
             
         except HttpError as e:
             if "already exists" in str(e):
@@ -258,6 +285,10 @@ class BaseSheetsExporter:
     
     def clear_sheet(self, sheet_name: str):
         """Clear all data from a sheet."""
+        if self.batch is not None:
+            self.batch.clear(sheet_name)
+            return
+        
         try:
             self.service.spreadsheets().values().clear(
                 spreadsheetId=self.spreadsheet_id,
@@ -280,6 +311,10 @@ class BaseSheetsExporter:
         if not data:
             logger.warning(f"No data to write to {sheet_name}")
             return
+        
+        if self.batch is not None:
+            self.batch.write(sheet_name, data, start_cell)
+            return
             
         try:
             range_name = f"{sheet_name}!{start_cell}"
@@ -298,15 +333,16 @@ class BaseSheetsExporter:
             
             logger.info(f"Wrote {result.get('updatedRows', 0)} rows to {sheet_name}")
             
-            # Small delay to avoid rate limits
-            time.sleep(1)
-            
         except HttpError as e:
             logger.error(f"Failed to write data: {e}")
             raise
     
     def format_headers(self, sheet_name: str, num_columns: int):
         """Format the header row with bold text and freeze it."""
+        if self.batch is not None:
+            self.batch.format_headers(sheet_name, num_columns)
+            return
+        
         try:
             requests = [
                 # Make headers bold
@@ -352,32 +388,41 @@ class BaseSheetsExporter:
             
             logger.info(f"Formatted headers in {sheet_name}")
             
-            # Small delay to avoid rate limits
-            time.sleep(1)
-            
         except HttpError as e:
             logger.error(f"Failed to format headers: {e}")
             raise
     
     def _get_sheet_id(self, sheet_name: str) -> int:
         """Get the sheet ID for a given sheet name."""
-        try:
-            spreadsheet = self.service.spreadsheets().get(
-                spreadsheetId=self.spreadsheet_id
-            ).execute()
-            
-            for sheet in spreadsheet['sheets']:
-                if sheet['properties']['title'] == sheet_name:
-                    return sheet['properties']['sheetId']
+        if self.batch is not None:
+            return self.batch.sheet_id(sheet_name)
+        
+        # Spreadsheet metadata is read once and re-read only for unknown sheets
+        if self._sheet_ids is None or sheet_name not in self._sheet_ids:
+            try:
+                spreadsheet = self.service.spreadsheets().get(
+                    spreadsheetId=self.spreadsheet_id,
+                    fields='sheets.properties(sheetId,title)'
+                ).execute()
+            except HttpError as e:
+                logger.error(f"Failed to get sheet ID: {e}")
+                raise
             
+            self._sheet_ids = {
+                sheet['properties']['title']: sheet['properties']['sheetId']
+                for sheet in spreadsheet['sheets']
+            }
+        
+        if sheet_name not in self._sheet_ids:
             raise ValueError(f"Sheet {sheet_name} not found")
-            
-        except HttpError as e:
-            logger.error(f"Failed to get sheet ID: {e}")
-            raise
+        return self._sheet_ids[sheet_name]
     
     def auto_resize_columns(self, sheet_name: str):
         """Auto-resize all columns to fit content."""
+        if self.batch is not None:
+            self.batch.auto_resize(sheet_name)
+            return
+        
         try:
             sheet_id = self._get_sheet_id(sheet_name)
             request = {
@@ -402,15 +447,47 @@ class BaseSheetsExporter:
             logger.error(f"Failed to auto-resize columns: {e}")
             # Don't raise, this is not critical
     
+    def write_sheet(self, sheet_name: str, data: List[List[Any]], num_columns: int):
+        """
+        Create or refresh a sheet with a header row and data rows.
+        
+        In sync mode only the rows that differ from the sheet's current values
+        are written, and an unchanged sheet is left alone entirely.
+        
+        Args:
+            sheet_name: Name of the sheet
+            data: Header row followed by data rows
+            num_columns: Number of header columns to format
+        """
+        if self.sync and self.batch is not None:
+            changed = self.batch.sync(sheet_name, data)
+            if not changed:
+                logger.info(f"{sheet_name} is up to date")
+                return
+            logger.info(f"Queued {changed} changed rows for {sheet_name}")
+        else:
+            self.add_sheet(sheet_name)
+            self.clear_sheet(sheet_name)
+            self.write_data(sheet_name, data)
+        
+        self.format_headers(sheet_name, num_columns)
+        self.auto_resize_columns(sheet_name)
+    
     def load_yaml_file(self, file_path: Path) -> Dict[str, Any]:
         """Load and parse a YAML file."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
+            return self.record_store.load(file_path)
         except Exception as e:
             logger.error(f"Failed to load {file_path}: {e}")
             return {}
     
+    @property
+    def entity_index(self) -> EntityIndex:
+        """Index of every entity in the exported version, built on first use."""
+        if self._entity_index is None:
+            self._entity_index = EntityIndex.build(self.parsed_data_dir, store=self.record_store)
+        return self._entity_index
+    
     def get_data_files(self, data_type: str) -> List[Path]:
         """
         Get all YAML files for a specific data type.
@@ -468,42 +545,32 @@ class BaseSheetsExporter:
                 summary_data.append([data_type.title(), len(files), ""])
         
         # Create summary sheet
-        self.add_sheet("Summary")
-        self.clear_sheet("Summary")
-        self.write_data("Summary", summary_data)
-        self.format_headers("Summary", 3)
-        self.auto_resize_columns("Summary")
+        self.write_sheet("Summary", summary_data, 3)
         
         # Clean up any default Sheet1 that might still exist
         self._cleanup_default_sheet()
     
-    def _execute_with_retry(self, operation, max_retries=3, base_delay=60):
+    def _execute_with_retry(self, operation):
         """
-        Execute an operation with exponential backoff retry for rate limits.
+        Execute an API operation.
+        
+        Requests built by this exporter's services are already paced and
+        retried with backoff by the rate limiter; this stays as the single
+        entry point callers (batches, demo scripts) wrap their calls in.
         
         Args:
             operation: Function to execute
-            max_retries: Maximum number of retries
-            base_delay: Base delay in seconds for rate limit errors
         """
-        for attempt in range(max_retries + 1):
-            try:
-                return operation()
-            except HttpError as e:
-                if e.resp.status == 429:  # Rate limit exceeded
-                    if attempt < max_retries:
-                        delay = base_delay * (2 ** attempt)  # Exponential backoff
-                        logger.warning(f"Rate limit exceeded. Waiting {delay} seconds before retry {attempt + 1}/{max_retries}")
-                        time.sleep(delay)
-                        continue
-                    else:
-                        logger.error(f"Rate limit exceeded after {max_retries} retries")
-                        raise
-                else:
-                    raise
+        return operation()
     
     def _cleanup_default_sheet(self):
         """Clean up the default 'Sheet1' if it still exists and we have other sheets."""
+        if self.batch is not None:
+            # Queued deletes run after every queued addition
+            if 'Sheet1' in self.batch.sheet_ids and len(self.batch.sheet_ids) > 1:
+                self.batch.delete_sheet('Sheet1')
+            return
+        
         try:
             spreadsheet = self.service.spreadsheets().get(
                 spreadsheetId=self.spreadsheet_id
@@ -535,6 +602,7 @@ class BaseSheetsExporter:
                 ).execute()
                 
                 logger.info("Removed default Sheet1")
+                self._sheet_ids = None
                 
         except HttpError as e:
             logger.warning(f"Failed to cleanup default sheet: {e}")
@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+Request batching for Google Sheets exports.
+
+Exporters queue sheet additions, clears, value writes and formatting on a
+shared SheetsBatch instead of calling the API per tab. flush() then sends the
+whole export as:
+
+1. one spreadsheets.batchUpdate adding/deleting sheets and clearing values
+2. values.batchUpdate calls for all cell data (split only when the payload
+   would get too large)
+3. one spreadsheets.batchUpdate with header formatting and column resizing
+
+Sheet ids come from a single metadata read; new sheets get their id assigned
+client-side, so no request has to wait for another to learn an id.
+
+sync() is the incremental alternative to clear + write: it reads every sheet's
+current values once (one values.batchGet), diffs them against the new rows by
+the ID column, and queues only row deletions, row insertions and the cell
+ranges that changed. Sheets keep their ids, and unchanged data costs no writes.
+"""
+
+import json
+import logging
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Serialized size of the value ranges sent in one values.batchUpdate call
+MAX_PAYLOAD_BYTES = 8 * 1024 * 1024
+
+
+def a1_range(sheet_name: str, cell: str = "A1") -> str:
+    """A1 notation for a cell of a sheet, quoting the sheet name."""
+    return "'{}'!{}".format(sheet_name.replace("'", "''"), cell)
+
+
+def column_letter(index: int) -> str:
+    """Column letter for a zero-based column index (0 -> A, 26 -> AA)."""
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+
+def _cell_text(value: Any) -> str:
+    """Compare cells as text: the API returns 12 for a written 12 and nothing for ''."""
+    return "" if value is None else str(value)
+
+
+def _row_spans(flags: List[bool]) -> List[Tuple[int, int]]:
+    """(start, end) index ranges of consecutive True flags."""
+    spans, start = [], None
+    for index, flag in enumerate(flags + [False]):
+        if flag and start is None:
+            start = index
+        elif not flag and start is not None:
+            spans.append((start, index))
+            start = None
+    return spans
+
+
+def _split_cell(cell: str) -> Tuple[str, int]:
+    """Split 'B12' into ('B', 12)."""
+    match = re.fullmatch(r"([A-Za-z]+)(\d+)", cell)
+    if not match:
+        raise ValueError(f"Unsupported start cell: {cell}")
+    return match.group(1).upper(), int(match.group(2))
+
+
+class SheetsBatch:
+    """Collects Sheets operations for one spreadsheet and sends them in as few calls as possible."""
+    
+    def __init__(self, service, spreadsheet_id: str, execute: Optional[Callable[[Callable], Any]] = None):
+        """
+        Args:
+            service: Sheets API service (googleapiclient)
+            spreadsheet_id: Spreadsheet all operations apply to
+            execute: Wrapper running a zero-argument API call (e.g. with retries)
+        """
+        self.service = service
+        self.spreadsheet_id = spreadsheet_id
+        self.execute = execute or (lambda operation: operation())
+        self._sheet_ids: Optional[Dict[str, int]] = None
+        # Titles present in the spreadsheet when metadata was read (queued sheets excluded)
+        self._existing_titles: List[str] = []
+        # Sheet title -> current values, read once for sync()
+        self._current_values: Optional[Dict[str, List[List[Any]]]] = None
+        # Highest sheet id seen, so ids of deleted sheets are never reused in one batch
+        self._max_sheet_id = 0
+        
+        self.structure_requests: List[Dict[str, Any]] = []
+        self.delete_requests: List[Dict[str, Any]] = []
+        self.value_ranges: List[Dict[str, Any]] = []
+        self.format_requests: List[Dict[str, Any]] = []
+    
+    @property
+    def sheet_ids(self) -> Dict[str, int]:
+        """Sheet title -> sheet id, including sheets queued for creation."""
+        if self._sheet_ids is None:
+            spreadsheet = self.execute(
+                lambda: self.service.spreadsheets().get(
+                    spreadsheetId=self.spreadsheet_id,
+                    fields='sheets.properties(sheetId,title)'
+                ).execute()
+            )
+            self._sheet_ids = {
+                sheet['properties']['title']: sheet['properties']['sheetId']
+                for sheet in spreadsheet.get('sheets', [])
+            }
+            self._existing_titles = list(self._sheet_ids)
+            self._max_sheet_id = max(self._sheet_ids.values(), default=0)
+        return self._sheet_ids
+    
+    def sheet_id(self, sheet_name: str) -> int:
+        """Return the id of an existing or queued sheet."""
+        try:
+            return self.sheet_ids[sheet_name]
+        except KeyError:
+            raise ValueError(f"Sheet {sheet_name} not found") from None
+    
+    def add_sheet(self, sheet_name: str) -> int:
+        """Queue a new sheet (no-op if it already exists) and return its id."""
+        if sheet_name in self.sheet_ids:
+            return self.sheet_ids[sheet_name]
+        
+        self._max_sheet_id += 1
+        sheet_id = self._max_sheet_id
+        self.sheet_ids[sheet_name] = sheet_id
+        self.structure_requests.append({
+            'addSheet': {'properties': {'sheetId': sheet_id, 'title': sheet_name}}
+        })
+        return sheet_id
+    
+    def delete_sheet(self, sheet_name: str):
+        """Queue deleting a sheet, after all queued additions."""
+        sheet_id = self.sheet_ids.pop(sheet_name, None)
+        if sheet_id is not None:
+            self.delete_requests.append({'deleteSheet': {'sheetId': sheet_id}})
+    
+    def clear(self, sheet_name: str):
+        """Queue clearing every value of a sheet (formatting is kept)."""
+        self.structure_requests.append({
+            'updateCells': {
+                'range': {'sheetId': self.sheet_id(sheet_name)},
+                'fields': 'userEnteredValue'
+            }
+        })
+    
+    def write(self, sheet_name: str, data: List[List[Any]], start_cell: str = "A1"):
+        """Queue writing a 2D array of values starting at a cell."""
+        if data:
+            self.value_ranges.append({'range': a1_range(sheet_name, start_cell), 'values': data})
+    
+    def format_headers(self, sheet_name: str, num_columns: int):
+        """Queue making the first row bold and frozen."""
+        sheet_id = self.sheet_id(sheet_name)
+        self.format_requests.extend([
+            {
+                'repeatCell': {
+                    'range': {
+                        'sheetId': sheet_id,
+                        'startRowIndex': 0,
+                        'endRowIndex': 1,
+                        'startColumnIndex': 0,
+                        'endColumnIndex': num_columns
+                    },
+                    'cell': {'userEnteredFormat': {'textFormat': {'bold': True}}},
+                    'fields': 'userEnteredFormat.textFormat.bold'
+                }
+            },
+            {
+                'updateSheetProperties': {
+                    'properties': {'sheetId': sheet_id, 'gridProperties': {'frozenRowCount': 1}},
+                    'fields': 'gridProperties.frozenRowCount'
+                }
+            }
+        ])
+    
+    def auto_resize(self, sheet_name: str, num_columns: int = 50):
+        """Queue fitting column widths to their content."""
+        self.format_requests.append({
+            'autoResizeDimensions': {
+                'dimensions': {
+                    'sheetId': self.sheet_id(sheet_name),
+                    'dimension': 'COLUMNS',
+                    'startIndex': 0,
+                    'endIndex': num_columns
+                }
+            }
+        })
+    
+    def current_values(self, sheet_name: str) -> List[List[Any]]:
+        """
+        Values of an existing sheet; every sheet is read in one values.batchGet on first use.
+        
+        Only sheets that existed when the metadata was read are requested: a
+        range naming a sheet that is merely queued would fail the whole call.
+        Queued sheets read as empty.
+        """
+        if self._current_values is None:
+            self.sheet_ids  # make sure the metadata has been read
+            titles = list(self._existing_titles)
+            result = self.execute(
+                lambda: self.service.spreadsheets().values().batchGet(
+                    spreadsheetId=self.spreadsheet_id,
+                    ranges=["'{}'".format(title.replace("'", "''")) for title in titles],
+                    valueRenderOption='UNFORMATTED_VALUE'
+                ).execute()
+            ) if titles else {}
+            value_ranges = result.get('valueRanges', [])
+            self._current_values = {
+                title: value_range.get('values', []) for title, value_range in zip(titles, value_ranges)
+            }
+        return self._current_values.get(sheet_name, [])
+    
+    def sync(self, sheet_name: str, data: List[List[Any]], key_column: str = "ID") -> int:
+        """
+        Queue the changes that turn a sheet's current values into data.
+        
+        Rows are matched on the key column when the header row is unchanged and
+        keys are unique and in the same relative order; otherwise rows are
+        matched by position. Removed rows are deleted, new rows inserted where
+        they belong, and changed rows rewritten from their first to last
+        changed cell.
+        
+        Args:
+            sheet_name: Sheet to update (created if missing)
+            data: Header row followed by data rows
+            key_column: Header of the column identifying a row
+        
+        Returns:
+            Number of rows written, inserted or deleted (0 if the sheet is unchanged)
+        """
+        if sheet_name not in self.sheet_ids:
+            self.add_sheet(sheet_name)
+            self.write(sheet_name, data)
+            return len(data)
+        
+        current = self.current_values(sheet_name)
+        width = max((len(row) for row in data + current), default=0)
+        new = [[_cell_text(value) for value in row] + [""] * (width - len(row)) for row in data]
+        old = [[_cell_text(value) for value in row] + [""] * (width - len(row)) for row in current]
+        new_header, new_rows = (new[0], new[1:]) if new else ([""] * width, [])
+        # Values are written as given (numbers stay numbers); the text forms are only compared
+        raw_rows = [["" if value is None else value for value in row] + [""] * (width - len(row))
+                    for row in data[1:]]
+        old_header, old_rows = (old[0], old[1:]) if old else ([""] * width, [])
+        
+        old_keys, new_keys = self._row_keys(old_header, old_rows, new_header, new_rows, key_column)
+        new_key_set, old_key_set = set(new_keys), set(old_keys)
+        old_by_key = dict(zip(old_keys, old_rows))
+        sheet_id = self.sheet_id(sheet_name)
+        changed = 0
+        
+        # Deletions bottom-up so earlier row indexes stay valid (row 0 is the header)
+        deleted = [key not in new_key_set for key in old_keys]
+        for start, end in reversed(_row_spans(deleted)):
+            self.structure_requests.append({
+                'deleteDimension': {
+                    'range': {'sheetId': sheet_id, 'dimension': 'ROWS',
+                              'startIndex': start + 1, 'endIndex': end + 1}
+                }
+            })
+            changed += end - start
+        
+        # Insertions top-down at their final position
+        inserted = [key not in old_key_set for key in new_keys]
+        for start, end in _row_spans(inserted):
+            self.structure_requests.append({
+                'insertDimension': {
+                    'range': {'sheetId': sheet_id, 'dimension': 'ROWS',
+                              'startIndex': start + 1, 'endIndex': end + 1},
+                    'inheritFromBefore': start > 0
+                }
+            })
+        
+        # Values: inserted rows whole, kept rows from first to last changed cell
+        if new_header != old_header:
+            header = list(data[0]) + [""] * (width - len(data[0])) if data else new_header
+            self.write(sheet_name, [header])
+            changed += 1
+        for start, end in _row_spans(inserted):
+            self.write(sheet_name, raw_rows[start:end], f"A{start + 2}")
+            changed += end - start
+        for index, (key, row) in enumerate(zip(new_keys, new_rows)):
+            if key not in old_key_set or old_by_key[key] == row:
+                continue
+            columns = [column for column in range(width) if old_by_key[key][column] != row[column]]
+            first, last = columns[0], columns[-1]
+            self.write(sheet_name, [raw_rows[index][first:last + 1]], f"{column_letter(first)}{index + 2}")
+            changed += 1
+        
+        return changed
+    
+    @staticmethod
+    def _row_keys(old_header: List[str], old_rows: List[List[str]], new_header: List[str],
+                  new_rows: List[List[str]], key_column: str) -> Tuple[List[Any], List[Any]]:
+        """Keys matching old rows to new rows: the key column when usable, row positions otherwise."""
+        positional = list(range(len(old_rows))), list(range(len(new_rows)))
+        if old_header != new_header or key_column not in new_header:
+            return positional
+        
+        column = new_header.index(key_column)
+        old_keys = [row[column] for row in old_rows]
+        new_keys = [row[column] for row in new_rows]
+        if "" in old_keys or "" in new_keys:
+            return positional
+        if len(set(old_keys)) != len(old_keys) or len(set(new_keys)) != len(new_keys):
+            return positional
+        
+        # Kept rows must keep their relative order, since rows are never moved
+        new_set, old_set = set(new_keys), set(old_keys)
+        if [key for key in old_keys if key in new_set] != [key for key in new_keys if key in old_set]:
+            return positional
+        return old_keys, new_keys
+    
+    def _value_chunks(self) -> List[List[Dict[str, Any]]]:
+        """Group value ranges into payloads under MAX_PAYLOAD_BYTES, splitting large ranges by rows."""
+        chunks, current, current_size = [], [], 0
+        
+        def add(value_range: Dict[str, Any], size: int):
+            nonlocal current, current_size
+            if current and current_size + size > MAX_PAYLOAD_BYTES:
+                chunks.append(current)
+                current, current_size = [], 0
+            current.append(value_range)
+            current_size += size
+        
+        for value_range in self.value_ranges:
+            row_sizes = [len(json.dumps(row, default=str)) for row in value_range['values']]
+            if sum(row_sizes) <= MAX_PAYLOAD_BYTES:
+                add(value_range, sum(row_sizes))
+                continue
+            
+            # Split an oversized range into row blocks
+            sheet_name, cell = value_range['range'].rsplit('!', 1)
+            column, first_row = _split_cell(cell)
+            
+            def add_rows(start: int, end: int, size: int):
+                add({'range': f"{sheet_name}!{column}{first_row + start}",
+                     'values': value_range['values'][start:end]}, size)
+            
+            start, size = 0, 0
+            for index, row_size in enumerate(row_sizes):
+                if index > start and size + row_size > MAX_PAYLOAD_BYTES:
+                    add_rows(start, index, size)
+                    start, size = index, 0
+                size += row_size
+            add_rows(start, len(row_sizes), size)
+        
+        if current:
+            chunks.append(current)
+        return chunks
+    
+    def _batch_update(self, requests: List[Dict[str, Any]]):
+        self.execute(
+            lambda: self.service.spreadsheets().batchUpdate(
+                spreadsheetId=self.spreadsheet_id,
+                body={'requests': requests}
+            ).execute()
+        )
+    
+    def flush(self) -> Dict[str, int]:
+        """
+        Send every queued operation.
+        
+        Returns:
+            Counts of API calls, requests and value ranges sent
+        """
+        stats = {'api_calls': 0, 'requests': 0, 'value_ranges': len(self.value_ranges)}
+        
+        structure = self.structure_requests + self.delete_requests
+        if structure:
+            self._batch_update(structure)
+            stats['api_calls'] += 1
+            stats['requests'] += len(structure)
+        
+        updated_cells = 0
+        for chunk in self._value_chunks():
+            result = self.execute(
+                lambda: self.service.spreadsheets().values().batchUpdate(
+                    spreadsheetId=self.spreadsheet_id,
+                    body={'valueInputOption': 'RAW', 'data': chunk}
+                ).execute()
+            )
+            updated_cells += result.get('totalUpdatedCells', 0)
+            stats['api_calls'] += 1
+        
+        if self.format_requests:
+            self._batch_update(self.format_requests)
+            stats['api_calls'] += 1
+            stats['requests'] += len(self.format_requests)
+        
+        logger.info(f"Flushed Sheets batch: {stats['api_calls']} API calls, {stats['requests']} requests, "
+                    f"{stats['value_ranges']} value ranges ({updated_cells} cells)")
+        
+        self.structure_requests, self.delete_requests = [], []
+        self.value_ranges, self.format_requests = [], []
+        return stats
@@ -52,11 +52,7 @@ class ClassesExporter(BaseSheetsExporter):
             all_data.append(row)
         
         # Create and populate sheet
-        self.add_sheet(sheet_name)
-        self.clear_sheet(sheet_name)
-        self.write_data(sheet_name, all_data)
-        self.format_headers(sheet_name, len(headers))
-        self.auto_resize_columns(sheet_name)
+        self.write_sheet(sheet_name, all_data, len(headers))
         
         logger.info(f"Successfully exported {len(files)} classes to {sheet_name}")
     
@@ -147,7 +143,9 @@ class ClassesExporter(BaseSheetsExporter):
                     
                     if benefit_type == 'ability':
                         ability_id = benefit.get('ability_id', '')
-                        ability_name = ability_refs.get(ability_id, ability_id)
+                        ability_name = (ability_refs.get(ability_id)
+                                        or self.entity_index.name_of('abilities', ability_id)
+                                        or ability_id)
                         
                         row = [
                             class_id, class_name, str(level), benefit_type,
@@ -164,11 +162,7 @@ class ClassesExporter(BaseSheetsExporter):
                         ]
                         all_data.append(row)
         
-        self.add_sheet(sheet_name)
-        self.clear_sheet(sheet_name)
-        self.write_data(sheet_name, all_data)
-        self.format_headers(sheet_name, len(headers))
-        self.auto_resize_columns(sheet_name)
+        self.write_sheet(sheet_name, all_data, len(headers))
         
         logger.info(f"Successfully exported class abilities breakdown to {sheet_name}")
     
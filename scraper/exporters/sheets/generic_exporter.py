@@ -48,11 +48,7 @@ class GenericExporter(BaseSheetsExporter):
                 row = self._extract_race_row(data)
                 all_data.append(row)
         
-        self.add_sheet(sheet_name)
-        self.clear_sheet(sheet_name)
-        self.write_data(sheet_name, all_data)
-        self.format_headers(sheet_name, len(headers))
-        self.auto_resize_columns(sheet_name)
+        self.write_sheet(sheet_name, all_data, len(headers))
         
         logger.info(f"Successfully exported races to {sheet_name}")
     
@@ -209,11 +205,7 @@ class GenericExporter(BaseSheetsExporter):
             row = extract_func(data)
             all_data.append(row)
         
-        self.add_sheet(sheet_name)
-        self.clear_sheet(sheet_name)
-        self.write_data(sheet_name, all_data)
-        self.format_headers(sheet_name, len(headers))
-        self.auto_resize_columns(sheet_name)
+        self.write_sheet(sheet_name, all_data, len(headers))
         
         logger.info(f"Successfully exported {len(files)} {data_type} to {sheet_name}")
     
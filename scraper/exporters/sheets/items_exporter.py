@@ -49,11 +49,7 @@ class ItemsExporter(BaseSheetsExporter):
             all_data.append(row)
         
         # Create and populate sheet
-        self.add_sheet(sheet_name)
-        self.clear_sheet(sheet_name)
-        self.write_data(sheet_name, all_data)
-        self.format_headers(sheet_name, len(headers))
-        self.auto_resize_columns(sheet_name)
+        self.write_sheet(sheet_name, all_data, len(headers))
         
         logger.info(f"Successfully exported {len(files)} items to {sheet_name}")
     
@@ -118,11 +114,7 @@ class ItemsExporter(BaseSheetsExporter):
                 row = self._extract_item_row_for_type(item_data)
                 all_data.append(row)
             
-            self.add_sheet(sheet_name)
-            self.clear_sheet(sheet_name)
-            self.write_data(sheet_name, all_data)
-            self.format_headers(sheet_name, len(headers))
-            self.auto_resize_columns(sheet_name)
+            self.write_sheet(sheet_name, all_data, len(headers))
         
         logger.info(f"Successfully exported items by type to {len(items_by_type)} sheets")
     
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Client-side rate limiting for the Google Sheets and Drive APIs.
+
+Every request built by the exporters' API services goes through one shared
+ApiRateLimiter (see throttled_request_builder), which:
+
+- paces requests with a token bucket per quota group (Sheets reads, Sheets
+  writes, Drive), sized so a one-minute window stays under the per-minute quota
+- retries 429s, rate-limit 403s and 5xx errors with jittered exponential
+  backoff starting below a second, honoring Retry-After when the API sends it
+- halves a group's rate after a throttle and recovers it gradually on success
+- counts requests, throttles, retries and time spent waiting
+"""
+
+import logging
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Requests per minute per quota group (Sheets defaults per user; Drive is far higher)
+DEFAULT_QUOTAS = {'read': 60, 'write': 60, 'drive': 600}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+RATE_LIMIT_REASONS = ('rateLimitExceeded', 'userRateLimitExceeded', 'RATE_LIMIT_EXCEEDED')
+
+
+class TokenBucket:
+    """Token bucket whose refill rate can be lowered after throttling and recovers over time."""
+    
+    def __init__(self, per_minute: int, burst: Optional[int] = None):
+        """
+        Args:
+            per_minute: Quota in requests per minute
+            burst: Requests allowed back to back (default: a sixth of the quota)
+        """
+        self.capacity = max(1, burst if burst is not None else per_minute // 6)
+        # Burst plus refill over any 60 seconds stays within the quota
+        self.base_rate = max(per_minute - self.capacity, 1) / 60.0
+        self.rate = self.base_rate
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def acquire(self) -> float:
+        """
+        Take one token, sleeping until it is available.
+        
+        Returns:
+            Seconds waited
+        """
+        with self.lock:
+            self._refill(time.monotonic())
+            # Reserve the token now; concurrent callers queue up behind it
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+    
+    def throttled(self):
+        """Empty the bucket and halve the rate after the API pushed back."""
+        with self.lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.tokens, 0.0)
+            self.rate = max(self.base_rate / 8, self.rate / 2)
+    
+    def succeeded(self):
+        """Recover the rate a little after each successful request."""
+        if self.rate < self.base_rate:
+            with self.lock:
+                self._refill(time.monotonic())
+                self.rate = min(self.base_rate, self.rate * 1.1)
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Seconds from a Retry-After header, if the error carries one."""
+    resp = getattr(error, 'resp', None)
+    value = resp.get('retry-after') if hasattr(resp, 'get') else None
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_retryable(error: Exception) -> bool:
+    status = getattr(getattr(error, 'resp', None), 'status', None)
+    if status in RETRY_STATUSES:
+        return True
+    return status == 403 and any(reason in str(error) for reason in RATE_LIMIT_REASONS)
+
+
+class ApiRateLimiter:
+    """Paces and retries API requests per quota group, with counters."""
+    
+    def __init__(self, quotas: Optional[Dict[str, int]] = None, max_retries: int = 6,
+                 base_delay: float = 0.5, max_delay: float = 32.0):
+        """
+        Args:
+            quotas: Requests per minute per group ('read', 'write', 'drive')
+            max_retries: Retries per request for throttling and server errors
+            base_delay: First backoff delay in seconds (doubled per retry)
+            max_delay: Longest backoff delay in seconds
+        """
+        quotas = {**DEFAULT_QUOTAS, **(quotas or {})}
+        self.buckets = {group: TokenBucket(per_minute) for group, per_minute in quotas.items()}
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.counters = {
+            group: {'requests': 0, 'throttled': 0, 'retries': 0, 'failures': 0,
+                    'wait_seconds': 0.0, 'backoff_seconds': 0.0}
+            for group in self.buckets
+        }
+        self._counter_lock = threading.Lock()
+    
+    def _count(self, group: str, name: str, amount: float = 1):
+        with self._counter_lock:
+            self.counters[group][name] += amount
+    
+    def backoff_delay(self, attempt: int, error: Optional[Exception] = None) -> float:
+        """Retry-After if given, else jittered exponential backoff (half fixed, half random)."""
+        retry_after = _retry_after(error) if error is not None else None
+        if retry_after is not None:
+            return min(retry_after, self.max_delay * 4)
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return delay / 2 + random.uniform(0, delay / 2)
+    
+    def call(self, group: str, operation: Callable[[], Any]) -> Any:
+        """
+        Run one API request under the group's rate limit, retrying throttles.
+        
+        Args:
+            group: Quota group ('read', 'write' or 'drive')
+            operation: Zero-argument function sending the request
+        """
+        bucket = self.buckets[group]
+        for attempt in range(self.max_retries + 1):
+            self._count(group, 'wait_seconds', bucket.acquire())
+            self._count(group, 'requests')
+            try:
+                result = operation()
+            except Exception as e:
+                if not _is_retryable(e):
+                    raise
+                status = getattr(e.resp, 'status', None)
+                if status == 429 or status == 403:
+                    self._count(group, 'throttled')
+                    bucket.throttled()
+                if attempt >= self.max_retries:
+                    self._count(group, 'failures')
+                    logger.error(f"Google API {group} request failed after {self.max_retries} retries: {e}")
+                    raise
+                
+                delay = self.backoff_delay(attempt, e)
+                logger.warning(f"Google API {group} request got HTTP {status}, "
+                               f"retrying in {delay:.1f}s ({attempt + 1}/{self.max_retries})")
+                self._count(group, 'retries')
+                self._count(group, 'backoff_seconds', delay)
+                time.sleep(delay)
+                continue
+            
+            bucket.succeeded()
+            return result
+    
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Counters per quota group."""
+        with self._counter_lock:
+            return {group: dict(counters) for group, counters in self.counters.items()}
+    
+    def log_stats(self):
+        """Log the counters of every group that sent requests."""
+        for group, counters in self.stats().items():
+            if counters['requests']:
+                logger.info(f"Google API {group}: {counters['requests']} requests, "
+                            f"{counters['throttled']} throttled, {counters['retries']} retries, "
+                            f"{counters['wait_seconds']:.1f}s paced, {counters['backoff_seconds']:.1f}s backing off")
+
+
+_default_limiter: Optional[ApiRateLimiter] = None
+_default_lock = threading.Lock()
+
+
+def get_default_limiter() -> ApiRateLimiter:
+    """The process-wide limiter shared by all exporters (quotas are per project and user)."""
+    global _default_limiter
+    with _default_lock:
+        if _default_limiter is None:
+            _default_limiter = ApiRateLimiter()
+        return _default_limiter
+
+
+def configure_default_limiter(**kwargs) -> ApiRateLimiter:
+    """Replace the shared limiter, e.g. configure_default_limiter(quotas={'write': 300})."""
+    global _default_limiter
+    with _default_lock:
+        _default_limiter = ApiRateLimiter(**kwargs)
+        return _default_limiter
+
+
+def throttled_request_builder(limiter: ApiRateLimiter):
+    """
+    Request class for googleapiclient.discovery.build(requestBuilder=...).
+    
+    Every request the service builds then runs through the limiter: GET
+    requests count as reads, everything else as writes, and Drive requests
+    against the Drive quota.
+    """
+    from googleapiclient.http import HttpRequest
+    
+    class ThrottledHttpRequest(HttpRequest):
+        def execute(self, http=None, num_retries=0):
+            if 'googleapis.com/drive' in self.uri:
+                group = 'drive'
+            else:
+                group = 'read' if self.method == 'GET' else 'write'
+            return limiter.call(group, lambda: super(ThrottledHttpRequest, self).execute(
+                http=http, num_retries=num_retries))
+    
+    return ThrottledHttpRequest
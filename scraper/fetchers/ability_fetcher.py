@@ -12,6 +12,7 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from bs4 import BeautifulSoup
 
 from core.fetcher import BaseFetcher
+from core.api import add_api_arguments
 
 logger = logging.getLogger(__name__)
 
@@ -136,7 +137,7 @@ class AbilityFetcher(BaseFetcher):
             )
             logger.debug("Abilities tab content loaded")
         except TimeoutException:
-            logger.warning("Timeout waiting for expansion panels, proceeding anyway")
+            self.mark_page_incomplete("timeout waiting for expansion panels, proceeding anyway")
     
     def _switch_to_tab(self, tab_index: int, tab_name: str):
         """Switch to a specific tab in the mat-tab-group.
@@ -160,19 +161,12 @@ class AbilityFetcher(BaseFetcher):
             # Click the tab
             self.driver.execute_script("arguments[0].click();", tab_header)
             
-            # Wait for tab content to load
-            time.sleep(3)
-            
-            # Wait for expansion panels to appear in this tab
-            try:
-                WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "mat-expansion-panel"))
-                )
+            # Wait for the tab's expansion panels to render
+            if self.wait_until_ready(selectors=["mat-expansion-panel"], timeout=10):
                 logger.debug(f"Tab {tab_name} content loaded with expansion panels")
-                return True
-            except TimeoutException:
+            else:
                 logger.warning(f"No expansion panels found in {tab_name} tab after switching")
-                return True  # Proceed anyway - tab might be empty
+            return True  # Proceed anyway - tab might be empty
             
         except Exception as e:
             logger.error(f"Error switching to tab {tab_name}: {e}")
@@ -180,54 +174,8 @@ class AbilityFetcher(BaseFetcher):
     
     def _expand_all_abilities(self):
         """Expand all ability panels in the current tab."""
-        try:
-            # Wait a moment for content to fully load
-            time.sleep(1)
-            
-            panels = self.driver.find_elements(By.CSS_SELECTOR, "mat-expansion-panel-header")
-            logger.info(f"Found {len(panels)} ability panels to expand")
-            
-            if not panels:
-                logger.warning("No expansion panels found to expand")
-                return
-            
-            expanded_count = 0
-            batch_size = 20  # Process in batches to avoid overwhelming the page
-            
-            for i in range(0, len(panels), batch_size):
-                batch = panels[i:i + batch_size]
-                logger.debug(f"Processing batch {i//batch_size + 1}: panels {i+1}-{min(i+batch_size, len(panels))}")
-                
-                for j, panel in enumerate(batch):
-                    try:
-                        # Check if panel is already expanded
-                        panel_element = panel.find_element(By.XPATH, "..")
-                        classes = panel_element.get_attribute("class")
-                        
-                        if "mat-expanded" not in classes:
-                            # Click to expand without scrolling (faster)
-                            self.driver.execute_script("arguments[0].click();", panel)
-                            expanded_count += 1
-                            
-                            # Very small delay
-                            time.sleep(0.05)
-                        
-                    except Exception as e:
-                        logger.warning(f"Error expanding panel {i+j+1}: {e}")
-                        continue
-                
-                # Pause between batches
-                if i + batch_size < len(panels):
-                    logger.debug(f"Expanded {expanded_count} panels so far, pausing...")
-                    time.sleep(1)
-            
-            logger.info(f"Expanded {expanded_count} ability panels")
-            
-            # Wait for all panels to finish expanding
-            time.sleep(2)
-            
-        except Exception as e:
-            logger.error(f"Error expanding ability panels: {e}")
+        expanded_count = self._expand_all_panels(timeout=30)
+        logger.info(f"Expanded {expanded_count} ability panels")
     
     def fetch_ability_tab(self, tab_info: Dict[str, Any]) -> str:
         """Fetch content from a specific ability tab.
@@ -352,6 +300,7 @@ def main():
     parser.add_argument('--output-dir', default='scraped_html', help='Output directory base')
     parser.add_argument('--monster', action='store_true', help='Fetch monster abilities instead of regular abilities')
     parser.add_argument('--debug', action='store_true', help='Enable debug logging')
+    add_api_arguments(parser)
     args = parser.parse_args()
     
     # Configure logging
@@ -365,6 +314,10 @@ def main():
     fetcher = AbilityFetcher(version=args.version, output_base_dir=args.output_dir, monster=args.monster)
     
     try:
+        if args.capture_api:
+            fetcher.capture_api_payloads()
+            return
+        
         # Fetch all ability tabs
         results = fetcher.fetch_all()
         ability_type = "Monster ability" if args.monster else "Ability"
@@ -14,6 +14,7 @@ from selenium.common.exceptions import TimeoutException
 from bs4 import BeautifulSoup
 
 from core.fetcher import BaseFetcher
+from core.api import add_api_arguments
 
 logger = logging.getLogger(__name__)
 
@@ -100,55 +101,8 @@ class BreakthroughFetcher(BaseFetcher):
     
     def _expand_all_breakthroughs(self):
         """Expand all breakthrough panels on the page."""
-        try:
-            # Wait a moment for content to settle
-            time.sleep(1)
-            
-            # Find all expansion panel headers
-            panels = self.driver.find_elements(By.CSS_SELECTOR, "mat-expansion-panel-header")
-            logger.info(f"Found {len(panels)} breakthrough panels to expand")
-            
-            if not panels:
-                logger.warning("No expansion panels found to expand")
-                return
-            
-            expanded_count = 0
-            batch_size = 20  # Process in batches to avoid overwhelming the page
-            
-            for i in range(0, len(panels), batch_size):
-                batch = panels[i:i + batch_size]
-                logger.debug(f"Processing batch {i//batch_size + 1}: panels {i+1}-{min(i+batch_size, len(panels))}")
-                
-                for j, panel in enumerate(batch):
-                    try:
-                        # Check if panel is already expanded by looking at parent element
-                        panel_element = panel.find_element(By.XPATH, "..")
-                        classes = panel_element.get_attribute("class") or ""
-                        
-                        if "mat-expanded" not in classes:
-                            # Click to expand
-                            self.driver.execute_script("arguments[0].click();", panel)
-                            expanded_count += 1
-                            
-                            # Small delay between expansions
-                            time.sleep(0.05)
-                        
-                    except Exception as e:
-                        logger.warning(f"Error expanding panel {i+j+1}: {e}")
-                        continue
-                
-                # Pause between batches
-                if i + batch_size < len(panels):
-                    logger.debug(f"Expanded {expanded_count} panels so far, pausing...")
-                    time.sleep(1)
-            
-            logger.info(f"Expanded {expanded_count} breakthrough panels")
-            
-            # Wait for all panels to finish expanding
-            time.sleep(2)
-            
-        except Exception as e:
-            logger.error(f"Error expanding breakthrough panels: {e}")
+        expanded_count = self._expand_all_panels(timeout=30)
+        logger.info(f"Expanded {expanded_count} breakthrough panels")
     
     def fetch_breakthroughs_page(self) -> str:
         """Fetch the breakthroughs page with all panels expanded.
@@ -242,6 +196,7 @@ def main():
     parser.add_argument('--version', default='latest', help='Game version to fetch')
     parser.add_argument('--output-dir', default='scraped_html', help='Output directory base')
     parser.add_argument('--debug', action='store_true', help='Enable debug logging')
+    add_api_arguments(parser)
     args = parser.parse_args()
     
     # Configure logging
@@ -255,6 +210,10 @@ def main():
     fetcher = BreakthroughFetcher(version=args.version, output_base_dir=args.output_dir)
     
     try:
+        if args.capture_api:
+            fetcher.capture_api_payloads()
+            return
+        
         # Fetch breakthroughs
         results = fetcher.fetch_all()
         if results:
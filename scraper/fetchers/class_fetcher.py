@@ -11,6 +11,7 @@ from selenium.common.exceptions import TimeoutException
 from bs4 import BeautifulSoup
 
 from core.fetcher import BaseFetcher
+from core.api import add_api_arguments
 
 logger = logging.getLogger(__name__)
 
@@ -161,7 +162,7 @@ class ClassFetcher(BaseFetcher):
             )
             logger.debug("Class detail page loaded")
         except TimeoutException:
-            logger.warning("Timeout waiting for expansion panels, proceeding anyway")
+            self.mark_page_incomplete("timeout waiting for expansion panels, proceeding anyway")
 
 
 def main():
@@ -171,13 +172,22 @@ def main():
     parser = argparse.ArgumentParser(description='Fetch class data from Lyrian Chronicles')
     parser.add_argument('--version', default='latest', help='Game version to fetch')
     parser.add_argument('--limit', type=int, help='Limit number of classes to fetch')
+    parser.add_argument('--workers', type=int, default=1, help='Number of parallel browser sessions')
+    parser.add_argument('--max-age', type=float, default=BaseFetcher.DEFAULT_MAX_AGE / 3600,
+                        help='Refetch unchanged pages older than this many hours')
+    parser.add_argument('--force', action='store_true', help='Refetch every page, ignoring the fetch manifest')
+    add_api_arguments(parser)
     args = parser.parse_args()
     
     fetcher = ClassFetcher(version=args.version)
     
     try:
-        # Fetch all classes (or limited number)
-        fetcher.fetch_all(limit=args.limit)
+        if args.capture_api:
+            fetcher.capture_api_payloads()
+        else:
+            # Fetch all classes (or limited number)
+            fetcher.fetch_all(limit=args.limit, workers=args.workers,
+                              max_age=args.max_age * 3600, force=args.force)
         logger.info("Class fetching completed successfully")
     except Exception as e:
         logger.error(f"Error during fetching: {e}")
@@ -18,6 +18,7 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from bs4 import BeautifulSoup
 
 from core.fetcher import BaseFetcher
+from core.api import add_api_arguments
 from core.utils import sanitize_id
 
 logger = logging.getLogger(__name__)
@@ -42,18 +43,9 @@ class ItemFetcher(BaseFetcher):
     def _wait_for_list_page(self):
         """Wait for items list page to load with all item cards."""
         try:
-            # Wait for Angular app to initialize
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "app-items"))
-            )
-            
-            # Wait for item cards to load
-            WebDriverWait(self.driver, 20).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "app-item-card"))
-            )
-            
-            # Additional wait for all cards to render
-            time.sleep(3)
+            # Wait for the Angular app and its item cards to render
+            if not self.wait_until_ready(selectors=["app-items", "app-item-card"], timeout=20):
+                raise TimeoutException("item cards did not render")
             
             logger.info("Items list page loaded successfully")
             
@@ -154,49 +146,8 @@ class ItemFetcher(BaseFetcher):
             # Wait for the item detail to load - using the same pattern as race fetcher
             logger.info(f"Waiting for item content to load for {item_name}...")
             
-            # Initial navigation wait
-            time.sleep(5)  # Give Angular time to start loading
-            
-            try:
-                # Wait for item-specific Angular elements to load (like class fetcher does)
-                WebDriverWait(self.driver, 20).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "app-item-detail"))
-                )
-                
-                # Angular HTTP check times out but content loads anyway - skip it
-                # The site appears to use a different Angular version or structure
-                logger.info(f"Skipping Angular HTTP check - content loads without it")
-                
-                # Wait for specific item content elements like class fetcher waits for expansion panels
-                WebDriverWait(self.driver, 30).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "div.d-flex.justify-content-between"))
-                )
-                
-                # Additional specific content checks using page source
-                WebDriverWait(self.driver, 10).until(
-                    lambda driver: (
-                        # Check we have the Angular-rendered item structure
-                        'class="d-flex justify-content-between"' in driver.page_source and
-                        'Type: </label>' in driver.page_source and
-                        'Sub type: </label>' in driver.page_source and
-                        'Cost: </label>' in driver.page_source and
-                        'Description:</mat-card-title>' in driver.page_source and
-                        '<mat-card-content _ngcontent' in driver.page_source and
-                        'linkify' in driver.page_source and
-                        # Make sure we're not on loading page
-                        "Loading: Angel's Sword Studios" not in driver.page_source[:1000] and
-                        # Ensure substantial content
-                        len(driver.page_source) > 60000
-                    )
-                )
-                
-                logger.info(f"Item content loaded for {item_name} - page size: {len(self.driver.page_source)}")
-                time.sleep(2)  # Small wait for final rendering
-                
-            except TimeoutException as e:
-                logger.warning(f"Timeout waiting for item content: {e}")
-                # Still try to get what we have
-                time.sleep(10)  # Last ditch effort like race fetcher
+            self._wait_for_detail_page()
+            logger.info(f"Item content loaded for {item_name}")
             
             # Save the HTML
             html = self.driver.page_source
@@ -278,19 +229,31 @@ class ItemFetcher(BaseFetcher):
             logger.info(f"{subtype}: {count} items")
     
     def _wait_for_detail_page(self):
-        """Wait for the item detail page to load properly."""
-        try:
-            # Simple wait like class fetcher - just wait for the item detail component
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "app-item-detail"))
-            )
-            logger.debug("Item detail page loaded")
-            # Small additional wait for Angular rendering
-            time.sleep(2)
-        except TimeoutException:
-            logger.warning("Timeout waiting for item detail component, proceeding anyway")
-            # Give it a bit more time just in case
-            time.sleep(3)
+        """
+        Wait for the item detail page to load properly.
+        
+        Raises:
+            TimeoutException: If the item structure never rendered, so a partial
+                page is not saved
+        """
+        # Wait for the Angular-rendered item structure; the markers are checked
+        # inside the browser so the page source is only transferred once
+        ready = self.wait_until_ready(
+            selectors=["app-item-detail", "div.d-flex.justify-content-between"],
+            markers=[
+                'Type: </label>',
+                'Sub type: </label>',
+                'Cost: </label>',
+                'Description:</mat-card-title>',
+                '<mat-card-content _ngcontent',
+                'linkify',
+            ],
+            min_length=60000,
+            timeout=30,
+        )
+        if not ready:
+            raise TimeoutException("Timeout waiting for item detail content")
+        logger.debug("Item detail page loaded")
 
     def fetch_detail_page(self, url: str, item_id: str, metadata: Optional[Dict] = None) -> str:
         """Fetch an item detail page - simplified like other working fetchers."""
@@ -466,10 +429,28 @@ def main():
         choices=["DEBUG", "INFO", "WARNING", "ERROR"],
         help="Set logging level"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of parallel browser sessions for detail pages (default: 1)"
+    )
+    parser.add_argument(
+        "--max-age",
+        type=float,
+        default=BaseFetcher.DEFAULT_MAX_AGE / 3600,
+        help="Refetch unchanged pages older than this many hours (default: 168)"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Refetch every page, ignoring the fetch manifest"
+    )
     parser.add_argument(
         "--single-url",
         help="Test mode: fetch a single item by URL (e.g., '/game/0.10.1/items/axe--heavy-')"
     )
+    add_api_arguments(parser)
     
     args = parser.parse_args()
     
@@ -485,9 +466,11 @@ def main():
     if args.single_url:
         # Test mode: fetch single item
         fetcher.test_single_item(args.single_url)
+    elif args.capture_api:
+        fetcher.capture_api_payloads()
     else:
         # Normal mode: fetch all items
-        fetcher.fetch_all()
+        fetcher.fetch_all(workers=args.workers, max_age=args.max_age * 3600, force=args.force)
 
 
 if __name__ == "__main__":
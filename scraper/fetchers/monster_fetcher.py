@@ -7,7 +7,6 @@ saving HTML files for parsing.
 """
 
 import logging
-import time
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 from urllib.parse import urljoin
@@ -18,6 +17,7 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 
 from core.fetcher import BaseFetcher
+from core.api import add_api_arguments
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +25,9 @@ logger = logging.getLogger(__name__)
 class MonsterFetcher(BaseFetcher):
     """Fetcher for monster pages"""
     
+    # Position on the list page shifts whenever a monster is added
+    MANIFEST_VOLATILE_FIELDS = ('fetch_order',)
+    
     def get_data_type(self) -> str:
         """Return the data type this fetcher handles"""
         return "monsters"
@@ -33,8 +36,11 @@ class MonsterFetcher(BaseFetcher):
         """Get the URL for the monster list page"""
         return f"https://rpg.angelssword.com/game/{self.version}/monsters"
     
-    def extract_list_items(self) -> List[Dict[str, Any]]:
-        """Extract monster items from the list page - required by BaseFetcher"""
+    def extract_list_items(self, soup=None) -> List[Dict[str, Any]]:
+        """Extract monster items from the list page - required by BaseFetcher
+        
+        Reads the live list page through the driver, so the soup is ignored.
+        """
         monster_links = self._extract_monster_links()
         
         items = []
@@ -47,7 +53,9 @@ class MonsterFetcher(BaseFetcher):
         
         return items
     
-    def fetch_all(self) -> Dict[str, str]:
+    def fetch_all(self, delay: float = 2.0, workers: int = 1,
+                  max_age: Optional[float] = BaseFetcher.DEFAULT_MAX_AGE,
+                  force: bool = False) -> Dict[str, str]:
         """Fetch all monster detail pages"""
         logger.info(f"Starting monster fetch for version {self.version}")
         
@@ -64,31 +72,20 @@ class MonsterFetcher(BaseFetcher):
             monster_links = self._extract_monster_links()
             logger.info(f"Found {len(monster_links)} monsters to fetch")
             
-            results = {}
-            
-            # Fetch each monster detail page
+            # Metadata for each monster doubles as the work item for the fetch pool
+            items = []
             for i, (monster_id, monster_url) in enumerate(monster_links.items(), 1):
-                try:
-                    logger.info(f"Fetching monster {i}/{len(monster_links)}: {monster_id}")
-                    
-                    # Create metadata for this monster
-                    metadata = {
-                        'monster_id': monster_id,
-                        'source_url': monster_url,
-                        'list_url': list_url,
-                        'fetch_order': i
-                    }
-                    
-                    # Fetch the detail page
-                    html_path = self.fetch_detail_page(monster_url, monster_id, metadata)
-                    results[monster_id] = html_path
-                    
-                    # Add delay between requests
-                    time.sleep(2)
-                    
-                except Exception as e:
-                    logger.error(f"Error fetching monster {monster_id}: {e}")
-                    continue
+                items.append({
+                    'id': monster_id,
+                    'url': monster_url,
+                    'monster_id': monster_id,
+                    'source_url': monster_url,
+                    'list_url': list_url,
+                    'fetch_order': i
+                })
+            
+            results = self.fetch_items(items, delay=delay, workers=workers,
+                                       max_age=max_age, force=force)
             
             logger.info(f"Successfully fetched {len(results)} monster detail pages")
             return results
@@ -133,8 +130,8 @@ class MonsterFetcher(BaseFetcher):
                         # Update latest symlink
                         self._update_symlink(actual_version)
             
-            # Additional wait for all cards to load
-            time.sleep(2)
+            # Wait for all cards to finish rendering
+            self.wait_until_ready(selectors=["app-monster-card"], timeout=10)
             
         except TimeoutException:
             logger.warning("Timeout waiting for monster list page to load")
@@ -196,63 +193,15 @@ class MonsterFetcher(BaseFetcher):
     
     def _wait_for_detail_page(self):
         """Override base fetcher method with monster-specific waits"""
-        try:
-            # Wait for the monster detail component
-            WebDriverWait(self.driver, 20).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "app-monster-details"))
-            )
-            
-            # Wait for the stats component
-            WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "app-monster-stats"))
-            )
-            
-            # Wait for expansion panels (abilities)
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "mat-expansion-panel"))
-            )
-            
-            # Expand all ability panels
-            self._expand_all_panels()
-            
-            # Final wait for content to stabilize
-            time.sleep(3)
-            
-        except TimeoutException as e:
-            logger.warning(f"Timeout waiting for monster detail content: {e}")
-            time.sleep(5)  # Last ditch effort
-    
-    def _expand_all_panels(self):
-        """Expand all mat-expansion-panel elements"""
-        try:
-            panels = self.driver.find_elements(By.CSS_SELECTOR, "mat-expansion-panel-header")
-            logger.info(f"Found {len(panels)} expansion panels to expand")
-            
-            # Expand panels in batches to avoid overwhelming the page
-            batch_size = 5
-            for i in range(0, len(panels), batch_size):
-                batch = panels[i:i + batch_size]
-                
-                for panel in batch:
-                    try:
-                        # Check if panel is already expanded
-                        parent = panel.find_element(By.XPATH, "..")
-                        if "mat-expanded" not in parent.get_attribute("class"):
-                            self.driver.execute_script("arguments[0].click();", panel)
-                            time.sleep(0.5)  # Brief pause between clicks
-                    except Exception as e:
-                        logger.debug(f"Could not expand panel: {e}")
-                        continue
-                
-                # Pause between batches
-                if i + batch_size < len(panels):
-                    time.sleep(2)
-            
-            # Final wait for all content to load
-            time.sleep(3)
-            
-        except Exception as e:
-            logger.warning(f"Error expanding panels: {e}")
+        ready = self.wait_until_ready(
+            selectors=["app-monster-details", "app-monster-stats", "mat-expansion-panel"],
+            timeout=20,
+        )
+        if not ready:
+            self.mark_page_incomplete("timeout waiting for monster detail content")
+        
+        # Expand all ability panels
+        self._expand_all_panels()
     
     def fetch_detail_page(self, url: str, monster_id: str, metadata: Optional[Dict] = None) -> str:
         """Override base fetcher method to add validation"""
@@ -332,7 +281,12 @@ def main():
     parser.add_argument("--version", default="latest", help="Game version to fetch")
     parser.add_argument("--output-dir", default="scraped_html", help="Output directory")
     parser.add_argument("--test-monster", help="Test mode: fetch single monster by ID")
+    parser.add_argument("--workers", type=int, default=1, help="Number of parallel browser sessions")
+    parser.add_argument("--max-age", type=float, default=BaseFetcher.DEFAULT_MAX_AGE / 3600,
+                        help="Refetch unchanged pages older than this many hours")
+    parser.add_argument("--force", action="store_true", help="Refetch every page, ignoring the fetch manifest")
     parser.add_argument("--debug", action="store_true", help="Enable debug logging")
+    add_api_arguments(parser)
     
     args = parser.parse_args()
     
@@ -350,9 +304,12 @@ def main():
         if args.test_monster:
             # Test mode - single monster
             fetcher.test_single_monster(args.test_monster)
+        elif args.capture_api:
+            fetcher.capture_api_payloads()
         else:
             # Normal mode - fetch all monsters
-            results = fetcher.fetch_all()
+            results = fetcher.fetch_all(workers=args.workers, max_age=args.max_age * 3600,
+                                        force=args.force)
             logger.info(f"Fetch complete: {len(results)} monsters processed")
     
     except KeyboardInterrupt:
@@ -4,13 +4,10 @@ import logging
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
 from bs4 import BeautifulSoup
 from core.fetcher import BaseFetcher
+from core.api import add_api_arguments
 from core.utils import sanitize_id
-import time
 
 logger = logging.getLogger(__name__)
 
@@ -94,7 +91,7 @@ class RaceFetcher(BaseFetcher):
             logger.info("Clicking on Sub-Races tab...")
             sub_races_tab = self.driver.find_element(By.XPATH, "//div[@role='tab'][contains(.,'Sub-Races')]")
             self.driver.execute_script("arguments[0].click();", sub_races_tab)
-            time.sleep(3)
+            self.wait_until_ready(selectors=["app-ancestry-card"], timeout=10)
             
             # Extract sub-races
             logger.info("Extracting sub-races...")
@@ -111,55 +108,25 @@ class RaceFetcher(BaseFetcher):
     
     def _wait_for_list_page(self):
         """Wait for races list page to load."""
-        try:
-            # Wait for tabs to load
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "[role='tab']"))
-            )
-        except Exception as e:
-            logger.warning(f"Tab elements not found: {e}")
+        if not self.wait_until_ready(selectors=["[role='tab']"], timeout=10):
+            logger.warning("Tab elements not found")
     
     def _wait_for_detail_page(self):
         """Override base fetcher method with proper Angular waiting for race pages."""
-        try:
-            # First wait for basic page structure
-            WebDriverWait(self.driver, 20).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-            
-            # Wait for the page title to change away from loading
-            WebDriverWait(self.driver, 30).until(
-                lambda driver: "Loading: Angel's Sword Studios" not in driver.title
-            )
-            
-            # Wait for actual race content patterns to appear in page source
-            WebDriverWait(self.driver, 30).until(
-                lambda driver: (
-                    # Ensure we have actual content, not just HTML structure
-                    len(driver.page_source) > 50000 and
-                    # Look for race-specific content patterns that indicate data has loaded
-                    ("Primary race:" in driver.page_source or 
-                     "You gain +" in driver.page_source or  # Attribute benefits
-                     "You can speak" in driver.page_source or  # Proficiency benefits
-                     "Points:" in driver.page_source) and  # Skills points
-                    # Double-check not on loading page
-                    "Loading: Angel's Sword Studios" not in driver.page_source[:2000]
-                )
-            )
-            
-            # Additional wait for all content to render
-            time.sleep(5)
-            
-        except TimeoutException as e:
-            logger.warning(f"Timeout waiting for race content: {e}")
-            # Last ditch effort - wait longer and check what we have
-            time.sleep(15)
-            page_source = self.driver.page_source
-            logger.debug(f"Page source length: {len(page_source)}")
+        # Race-specific content patterns that indicate the data has loaded
+        ready = self.wait_until_ready(
+            any_markers=[
+                "Primary race:",
+                "You gain +",      # Attribute benefits
+                "You can speak",   # Proficiency benefits
+                "Points:",         # Skills points
+            ],
+            min_length=50000,
+            timeout=30,
+        )
+        if not ready:
+            self.mark_page_incomplete("timeout waiting for race content")
             logger.debug(f"Page title: {self.driver.title}")
-            logger.debug(f"Has loading text: {'Loading: Angel' in page_source[:2000]}")
-            logger.debug(f"Has You gain: {'You gain +' in page_source}")
-            logger.debug(f"Has Primary race: {'Primary race:' in page_source}")
     
     def fetch_detail_page(self, url: str, item_id: str, metadata: Optional[Dict] = None) -> str:
         """Override base fetcher method to add validation for race pages."""
@@ -243,13 +210,20 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Fetch LC races data")
     parser.add_argument("--version", default="latest", help="Game version to fetch")
     parser.add_argument("--test-race", help="Test mode: fetch single race by URL")
+    parser.add_argument("--workers", type=int, default=1, help="Number of parallel browser sessions")
+    parser.add_argument("--max-age", type=float, default=BaseFetcher.DEFAULT_MAX_AGE / 3600,
+                        help="Refetch unchanged pages older than this many hours")
+    parser.add_argument("--force", action="store_true", help="Refetch every page, ignoring the fetch manifest")
+    add_api_arguments(parser)
     args = parser.parse_args()
     
     fetcher = RaceFetcher(version=args.version)
     try:
         if args.test_race:
             fetcher.test_single_race(args.test_race)
+        elif args.capture_api:
+            fetcher.capture_api_payloads()
         else:
-            fetcher.fetch_all()
+            fetcher.fetch_all(workers=args.workers, max_age=args.max_age * 3600, force=args.force)
     finally:
         fetcher.cleanup()
\ No newline at end of file
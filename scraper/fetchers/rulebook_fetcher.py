@@ -81,8 +81,8 @@ class RulebookFetcher(BaseFetcher):
             time.sleep(2)
             
         except TimeoutException:
-            logger.warning("Timeout waiting for rulebook content")
             # Continue anyway - we might have partial content
+            self.mark_page_incomplete("timeout waiting for rulebook content")
 
 
 def main():
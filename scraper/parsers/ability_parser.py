@@ -12,7 +12,7 @@ from typing import List, Dict, Any, Optional, Union
 from pathlib import Path
 from bs4 import BeautifulSoup
 
-from core.parser import BaseParser
+from core.parser import BaseParser, make_soup
 from core.utils import sanitize_id, extract_keywords
 
 logger = logging.getLogger(__name__)
@@ -44,30 +44,7 @@ class AbilityParser(BaseParser):
             with open(html_path, 'r', encoding='utf-8') as f:
                 html_content = f.read()
             
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Find all expansion panels
-            panels = soup.select('mat-expansion-panel')
-            logger.info(f"Found {len(panels)} ability panels")
-            
-            abilities = []
-            for i, panel in enumerate(panels):
-                try:
-                    ability_result = self._parse_ability_panel(panel)
-                    
-                    # Handle both single abilities and lists (from crafting subdivision)
-                    if isinstance(ability_result, list):
-                        abilities.extend(ability_result)
-                        logger.debug(f"Panel {i+1}: Added {len(ability_result)} crafting abilities")
-                    elif ability_result:
-                        abilities.append(ability_result)
-                        logger.debug(f"Panel {i+1}: Added ability '{ability_result.get('name', 'Unknown')}'")
-                    else:
-                        logger.warning(f"Panel {i+1}: Failed to parse")
-                        
-                except Exception as e:
-                    logger.error(f"Error parsing panel {i+1}: {e}")
-                    continue
+            abilities = self.cached_parse(html_content, lambda: self._parse_abilities_html(html_content))
             
             logger.info(f"Successfully parsed {len(abilities)} abilities")
             return abilities
@@ -76,6 +53,35 @@ class AbilityParser(BaseParser):
             logger.error(f"Error parsing file {html_path}: {e}")
             return []
     
+    def _parse_abilities_html(self, html_content: str) -> List[Dict[str, Any]]:
+        """Parse every ability panel in a tab's HTML"""
+        soup = make_soup(html_content)
+        
+        # Find all expansion panels
+        panels = soup.select('mat-expansion-panel')
+        logger.info(f"Found {len(panels)} ability panels")
+        
+        abilities = []
+        for i, panel in enumerate(panels):
+            try:
+                ability_result = self._parse_ability_panel(panel)
+                
+                # Handle both single abilities and lists (from crafting subdivision)
+                if isinstance(ability_result, list):
+                    abilities.extend(ability_result)
+                    logger.debug(f"Panel {i+1}: Added {len(ability_result)} crafting abilities")
+                elif ability_result:
+                    abilities.append(ability_result)
+                    logger.debug(f"Panel {i+1}: Added ability '{ability_result.get('name', 'Unknown')}'")
+                else:
+                    logger.warning(f"Panel {i+1}: Failed to parse")
+                    
+            except Exception as e:
+                logger.error(f"Error parsing panel {i+1}: {e}")
+                continue
+        
+        return abilities
+    
     def _parse_ability_panel(self, panel: BeautifulSoup) -> Union[Dict[str, Any], List[Dict[str, Any]], None]:
         """Parse a single mat-expansion-panel into ability data"""
         
@@ -8,7 +8,7 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any, Union
 from bs4 import BeautifulSoup
 
-from core.parser import BaseParser
+from core.parser import BaseParser, make_soup
 from core.utils import sanitize_id
 
 logger = logging.getLogger(__name__)
@@ -216,19 +216,9 @@ class BreakthroughParser(BaseParser):
         
         try:
             with open(html_path, 'r', encoding='utf-8') as f:
-                soup = BeautifulSoup(f.read(), 'html.parser')
+                html_content = f.read()
             
-            # Find all expansion panels
-            panels = soup.select('mat-expansion-panel')
-            logger.info(f"Found {len(panels)} breakthrough panels")
-            
-            breakthroughs = []
-            for i, panel in enumerate(panels):
-                breakthrough_data = self.parse_breakthrough(panel)
-                if breakthrough_data:
-                    breakthroughs.append(breakthrough_data)
-                else:
-                    logger.warning(f"Failed to parse breakthrough panel {i+1}")
+            breakthroughs = self.cached_parse(html_content, lambda: self._parse_breakthroughs_html(html_content))
             
             logger.info(f"Successfully parsed {len(breakthroughs)} breakthroughs")
             return breakthroughs
@@ -237,6 +227,24 @@ class BreakthroughParser(BaseParser):
             logger.error(f"Error parsing breakthroughs file: {e}")
             return []
     
+    def _parse_breakthroughs_html(self, html_content: str) -> List[Dict[str, Any]]:
+        """Parse every breakthrough panel in the page HTML."""
+        soup = make_soup(html_content)
+        
+        # Find all expansion panels
+        panels = soup.select('mat-expansion-panel')
+        logger.info(f"Found {len(panels)} breakthrough panels")
+        
+        breakthroughs = []
+        for i, panel in enumerate(panels):
+            breakthrough_data = self.parse_breakthrough(panel)
+            if breakthrough_data:
+                breakthroughs.append(breakthrough_data)
+            else:
+                logger.warning(f"Failed to parse breakthrough panel {i+1}")
+        
+        return breakthroughs
+    
     def parse_and_save_all(self, input_dir: Optional[Path] = None) -> Dict[str, Any]:
         """Parse all breakthroughs and save to individual YAML files.
         
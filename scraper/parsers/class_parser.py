@@ -418,10 +418,11 @@ def main():
     parser.add_argument('--output-dir', default='parsed_data', help='Output directory base')
     parser.add_argument('--version', default='0.10.1', help='Version identifier for output organization')
     parser.add_argument('--format', choices=['yaml', 'json'], default='yaml', help='Output format')
+    parser.add_argument('--jobs', type=int, default=1, help='Number of parallel parse processes')
     args = parser.parse_args()
     
     parser = ClassParser(output_dir=args.output_dir, version=args.version)
-    parser.parse_directory(args.input_dir, output_format=args.format)
+    parser.parse_directory(args.input_dir, output_format=args.format, jobs=args.jobs)
 
 
 if __name__ == "__main__":
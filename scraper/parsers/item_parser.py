@@ -14,7 +14,7 @@ from pathlib import Path
 from typing import Dict, List, Any, Optional
 from bs4 import BeautifulSoup
 
-from core.parser import BaseParser
+from core.parser import BaseParser, make_soup
 from core.utils import sanitize_id, clean_text
 from schemas.item_schema import Item, ItemsIndex
 
@@ -205,7 +205,34 @@ class ItemParser(BaseParser):
             items=items_list
         )
     
-    def parse_and_save_all(self, input_dir: str) -> Dict[str, Any]:
+    def _parse_item(self, html_file: Path) -> Dict[str, Any]:
+        """Parse, validate and save one item page (runs in parse workers)."""
+        # Load metadata if available
+        meta_file = html_file.with_suffix('.meta.json')
+        metadata = {}
+        if meta_file.exists():
+            with open(meta_file, 'r', encoding='utf-8') as f:
+                metadata = json.load(f)
+        
+        # Parse the HTML
+        with open(html_file, 'r', encoding='utf-8') as f:
+            html_content = f.read()
+        
+        item_data = self.cached_parse(html_content,
+                                      lambda: self.parse_detail(make_soup(html_content), metadata),
+                                      json.dumps(metadata, sort_keys=True))
+        
+        # Validate with Pydantic
+        item = Item(**item_data)
+        item_dict = item.model_dump()
+        
+        # Save individual item file
+        self.to_yaml(item_dict, item.id)
+        
+        logger.debug(f"Parsed item: {item.name}")
+        return item_dict
+    
+    def parse_and_save_all(self, input_dir: str, jobs: int = 1) -> Dict[str, Any]:
         """Parse all items and save to organized structure."""
         logger.info(f"Starting item parsing for version {self.version}")
         
@@ -214,11 +241,8 @@ class ItemParser(BaseParser):
         if not input_path.exists():
             raise FileNotFoundError(f"Input directory not found: {input_path}")
         
-        # Output directory is already created by BaseParser
-        output_dir = self.output_dir
-        
         # Find all HTML files
-        html_files = list(input_path.glob("*.html"))
+        html_files = sorted(input_path.glob("*.html"))
         if not html_files:
             logger.warning(f"No HTML files found in {input_path}")
             return {"parsed_count": 0, "items": []}
@@ -231,34 +255,12 @@ class ItemParser(BaseParser):
         all_items = []
         failed_items = []
         
-        for html_file in html_files:
-            try:
-                # Load metadata if available
-                meta_file = html_file.with_suffix('.meta.json')
-                metadata = {}
-                if meta_file.exists():
-                    with open(meta_file, 'r', encoding='utf-8') as f:
-                        metadata = json.load(f)
-                
-                # Parse the HTML
-                with open(html_file, 'r', encoding='utf-8') as f:
-                    html_content = f.read()
-                
-                soup = BeautifulSoup(html_content, 'html.parser')
-                item_data = self.parse_detail(soup, metadata)
-                
-                # Validate with Pydantic
-                item = Item(**item_data)
-                all_items.append(item.model_dump())
-                
-                # Save individual item file
-                self.to_yaml(item.model_dump(), item.id)
-                
-                logger.debug(f"Parsed item: {item.name}")
-                
-            except Exception as e:
-                logger.error(f"Failed to parse {html_file.name}: {e}")
+        for html_file, item_data, error in self.map_files('_parse_item', html_files, jobs=jobs):
+            if error:
+                logger.error(f"Failed to parse {html_file.name}: {error}")
                 failed_items.append(html_file.name)
+            else:
+                all_items.append(item_data)
         
         # Create and save index
         if all_items:
@@ -298,6 +300,12 @@ def main():
         default="parsed_data",
         help="Output directory for parsed files"
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of parallel parse processes (default: 1)"
+    )
     parser.add_argument(
         "--log-level",
         default="INFO",
@@ -319,7 +327,7 @@ def main():
         output_dir=args.output_dir
     )
     
-    results = item_parser.parse_and_save_all(args.input_dir)
+    results = item_parser.parse_and_save_all(args.input_dir, jobs=args.jobs)
     
     print(f"Parsing complete!")
     print(f"Successfully parsed: {results['parsed_count']} items")
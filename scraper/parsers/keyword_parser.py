@@ -8,7 +8,7 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any
 from bs4 import BeautifulSoup
 
-from core.parser import BaseParser
+from core.parser import BaseParser, make_soup
 from core.utils import sanitize_id
 
 logger = logging.getLogger(__name__)
@@ -224,19 +224,9 @@ class KeywordParser(BaseParser):
         
         try:
             with open(html_path, 'r', encoding='utf-8') as f:
-                soup = BeautifulSoup(f.read(), 'html.parser')
+                html_content = f.read()
             
-            # Find all expansion panels
-            panels = soup.select('mat-expansion-panel')
-            logger.info(f"Found {len(panels)} keyword panels")
-            
-            keywords = []
-            for i, panel in enumerate(panels):
-                keyword_data = self.parse_keyword(panel)
-                if keyword_data:
-                    keywords.append(keyword_data)
-                else:
-                    logger.warning(f"Failed to parse keyword panel {i+1}")
+            keywords = self.cached_parse(html_content, lambda: self._parse_keywords_html(html_content))
             
             logger.info(f"Successfully parsed {len(keywords)} keywords")
             return keywords
@@ -245,6 +235,24 @@ class KeywordParser(BaseParser):
             logger.error(f"Error parsing keywords file: {e}")
             return []
     
+    def _parse_keywords_html(self, html_content: str) -> List[Dict[str, Any]]:
+        """Parse every keyword panel in the page HTML."""
+        soup = make_soup(html_content)
+        
+        # Find all expansion panels
+        panels = soup.select('mat-expansion-panel')
+        logger.info(f"Found {len(panels)} keyword panels")
+        
+        keywords = []
+        for i, panel in enumerate(panels):
+            keyword_data = self.parse_keyword(panel)
+            if keyword_data:
+                keywords.append(keyword_data)
+            else:
+                logger.warning(f"Failed to parse keyword panel {i+1}")
+        
+        return keywords
+    
     def parse_and_save_all(self, input_dir: Optional[Path] = None) -> Dict[str, Any]:
         """Parse all keywords and save to individual YAML files.
         
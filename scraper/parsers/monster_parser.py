@@ -8,7 +8,7 @@ extracting stat blocks, abilities, and metadata.
 
 import re
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 from bs4 import BeautifulSoup
 
@@ -262,7 +262,26 @@ class MonsterParser(BaseParser):
         description = re.sub(r'\n\s*\n\s*\n', '\n\n', description)
         return description.strip()
     
-    def parse_directory(self, html_dir: str, output_format: str = "yaml") -> Dict[str, str]:
+    def _parse_monster(self, html_file: Path, output_format: str) -> Optional[Tuple[Dict[str, Any], str]]:
+        """Parse one monster page and save its individual file (runs in parse workers)"""
+        # Check for corresponding metadata file
+        meta_file = html_file.with_suffix('.meta.json')
+        
+        # Parse the monster file
+        monster_data = self.parse_file(str(html_file), str(meta_file) if meta_file.exists() else None)
+        if not monster_data:
+            return None
+        
+        # Save individual monster file
+        output_path = ""
+        if output_format == "yaml":
+            monster_id = monster_data.get('id', html_file.stem)
+            output_path = self.to_yaml(monster_data, monster_id)
+        
+        logger.info(f"Parsed monster: {monster_data.get('name', 'Unknown')}")
+        return monster_data, output_path
+    
+    def parse_directory(self, html_dir: str, output_format: str = "yaml", jobs: int = 1) -> Dict[str, str]:
         """Parse all HTML files in a directory and save monsters"""
         html_path = Path(html_dir)
         if not html_path.exists():
@@ -270,30 +289,23 @@ class MonsterParser(BaseParser):
             return {}
         
         results = {}
-        html_files = list(html_path.glob("*.html"))
+        html_files = sorted(html_path.glob("*.html"))
         
         logger.info(f"Found {len(html_files)} HTML files to parse")
         
         all_monsters = []
         
-        for html_file in html_files:
-            # Check for corresponding metadata file
-            meta_file = html_file.with_suffix('.meta.json')
-            
-            # Parse the monster file
-            monster_data = self.parse_file(str(html_file), str(meta_file) if meta_file.exists() else None)
+        for html_file, parsed, error in self.map_files('_parse_monster', html_files, output_format, jobs=jobs):
+            if error:
+                logger.error(f"Error parsing {html_file}: {error}")
+                continue
+            if not parsed:
+                continue
             
-            if monster_data:
-                all_monsters.append(monster_data)
-                
-                # Save individual monster file
-                monster_id = monster_data.get('id', html_file.stem)
-                if output_format == "yaml":
-                    output_path = self.to_yaml(monster_data, monster_id)
-                    if output_path:
-                        results[monster_id] = output_path
-                
-                logger.info(f"Parsed monster: {monster_data.get('name', 'Unknown')}")
+            monster_data, output_path = parsed
+            all_monsters.append(monster_data)
+            if output_path:
+                results[monster_data.get('id', html_file.stem)] = output_path
         
         # Save index file
         if all_monsters:
@@ -352,6 +364,7 @@ def main():
     parser.add_argument("--version", default="latest", help="Game version")
     parser.add_argument("--output-dir", default="parsed_data", help="Output directory")
     parser.add_argument("--format", choices=["yaml", "json"], default="yaml", help="Output format")
+    parser.add_argument("--jobs", type=int, default=1, help="Number of parallel parse processes")
     parser.add_argument("--debug", action="store_true", help="Enable debug logging")
     
     args = parser.parse_args()
@@ -373,7 +386,7 @@ def main():
         return
     
     # Parse all HTML files in directory
-    results = monster_parser.parse_directory(html_dir, args.format)
+    results = monster_parser.parse_directory(html_dir, args.format, jobs=args.jobs)
     
     logger.info(f"Parsing complete: {len(results)} monsters processed")
 
@@ -5,7 +5,7 @@ from pathlib import Path
 from typing import Dict, Any, Optional, List
 from bs4 import BeautifulSoup, Tag
 
-from core.parser import BaseParser
+from core.parser import BaseParser, make_soup
 from core.utils import sanitize_id, clean_text
 
 logger = logging.getLogger(__name__)
@@ -38,7 +38,15 @@ class RaceParser(BaseParser):
     def parse_detail(self, html_path: Path) -> Dict[str, Any]:
         """Parse individual race detail page HTML and extract structured data."""
         with open(html_path, 'r', encoding='utf-8') as f:
-            soup = BeautifulSoup(f.read(), 'html.parser')
+            html_content = f.read()
+        
+        # The file name feeds the race id, so it is part of the cache key
+        return self.cached_parse(html_content, lambda: self._parse_race_html(html_content, html_path),
+                                 html_path.name)
+    
+    def _parse_race_html(self, html_content: str, html_path: Path) -> Dict[str, Any]:
+        """Parse race page HTML as either a detail page or an old-style list page."""
+        soup = make_soup(html_content)
         
         # Check if this is a detail page (has app-primary-details, app-secondary-details, or app-race-details)
         detail_component = soup.select_one('app-primary-details, app-secondary-details, app-race-details')
@@ -410,7 +418,25 @@ class RaceParser(BaseParser):
         
         return benefits
     
-    def parse_all_races(self) -> Dict[str, Any]:
+    def _parse_and_save_race(self, html_file: Path) -> Optional[Dict[str, Any]]:
+        """Parse one race page and save it under primary/ or sub/ (runs in parse workers)."""
+        logger.info(f"Parsing {html_file.name}")
+        race = self.parse_detail(html_file)
+        if not race:
+            return None
+        
+        # Create subdirectory, save in current directory then move
+        race_dir = self.output_dir / ('primary' if race.get('type', 'primary') == 'primary' else 'sub')
+        race_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = self.to_yaml(race, race['id'])
+        if temp_path:
+            final_path = race_dir / f"{race['id']}.yaml"
+            Path(temp_path).rename(final_path)
+            logger.info(f"Moved to {final_path}")
+        
+        return race
+    
+    def parse_all_races(self, jobs: int = 1) -> Dict[str, Any]:
         """Parse all individual race detail files."""
         all_data = {
             'primary_races': [],
@@ -419,12 +445,13 @@ class RaceParser(BaseParser):
         }
         
         # Parse all individual race HTML files
-        html_files = list(self.input_dir.glob("*.html"))
+        html_files = sorted(self.input_dir.glob("*.html"))
         logger.info(f"Found {len(html_files)} race HTML files to parse")
         
-        for html_file in html_files:
-            logger.info(f"Parsing {html_file.name}")
-            result = self.parse_detail(html_file)
+        for html_file, result, error in self.map_files('_parse_and_save_race', html_files, jobs=jobs):
+            if error:
+                logger.error(f"Error parsing {html_file.name}: {error}")
+                continue
             
             if result:
                 race_type = result.get('type', 'primary')
@@ -435,29 +462,6 @@ class RaceParser(BaseParser):
         
         all_data['total_count'] = len(all_data['primary_races']) + len(all_data['sub_races'])
         
-        # Save individual race files
-        for race in all_data['primary_races']:
-            # Create subdirectory
-            primary_dir = self.output_dir / 'primary'
-            primary_dir.mkdir(parents=True, exist_ok=True)
-            # Save in current directory then move
-            temp_path = self.to_yaml(race, race['id'])
-            if temp_path:
-                final_path = primary_dir / f"{race['id']}.yaml"
-                Path(temp_path).rename(final_path)
-                logger.info(f"Moved to {final_path}")
-        
-        for race in all_data['sub_races']:
-            # Create subdirectory  
-            sub_dir = self.output_dir / 'sub'
-            sub_dir.mkdir(parents=True, exist_ok=True)
-            # Save in current directory then move
-            temp_path = self.to_yaml(race, race['id'])
-            if temp_path:
-                final_path = sub_dir / f"{race['id']}.yaml"
-                Path(temp_path).rename(final_path)
-                logger.info(f"Moved to {final_path}")
-        
         # Save index file
         self.to_yaml(all_data, "races_index")
         
@@ -479,9 +483,13 @@ if __name__ == "__main__":
     
     parser = argparse.ArgumentParser(description="Parse LC race data")
     parser.add_argument("--version", default="latest", help="Game version to parse")
+    parser.add_argument("--input-base-dir", default="scraped_html", help="Base directory of fetched HTML")
+    parser.add_argument("--output-dir", default="parsed_data", help="Output directory base")
     parser.add_argument("--format", choices=["yaml", "json"], default="yaml",
                        help="Output format")
+    parser.add_argument("--jobs", type=int, default=1, help="Number of parallel parse processes")
     args = parser.parse_args()
     
-    race_parser = RaceParser(version=args.version)
-    race_parser.parse_all_races()
\ No newline at end of file
+    race_parser = RaceParser(version=args.version, input_base_dir=args.input_base_dir,
+                             output_dir=args.output_dir)
+    race_parser.parse_all_races(jobs=args.jobs)
\ No newline at end of file
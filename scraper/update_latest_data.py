@@ -2,19 +2,31 @@
 """
 Update script for fetching and parsing the latest game data.
 
-This script runs all fetchers and parsers in sequence to grab the latest
-version of game data from the Lyrian Chronicles website.
+This script runs all fetchers and parsers in-process to grab the latest
+version of game data from the Lyrian Chronicles website. Data types run as a
+dependency graph: independent types are fetched and parsed concurrently, the
+fetchers share one pool of WebDriver sessions, and each stage is timed.
 
 Usage:
-    python update_latest_data.py [--fetch-only] [--parse-only] [--data-types TYPE1 TYPE2 ...]
+    python update_latest_data.py [--fetch-only] [--parse-only] [--data-types TYPE1 TYPE2 ...] [--concurrency N]
 """
 
 import argparse
+import importlib
 import logging
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import partial
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional
+
+from core.parser import ParseStream
+from core.release_store import ReleaseStore
+from core.search_index import SearchIndex
+from core.storage import Corpus
 
 # Configure logging
 logging.basicConfig(
@@ -23,25 +35,101 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Data types in dependency order (some parsers need others to complete first)
-DATA_TYPES = [
-    'keywords',      # No dependencies
-    'abilities',     # No dependencies 
-    'monster-abilities',  # No dependencies
-    'races',         # No dependencies
-    'items',         # No dependencies
-    'breakthroughs', # No dependencies
-    'classes',       # May reference abilities (but not required for parsing)
-    'monsters',      # May reference monster-abilities (but not required for parsing)
-]
+# Data types and the types whose parse should finish first. Dependencies only
+# order the work: a parser may reference its dependency's output but still runs
+# if that dependency failed.
+DEPENDENCIES = {
+    'keywords': [],
+    'abilities': [],
+    'monster-abilities': [],
+    'races': [],
+    'items': [],
+    'breakthroughs': [],
+    'classes': ['abilities'],             # May reference abilities (but not required for parsing)
+    'monsters': ['monster-abilities'],    # May reference monster-abilities (but not required for parsing)
+}
+
+# Data types in dependency order
+DATA_TYPES = list(DEPENDENCIES)
+
+# Fetcher per data type: (module, class, constructor arguments)
+FETCHERS = {
+    'classes': ('fetchers.class_fetcher', 'ClassFetcher', {}),
+    'abilities': ('fetchers.ability_fetcher', 'AbilityFetcher', {}),
+    'races': ('fetchers.race_fetcher', 'RaceFetcher', {}),
+    'items': ('fetchers.item_fetcher', 'ItemFetcher', {}),
+    'keywords': ('fetchers.keyword_fetcher', 'KeywordFetcher', {}),
+    'breakthroughs': ('fetchers.breakthrough_fetcher', 'BreakthroughFetcher', {}),
+    'monsters': ('fetchers.monster_fetcher', 'MonsterFetcher', {}),
+    'monster-abilities': ('fetchers.ability_fetcher', 'AbilityFetcher', {'monster': True}),
+}
+
+# Parser per data type: (module, class, constructor arguments)
+PARSERS = {
+    'classes': ('parsers.class_parser', 'ClassParser', {}),
+    'abilities': ('parsers.ability_parser', 'AbilityParser', {}),
+    'races': ('parsers.race_parser', 'RaceParser', {}),
+    'items': ('parsers.item_parser', 'ItemParser', {}),
+    'keywords': ('parsers.keyword_parser', 'KeywordParser', {}),
+    'breakthroughs': ('parsers.breakthrough_parser', 'BreakthroughParser', {}),
+    'monsters': ('parsers.monster_parser', 'MonsterParser', {}),
+    'monster-abilities': ('parsers.ability_parser', 'AbilityParser', {'monster': True}),
+}
+
+# How each parser is driven, mirroring its command-line entry point
+PARSE_CALLS: Dict[str, Callable[[Any, Path, int], Any]] = {
+    'classes': lambda parser, html_dir, jobs: parser.parse_directory(html_dir, jobs=jobs),
+    'abilities': lambda parser, html_dir, jobs: parser.parse_directory(html_dir),
+    'races': lambda parser, html_dir, jobs: parser.parse_all_races(jobs=jobs),
+    'items': lambda parser, html_dir, jobs: parser.parse_and_save_all(html_dir, jobs=jobs),
+    'keywords': lambda parser, html_dir, jobs: parser.parse_and_save_all(html_dir),
+    'breakthroughs': lambda parser, html_dir, jobs: parser.parse_and_save_all(html_dir),
+    'monsters': lambda parser, html_dir, jobs: parser.parse_directory(html_dir, jobs=jobs),
+    'monster-abilities': lambda parser, html_dir, jobs: parser.parse_directory(html_dir),
+}
+
+# Per-file parser method (and extra arguments) used to parse detail pages while
+# they are still being fetched; the same methods the batch parse path maps over
+STREAM_PARSE = {
+    'classes': ('_parse_and_save', ('yaml',)),
+    'items': ('_parse_item', ()),
+    'races': ('_parse_and_save_race', ()),
+    'monsters': ('_parse_monster', ('yaml',)),
+}
+
+
+def _load_class(module_name: str, class_name: str) -> type:
+    """Import a fetcher or parser class on first use (keeps --parse-only free of Selenium)."""
+    return getattr(importlib.import_module(module_name), class_name)
+
 
 class DataUpdater:
     """Orchestrates fetching and parsing of game data."""
     
-    def __init__(self, data_types: Optional[List[str]] = None, update_sheets: bool = True):
+    def __init__(self, data_types: Optional[List[str]] = None, update_sheets: bool = True,
+                 concurrency: int = 3, jobs: int = 1, stream: bool = True, build_corpus: bool = True,
+                 snapshot: bool = False, search_index: bool = True):
         self.data_types = data_types or DATA_TYPES
         self.version = "latest"
         self.update_sheets = update_sheets
+        self.concurrency = max(1, concurrency)
+        self.jobs = jobs
+        self.stream = stream
+        self.build_corpus = build_corpus
+        self.snapshot = snapshot
+        self.search_index = search_index
+        
+        # Parses of different types finish concurrently; the search index takes one writer at a time
+        self._search_index_lock = threading.Lock()
+        
+        # Set on Ctrl-C so running stages wind down instead of being killed
+        self.stop_event = threading.Event()
+        
+        # Seconds spent per stage ("fetch:items", "parse:items", "sheets")
+        self.timings: Dict[str, float] = {}
+        
+        # Parser construction updates the shared 'latest' symlink
+        self._parser_init_lock = threading.Lock()
         
         # Resolve actual version if using "latest"
         self.actual_version = self._resolve_actual_version()
@@ -67,111 +155,209 @@ class DataUpdater:
             logger.warning("⚠️ 'latest' symlink not found, using 'latest' as version")
             return self.version
     
-    def run_fetcher(self, data_type: str) -> bool:
-        """Run the fetcher for a specific data type."""
+    def _create_parser(self, data_type: str):
+        """Construct the parser for a data type."""
+        module_name, class_name, kwargs = PARSERS[data_type]
+        parser_class = _load_class(module_name, class_name)
+        with self._parser_init_lock:
+            # Use actual_version for parsers to avoid symlink issues
+            return parser_class(version=self.actual_version, **kwargs)
+    
+    def run_fetcher(self, data_type: str, stream_parse: bool = False) -> bool:
+        """
+        Run the fetcher for a specific data type.
+        
+        Args:
+            data_type: Data type to fetch
+            stream_parse: Parse detail pages on a process pool as soon as they are saved
+        """
         logger.info(f"🔄 Fetching {data_type} data...")
         
-        # Map data types to fetcher modules
-        fetcher_map = {
-            'classes': 'fetchers.class_fetcher',
-            'abilities': 'fetchers.ability_fetcher',
-            'races': 'fetchers.race_fetcher', 
-            'items': 'fetchers.item_fetcher',
-            'keywords': 'fetchers.keyword_fetcher',
-            'breakthroughs': 'fetchers.breakthrough_fetcher',
-            'monsters': 'fetchers.monster_fetcher',
-            'monster-abilities': 'fetchers.ability_fetcher',
-        }
-        
-        fetcher_module = fetcher_map.get(data_type)
-        if not fetcher_module:
+        if data_type not in FETCHERS:
             logger.error(f"No fetcher found for {data_type}")
             return False
-            
+        
+        fetcher = None
+        stream = None
         try:
-            # Build base command
-            cmd = ['python', '-m', fetcher_module, '--version', self.version]
+            module_name, class_name, kwargs = FETCHERS[data_type]
+            fetcher = _load_class(module_name, class_name)(version=self.version, **kwargs)
             
-            # Add monster flag for monster abilities
-            if data_type == 'monster-abilities':
-                cmd.append('--monster')
+            if stream_parse and data_type in STREAM_PARSE:
+                method_name, args = STREAM_PARSE[data_type]
+                stream = ParseStream(self._create_parser(data_type), method_name, *args, jobs=self.jobs)
+                fetcher.on_page_saved = lambda item_id, html_path: stream.submit(html_path)
             
-            result = subprocess.run(cmd, capture_output=True, text=True, cwd=Path.cwd())
+            results = fetcher.fetch_all()
             
-            if result.returncode == 0:
-                logger.info(f"✅ Successfully fetched {data_type}")
+            if results:
+                logger.info(f"✅ Successfully fetched {data_type} ({len(results)} pages)")
                 return True
             else:
-                logger.error(f"❌ Failed to fetch {data_type}: {result.stderr}")
+                logger.error(f"❌ Failed to fetch {data_type}: no pages fetched")
                 return False
                 
         except Exception as e:
             logger.error(f"❌ Error fetching {data_type}: {e}")
             return False
+        finally:
+            if stream is not None:
+                stream.close(cancel=self.stop_event.is_set())
+            if fetcher is not None:
+                fetcher.cleanup()
     
     def run_parser(self, data_type: str) -> bool:
         """Run the parser for a specific data type."""
         logger.info(f"📝 Parsing {data_type} data...")
         
-        # Map data types to parser modules  
-        parser_map = {
-            'classes': 'parsers.class_parser',
-            'abilities': 'parsers.ability_parser',
-            'races': 'parsers.race_parser',
-            'items': 'parsers.item_parser', 
-            'keywords': 'parsers.keyword_parser',
-            'breakthroughs': 'parsers.breakthrough_parser',
-            'monsters': 'parsers.monster_parser',
-            'monster-abilities': 'parsers.ability_parser',
-        }
-        
-        parser_module = parser_map.get(data_type)
-        if not parser_module:
+        if data_type not in PARSERS:
             logger.error(f"No parser found for {data_type}")
             return False
-            
+        
         try:
             # Construct HTML directory path
-            if data_type == 'monster-abilities':
-                html_dir = f"scraped_html/{self.version}/monster-abilities"
-            else:
-                html_dir = f"scraped_html/{self.version}/{data_type}"
+            html_dir = Path("scraped_html") / self.version / data_type
+            if data_type != 'races' and not html_dir.exists():
+                logger.error(f"❌ Failed to parse {data_type}: HTML directory not found: {html_dir}")
+                return False
             
-            # Build command with required arguments
-            # Special case for race parser which doesn't take html_dir as positional arg
-            if data_type == 'races':
-                cmd = ['python', '-m', parser_module, '--version', self.actual_version]
-            else:
-                # Use actual_version for parsers to avoid symlink issues
-                cmd = ['python', '-m', parser_module, html_dir, '--version', self.actual_version]
+            parser = self._create_parser(data_type)
+            result = PARSE_CALLS[data_type](parser, html_dir, self.jobs)
             
-            # Add monster flag for monster abilities
-            if data_type == 'monster-abilities':
-                cmd.append('--monster')
+            if isinstance(result, dict) and 'error' in result:
+                logger.error(f"❌ Failed to parse {data_type}: {result['error']}")
+                return False
             
-            result = subprocess.run(cmd, capture_output=True, text=True, cwd=Path.cwd())
+            if self.build_corpus:
+                Corpus.build(parser.output_dir)
             
-            if result.returncode == 0:
-                logger.info(f"✅ Successfully parsed {data_type}")
-                return True
-            else:
-                logger.error(f"❌ Failed to parse {data_type}: {result.stderr}")
-                return False
+            if self.search_index:
+                self.update_search_index(data_type)
+            
+            logger.info(f"✅ Successfully parsed {data_type}")
+            return True
                 
         except Exception as e:
             logger.error(f"❌ Error parsing {data_type}: {e}")
             return False
     
+    def update_search_index(self, data_type: str):
+        """Re-index the files of a data type that changed in this parse."""
+        version_dir = Path("parsed_data") / self.actual_version
+        with self._search_index_lock:
+            index = SearchIndex(version_dir)
+            try:
+                index.update([data_type])
+            finally:
+                index.close()
+    
+    def run_timed(self, stage: str, func: Callable[[], bool]) -> bool:
+        """Run one stage, recording how long it took."""
+        start = time.perf_counter()
+        try:
+            return func()
+        except Exception as e:
+            logger.error(f"❌ Stage {stage} crashed: {e}")
+            return False
+        finally:
+            self.timings[stage] = time.perf_counter() - start
+            logger.info(f"⏱️ {stage} finished in {self.timings[stage]:.1f}s")
+    
+    def build_stages(self, fetch: bool = True, parse: bool = True) -> Dict[str, tuple]:
+        """
+        Build the stage graph for the selected data types.
+        
+        Fetches are independent of each other. A type's parse waits for its own
+        fetch and for the parses of the types it depends on. When both run and
+        streaming is on, the fetch stage already parses each detail page as it
+        arrives, so the parse stage mostly hits the parse cache and writes indexes.
+        
+        Args:
+            fetch: Include fetch stages
+            parse: Include parse stages
+            
+        Returns:
+            Dictionary mapping stage name to (callable, list of prerequisite stages)
+        """
+        stages = {}
+        for data_type in self.data_types:
+            if fetch:
+                stages[f"fetch:{data_type}"] = (partial(self.run_fetcher, data_type,
+                                                        stream_parse=parse and self.stream), [])
+            if parse:
+                prerequisites = [f"parse:{dep}" for dep in DEPENDENCIES[data_type] if dep in self.data_types]
+                if fetch:
+                    prerequisites.append(f"fetch:{data_type}")
+                stages[f"parse:{data_type}"] = (partial(self.run_parser, data_type), prerequisites)
+        return stages
+    
+    def run_stages(self, stages: Dict[str, tuple]) -> Dict[str, bool]:
+        """
+        Run a stage graph, starting each stage as soon as its prerequisites finish.
+        
+        Up to ``concurrency`` stages run at once and fetchers borrow their browser
+        from one shared pool of that size, so Chrome is started at most
+        ``concurrency`` times for the whole run. A failed stage is logged and its
+        dependents still run.
+        
+        Args:
+            stages: Stage graph from build_stages
+            
+        Returns:
+            Dictionary mapping stage name to success
+        """
+        results: Dict[str, bool] = {}
+        waiting = dict(stages)
+        running = {}
+        
+        driver_pool = None
+        if any(name.startswith("fetch:") for name in stages):
+            from core.fetcher import BaseFetcher, DriverPool, create_chrome_driver
+            driver_pool = DriverPool(create_chrome_driver, self.concurrency)
+            BaseFetcher.driver_pool = driver_pool
+            BaseFetcher.stop_event = self.stop_event
+        
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="stage") as executor:
+                try:
+                    while waiting or running:
+                        for name, (func, prerequisites) in list(waiting.items()):
+                            if all(prereq in results for prereq in prerequisites):
+                                del waiting[name]
+                                running[executor.submit(self.run_timed, name, func)] = name
+                        
+                        if not running:
+                            logger.error(f"❌ Stages with unmet prerequisites: {', '.join(waiting)}")
+                            break
+                        
+                        done, _ = wait(running, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            name = running.pop(future)
+                            results[name] = future.result()
+                            if not results[name]:
+                                logger.warning(f"Continuing despite {name} failure...")
+                except KeyboardInterrupt:
+                    # Let running stages wind down (fetchers skip remaining pages, parse
+                    # streams drop queued work) and never start the rest
+                    logger.warning(f"⛔ Interrupted: stopping {len(running)} running stages, "
+                                   f"skipping {len(waiting)} more (Ctrl-C again to abort)")
+                    self.stop_event.set()
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise
+        finally:
+            if driver_pool is not None:
+                BaseFetcher.driver_pool = None
+                BaseFetcher.stop_event = None
+                driver_pool.close()
+        
+        return results
+    
     def fetch_all(self) -> bool:
         """Fetch all data types."""
         logger.info(f"🚀 Starting fetch process for {len(self.data_types)} data types...")
         
-        success_count = 0
-        for data_type in self.data_types:
-            if self.run_fetcher(data_type):
-                success_count += 1
-            else:
-                logger.warning(f"Continuing despite {data_type} fetch failure...")
+        results = self.run_stages(self.build_stages(fetch=True, parse=False))
+        success_count = sum(results.values())
         
         logger.info(f"📊 Fetch complete: {success_count}/{len(self.data_types)} successful")
         return success_count == len(self.data_types)
@@ -180,16 +366,34 @@ class DataUpdater:
         """Parse all data types."""
         logger.info(f"🚀 Starting parse process for {len(self.data_types)} data types...")
         
-        success_count = 0
-        for data_type in self.data_types:
-            if self.run_parser(data_type):
-                success_count += 1
-            else:
-                logger.warning(f"Continuing despite {data_type} parse failure...")
+        results = self.run_stages(self.build_stages(fetch=False, parse=True))
+        success_count = sum(results.values())
         
         logger.info(f"📊 Parse complete: {success_count}/{len(self.data_types)} successful")
+        if self.snapshot:
+            self.run_timed("snapshot", self.snapshot_version)
         return success_count == len(self.data_types)
     
+    def snapshot_version(self) -> bool:
+        """Store the parsed version in the content-addressed release store."""
+        version_dir = Path("parsed_data") / self.actual_version
+        try:
+            stats = ReleaseStore().snapshot(version_dir)
+            logger.info(f"🗄️ Stored {self.actual_version}: {stats['new_blobs']} of {stats['files']} files changed")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Error storing {version_dir}: {e}")
+            return False
+    
+    def log_timings(self):
+        """Log how long every stage took, slowest first."""
+        if not self.timings:
+            return
+        
+        logger.info("⏱️ Stage timings:")
+        for stage, seconds in sorted(self.timings.items(), key=lambda entry: entry[1], reverse=True):
+            logger.info(f"   {stage:<28} {seconds:8.1f}s")
+    
     def update_google_sheets(self) -> bool:
         """Update Google Sheets with the latest parsed data."""
         if not self.update_sheets:
@@ -218,15 +422,21 @@ class DataUpdater:
         """Run full fetch, parse, and Google Sheets update pipeline."""
         logger.info("🎯 Starting full data update pipeline...")
         
-        fetch_success = self.fetch_all()
+        # Fetches and parses share one graph, so parsing a type starts as soon as its fetch is done
+        results = self.run_stages(self.build_stages(fetch=True, parse=True))
+        
+        fetch_success = all(ok for name, ok in results.items() if name.startswith("fetch:"))
         if not fetch_success:
             logger.warning("⚠️ Some fetches failed, but continuing with parsing...")
         
-        parse_success = self.parse_all()
+        parse_success = all(ok for name, ok in results.items() if name.startswith("parse:"))
         if not parse_success:
             logger.warning("⚠️ Some parsing failed, but continuing with Google Sheets update...")
         
-        sheets_success = self.update_google_sheets()
+        if self.snapshot:
+            self.run_timed("snapshot", self.snapshot_version)
+        
+        sheets_success = self.run_timed("sheets", self.update_google_sheets)
         if not sheets_success:
             logger.warning("⚠️ Google Sheets update failed")
         
@@ -250,6 +460,7 @@ Examples:
   python update_latest_data.py --parse-only       # Only parse + update sheets
   python update_latest_data.py --no-sheets        # Fetch + parse, skip sheets update  
   python update_latest_data.py --data-types classes abilities  # Only specific types
+  python update_latest_data.py --concurrency 1    # One data type at a time
   
 Note: The race fetcher currently has issues with Angular content loading.
 Until fixed, races will be fetched but may contain loading pages.
@@ -281,6 +492,44 @@ Until fixed, races will be fetched but may contain loading pages.
         help='Skip Google Sheets update'
     )
     
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=3,
+        help='Number of data types processed at once, and browser sessions shared by fetchers (default: 3)'
+    )
+    
+    parser.add_argument(
+        '--no-stream',
+        action='store_true',
+        help='Parse only after each fetch finishes instead of while pages arrive'
+    )
+    
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='Parse processes per data type for parsers that support it (default: 1)'
+    )
+    
+    parser.add_argument(
+        '--no-corpus',
+        action='store_true',
+        help='Skip building the consolidated JSON-lines corpus for each parsed data type'
+    )
+    
+    parser.add_argument(
+        '--snapshot',
+        action='store_true',
+        help='Store the parsed version in the content-addressed store (parsed_data/_store)'
+    )
+    
+    parser.add_argument(
+        '--no-search-index',
+        action='store_true',
+        help='Skip updating the full-text search index (parsed_data/_search) after parsing'
+    )
+    
     args = parser.parse_args()
     
     # Validate arguments
@@ -289,7 +538,10 @@ Until fixed, races will be fetched but may contain loading pages.
         sys.exit(1)
     
     try:
-        updater = DataUpdater(data_types=args.data_types, update_sheets=not args.no_sheets)
+        updater = DataUpdater(data_types=args.data_types, update_sheets=not args.no_sheets,
+                              concurrency=args.concurrency, jobs=args.jobs,
+                              stream=not args.no_stream, build_corpus=not args.no_corpus,
+                              snapshot=args.snapshot, search_index=not args.no_search_index)
         
         if args.fetch_only:
             success = updater.fetch_all()
@@ -297,11 +549,13 @@ Until fixed, races will be fetched but may contain loading pages.
             success = updater.parse_all()
             # Also update sheets if parse-only and sheets not disabled
             if success and not args.no_sheets:
-                sheets_success = updater.update_google_sheets()
+                sheets_success = updater.run_timed("sheets", updater.update_google_sheets)
                 success = success and sheets_success
         else:
             success = updater.update_all()
         
+        updater.log_timings()
+        
         if success:
             logger.info("✨ All operations completed successfully!")
             sys.exit(0)
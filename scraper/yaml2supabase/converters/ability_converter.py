@@ -3,12 +3,18 @@ Converter for ability data with parent-child relationships and keyword normaliza
 """
 
 from typing import Any, Dict, List, Optional
-from .base_converter import BaseConverter
+from .base_converter import BaseConverter, RelationshipTable
 
 
 class AbilityConverter(BaseConverter):
     """Convert ability YAML files to SQL with proper relationships."""
     
+    RELATIONSHIP_TABLES = {
+        'parsed_data_ability_keywords': RelationshipTable(
+            'ability_keywords', ('ability_id', 'keyword_id'),
+            {'ability_id': 'parsed_data_abilities', 'keyword_id': 'parsed_data_keywords'}),
+    }
+    
     def __init__(self):
         super().__init__()
         self.ability_keywords: List[Dict[str, str]] = []
@@ -64,7 +70,12 @@ class AbilityConverter(BaseConverter):
         }
         
     def _normalize_keyword_id(self, keyword: str) -> str:
-        """Normalize a keyword string to ID format."""
+        """Resolve a keyword to its ID, falling back to normalizing the string."""
+        if self.entity_index is not None:
+            keyword_id = self.entity_index.resolve('keywords', keyword)
+            if keyword_id:
+                return keyword_id
+                
         # Common keyword normalization
         return keyword.lower().replace(' ', '_').replace('-', '_')
         
@@ -2,19 +2,48 @@
 Base converter class for YAML to SQL conversion.
 """
 
+import hashlib
 import json
-import yaml
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import IO, Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from core.entity_index import EntityIndex
+from core.storage import RecordStore
+
+
+def record_hash(record: Any) -> str:
+    """Stable content hash of a converted record or relationship row."""
+    payload = json.dumps(record, sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class RelationshipTable(NamedTuple):
+    """How a converter's collected relationship rows map onto a relationship table."""
+    
+    attribute: str  # converter attribute holding the row dicts
+    columns: Tuple[str, ...]  # columns to load, in order
+    references: Dict[str, str]  # referencing column -> referenced table (together the row key)
 
 
 class BaseConverter(ABC):
     """Abstract base class for all data type converters."""
     
+    # Rows per generated INSERT statement
+    SQL_BATCH_SIZE = 500
+    
+    # Relationship tables this converter fills, keyed by table name
+    RELATIONSHIP_TABLES: Dict[str, RelationshipTable] = {}
+    
     def __init__(self):
         self.processed_ids: Set[str] = set()
         self.relationships: List[Dict[str, Any]] = []
+        # Serves records from the parsed data corpus when it is current
+        self.record_store = RecordStore()
+        # Set by the migrator to resolve references against the real entities
+        self.entity_index: Optional[EntityIndex] = None
+        # Files that failed to load or convert (their records are missing, not removed)
+        self.failed_files: List[Path] = []
         
     @abstractmethod
     def get_table_name(self) -> str:
@@ -26,50 +55,130 @@ class BaseConverter(ABC):
         """Convert a single YAML record to database format."""
         pass
         
-    def convert_directory(self, directory: Path, version: str) -> str:
-        """Convert all YAML files in a directory to SQL."""
-        sql_lines = []
-        
-        # Add header
-        sql_lines.append(f"-- {self.get_table_name()} data")
-        sql_lines.append(f"-- Generated from: {directory}")
-        sql_lines.append("")
-        
-        # Process all YAML files
+    def get_yaml_files(self, directory: Path) -> List[Path]:
+        """List the YAML files to convert in a data directory, in conversion order."""
         yaml_files = list(directory.glob("*.yaml")) + list(directory.glob("*.yml"))
         # Skip index files
         yaml_files = [f for f in yaml_files if not f.name.endswith('_index.yaml')]
+        return sorted(yaml_files)
         
-        if not yaml_files:
-            return ""
-            
-        records = []
-        for yaml_file in sorted(yaml_files):
+    def iter_records(self, directory: Path, version: str) -> Iterator[Dict[str, Any]]:
+        """
+        Convert the YAML files in a directory one at a time.
+        
+        Yields each converted record whose id has not been seen yet. Relationship
+        rows are collected on the converter as a side effect.
+        """
+        return self.iter_files(self.get_yaml_files(directory), version)
+        
+    def iter_files(self, yaml_files: Iterable[Path], version: str) -> Iterator[Dict[str, Any]]:
+        """Convert the given YAML files in order (see iter_records); failures are kept in failed_files."""
+        for yaml_file in yaml_files:
             try:
-                with open(yaml_file, 'r', encoding='utf-8') as f:
-                    data = yaml.safe_load(f)
-                    
-                if data:
-                    record = self.convert_record(data, version)
-                    if record and record.get('id') not in self.processed_ids:
-                        records.append(record)
-                        self.processed_ids.add(record['id'])
-                        
+                data = self.record_store.load(yaml_file)
+                record = self.convert_record(data, version) if data else None
             except Exception as e:
                 print(f"Error processing {yaml_file}: {e}")
+                self.failed_files.append(Path(yaml_file))
                 continue
                 
-        # Generate INSERT statement
-        if records:
-            sql_lines.append(self._generate_insert_sql(records))
+            if record and record.get('id') not in self.processed_ids:
+                self.processed_ids.add(record['id'])
+                yield record
+                
+    def merge_state(self, other: 'BaseConverter'):
+        """
+        Append the relationship rows another converter of this type collected.
+        
+        Merging the converters of consecutive file slices in slice order gives
+        the same rows, in the same order, as converting all files here.
+        """
+        self.relationships.extend(other.relationships)
+        self.failed_files.extend(other.failed_files)
+        for spec in self.RELATIONSHIP_TABLES.values():
+            getattr(self, spec.attribute).extend(getattr(other, spec.attribute))
+            
+    def iter_sql(self, directory: Path, version: str, batch_size: Optional[int] = None,
+                 records: Optional[Iterator[Dict[str, Any]]] = None) -> Iterator[str]:
+        """
+        Convert a directory to SQL chunk by chunk.
+        
+        Records are converted one file at a time and emitted as INSERT statements
+        of at most batch_size rows, so memory stays flat however large the
+        directory is. Nothing is yielded if no record converts.
+        
+        Args:
+            directory: Data type directory
+            version: Game version stored with each record
+            batch_size: Rows per INSERT statement (default: SQL_BATCH_SIZE)
+            records: Already converted records to use instead of converting directory
+            
+        Yields:
+            SQL text chunks (header, then one INSERT per batch)
+        """
+        batch_size = batch_size or self.SQL_BATCH_SIZE
+        if records is None:
+            records = self.iter_records(directory, version)
+        
+        first = next(records, None)
+        if first is None:
+            return
+            
+        yield f"-- {self.get_table_name()} data\n-- Generated from: {directory}\n"
+        
+        batch = [first]
+        for record in records:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                yield "\n" + self._generate_insert_sql(batch) + "\n"
+                batch = []
+        if batch:
+            yield "\n" + self._generate_insert_sql(batch) + "\n"
             
         # Add relationship inserts if any
         if hasattr(self, 'relationships') and self.relationships:
-            sql_lines.append("")
-            sql_lines.append("-- Relationships")
-            sql_lines.extend(self._generate_relationship_sql())
+            yield "\n-- Relationships\n" + '\n'.join(self._generate_relationship_sql()) + "\n"
             
-        return '\n'.join(sql_lines)
+    def write_sql(self, directory: Path, version: str, out: IO[str], batch_size: Optional[int] = None,
+                  records: Optional[Iterator[Dict[str, Any]]] = None) -> int:
+        """
+        Stream a directory's SQL into a file as it is generated (see iter_sql).
+        
+        Returns:
+            Number of characters written (0 if no record converted)
+        """
+        written = 0
+        for chunk in self.iter_sql(directory, version, batch_size, records):
+            written += out.write(chunk)
+        return written
+        
+    def convert_directory(self, directory: Path, version: str) -> str:
+        """Convert all YAML files in a directory to SQL."""
+        return ''.join(self.iter_sql(directory, version))
+        
+    def relationship_rows(self) -> Iterator[Tuple[str, RelationshipTable, List[tuple]]]:
+        """
+        Yield the relationship rows collected so far, one table at a time.
+        
+        Rows are tuples in the table spec's column order, deduplicated on the
+        referencing columns with the first occurrence kept (matching the
+        ON CONFLICT DO NOTHING inserts).
+        
+        Every declared table is yielded, even when no rows were collected, so a
+        sync can tell an emptied table from one that was never converted.
+        
+        Yields:
+            (table name, table spec, rows) tuples
+        """
+        for table, spec in self.RELATIONSHIP_TABLES.items():
+            seen = set()
+            rows = []
+            for rel in getattr(self, spec.attribute):
+                key = tuple(rel.get(col) for col in spec.references)
+                if key not in seen:
+                    seen.add(key)
+                    rows.append(tuple(rel.get(col) for col in spec.columns))
+            yield table, spec, rows
         
     def _generate_insert_sql(self, records: List[Dict[str, Any]]) -> str:
         """Generate INSERT SQL for multiple records."""
@@ -135,4 +244,34 @@ class BaseConverter(ABC):
         value = data.get(key, default)
         if value in ['', '-', [], {}]:
             return None
-        return value
\ No newline at end of file
+        return value
+
+
+# Entity index owned by a process-pool worker (set once per worker by init_convert_worker)
+_worker_entity_index: Optional[EntityIndex] = None
+
+
+def init_convert_worker(entity_index: Optional[EntityIndex]):
+    """Process-pool initializer: keep one copy of the entity index per worker."""
+    global _worker_entity_index
+    _worker_entity_index = entity_index
+
+
+def convert_files(converter_cls: type, yaml_files: List[Path], version: str) -> Tuple[List[Dict[str, Any]], BaseConverter]:
+    """
+    Convert a slice of one type's files in a fresh converter (process pool task).
+    
+    The entity index is the worker's copy from init_convert_worker, so it is
+    sent to each worker once rather than with every task.
+    
+    Returns:
+        The converted records in file order, and the converter holding the
+        relationship rows collected along the way
+    """
+    converter = converter_cls()
+    converter.entity_index = _worker_entity_index
+    records = list(converter.iter_files(yaml_files, version))
+    # Open corpus files cannot be sent back to the parent, and the index is already there
+    converter.record_store.close()
+    converter.entity_index = None
+    return records, converter
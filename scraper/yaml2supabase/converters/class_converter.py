@@ -3,12 +3,21 @@ Converter for class data with ability relationships.
 """
 
 from typing import Any, Dict, List
-from .base_converter import BaseConverter
+from .base_converter import BaseConverter, RelationshipTable
 
 
 class ClassConverter(BaseConverter):
     """Convert class YAML files to SQL with ability relationships."""
     
+    RELATIONSHIP_TABLES = {
+        'parsed_data_class_abilities': RelationshipTable(
+            'class_abilities', ('class_id', 'ability_id', 'level_gained'),
+            {'class_id': 'parsed_data_classes', 'ability_id': 'parsed_data_abilities'}),
+        'parsed_data_class_key_abilities': RelationshipTable(
+            'class_key_abilities', ('class_id', 'key_ability_id'),
+            {'class_id': 'parsed_data_classes', 'key_ability_id': 'parsed_data_abilities'}),
+    }
+    
     def __init__(self):
         super().__init__()
         self.class_abilities: List[Dict[str, Any]] = []
@@ -26,6 +35,12 @@ class ClassConverter(BaseConverter):
         
         class_id = data.get('id')
         
+        # Key abilities, looked up once per class instead of once per benefit
+        key_ability_ids = {
+            ref.get('id') for ref in data.get('ability_references', [])
+            if ref.get('type') == 'key_ability'
+        }
+        
         # Extract ability relationships from progression
         if 'progression' in data and isinstance(data['progression'], list):
             for level_data in data['progression']:
@@ -37,15 +52,7 @@ class ClassConverter(BaseConverter):
                         if isinstance(benefit, dict) and benefit.get('type') == 'ability':
                             ability_id = benefit.get('ability_id')
                             if ability_id:
-                                # Check if it's a key ability by looking in ability_references
-                                is_key_ability = False
-                                if 'ability_references' in data:
-                                    for ref in data['ability_references']:
-                                        if ref.get('id') == ability_id and ref.get('type') == 'key_ability':
-                                            is_key_ability = True
-                                            break
-                                
-                                if is_key_ability:
+                                if ability_id in key_ability_ids:
                                     self.class_key_abilities.append({
                                         'class_id': class_id,
                                         'key_ability_id': ability_id
@@ -3,12 +3,21 @@ Converter for monster data with ability relationships.
 """
 
 from typing import Any, Dict, List
-from .base_converter import BaseConverter
+from .base_converter import BaseConverter, RelationshipTable
 
 
 class MonsterConverter(BaseConverter):
     """Convert monster YAML files to SQL with ability relationships."""
     
+    RELATIONSHIP_TABLES = {
+        'parsed_data_monster_abilities': RelationshipTable(
+            'monster_abilities', ('monster_id', 'ability_id'),
+            {'monster_id': 'parsed_data_monsters', 'ability_id': 'parsed_data_monster_abilities_list'}),
+        'parsed_data_monster_active_actions': RelationshipTable(
+            'monster_active_actions', ('monster_id', 'action_id'),
+            {'monster_id': 'parsed_data_monsters', 'action_id': 'parsed_data_monster_abilities_list'}),
+    }
+    
     def __init__(self):
         super().__init__()
         self.monster_abilities: List[Dict[str, Any]] = []
@@ -4,13 +4,18 @@ Converter for race data with sub-race relationships.
 
 from typing import Any, Dict, List
 from pathlib import Path
-import yaml
-from .base_converter import BaseConverter
+from .base_converter import BaseConverter, RelationshipTable
 
 
 class RaceConverter(BaseConverter):
     """Convert race YAML files to SQL with sub-race relationships."""
     
+    RELATIONSHIP_TABLES = {
+        'parsed_data_race_abilities': RelationshipTable(
+            'race_abilities', ('race_id', 'ability_id'),
+            {'race_id': 'parsed_data_races', 'ability_id': 'parsed_data_abilities'}),
+    }
+    
     def __init__(self):
         super().__init__()
         self.race_abilities: List[Dict[str, str]] = []
@@ -45,47 +50,16 @@ class RaceConverter(BaseConverter):
             'version': version
         }
     
-    def convert_directory(self, directory: Path, version: str) -> str:
-        """Override to handle subdirectory structure for races."""
-        sql_lines = []
-        
-        # Add header
-        sql_lines.append(f"-- {self.get_table_name()} data")
-        sql_lines.append(f"-- Generated from: {directory}")
-        sql_lines.append("")
-        
-        # Process primary and sub directories
-        records = []
+    def get_yaml_files(self, directory: Path) -> List[Path]:
+        """Races live in primary/ and sub/ subdirectories."""
+        yaml_files = []
         for subdir_name in ['primary', 'sub']:
             subdir = directory / subdir_name
             if not subdir.exists():
                 continue
-                
-            # Process all YAML files in subdirectory
-            yaml_files = list(subdir.glob("*.yaml")) + list(subdir.glob("*.yml"))
-            
-            for yaml_file in sorted(yaml_files):
-                try:
-                    with open(yaml_file, 'r', encoding='utf-8') as f:
-                        data = yaml.safe_load(f)
-                        
-                    if data:
-                        record = self.convert_record(data, version)
-                        if record and record.get('id') not in self.processed_ids:
-                            records.append(record)
-                            self.processed_ids.add(record['id'])
-                            
-                except Exception as e:
-                    print(f"Error processing {yaml_file}: {e}")
-        
-        if not records:
-            return ""
-            
-        # Generate INSERT statement
-        sql_lines.append(self._generate_insert_sql(records))
-        
-        return '\n'.join(sql_lines)
-        
+            yaml_files.extend(sorted(list(subdir.glob("*.yaml")) + list(subdir.glob("*.yml"))))
+        return yaml_files
+    
     def _generate_relationship_sql(self) -> List[str]:
         """Generate SQL for race-ability relationships."""
         sql_lines = []
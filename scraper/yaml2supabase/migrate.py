@@ -2,24 +2,30 @@
 """
 YAML to Supabase SQL Migration Tool
 
-Converts parsed YAML data to SQL files for manual upload to Supabase.
+Converts parsed YAML data to SQL files for manual upload to Supabase, or
+loads it directly into Postgres (--load), sending only changed rows (--sync).
 Creates tables with parsed_data_ prefix and handles all data types.
 """
 
 import argparse
 import json
 import logging
+import multiprocessing
+import os
 import sys
 import yaml
 from datetime import datetime
+from concurrent.futures import Future, ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent.parent))
 
+from core.entity_index import EntityIndex
 from yaml2supabase.schema import create_schema_sql
 from yaml2supabase.converters import (
+    BaseConverter,
     ClassConverter,
     AbilityConverter,
     RaceConverter,
@@ -29,6 +35,7 @@ from yaml2supabase.converters import (
     MonsterConverter,
     MonsterAbilityConverter
 )
+from yaml2supabase.converters.base_converter import convert_files, init_convert_worker
 
 # Configure logging
 logging.basicConfig(
@@ -37,6 +44,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# YAML files per conversion task when converting in parallel
+FILES_PER_TASK = 200
+
 
 class YamlToSupabaseMigrator:
     """Main migrator class that orchestrates the conversion process."""
@@ -64,9 +74,35 @@ class YamlToSupabaseMigrator:
         # Store all relationship SQL from converters
         self.all_relationship_sql = []
         
-    def generate_all(self):
-        """Generate SQL files for all data types."""
+        # Built once per run by build_entity_index
+        self.entity_index: Optional[EntityIndex] = None
+        
+    def build_entity_index(self) -> EntityIndex:
+        """
+        Index every entity of the version and hand the index to the converters.
+        
+        Converters use it to resolve references (e.g. ability keywords) to real
+        ids; dangling references are logged once, in bulk.
+        """
+        if self.entity_index is None:
+            self.entity_index = EntityIndex.build(self.parsed_data_dir)
+            self.entity_index.log_dangling_references()
+            for converter in self.converters.values():
+                converter.entity_index = self.entity_index
+        return self.entity_index
+        
+    def generate_all(self, batch_size: Optional[int] = None, workers: int = 1):
+        """
+        Generate SQL files for all data types.
+        
+        Args:
+            batch_size: Rows per INSERT statement in the data files
+            workers: Conversion processes; with more than one, all types are
+                converted concurrently in slices of files and the results are
+                written out in the usual order, so the files are identical
+        """
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        entity_index = self.build_entity_index()
         
         # Generate schema SQL
         schema_file = self.output_dir / f"01_schema_{timestamp}.sql"
@@ -74,24 +110,46 @@ class YamlToSupabaseMigrator:
             f.write(create_schema_sql())
         logger.info(f"Created schema file: {schema_file}")
         
-        # Generate data SQL files
-        for data_type, converter in self.converters.items():
-            logger.info(f"Processing {data_type}...")
-            
-            data_dir = self.parsed_data_dir / data_type
-            if not data_dir.exists():
-                logger.warning(f"Directory not found: {data_dir}")
-                continue
+        # Convert every type on the pool up front, in slices of files
+        executor = None
+        tasks: Dict[str, List[Future]] = {}
+        if workers > 1:
+            executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                           initializer=init_convert_worker, initargs=(entity_index,))
+            for data_type, converter in self.converters.items():
+                data_dir = self.parsed_data_dir / data_type
+                if data_dir.exists():
+                    files = converter.get_yaml_files(data_dir)
+                    tasks[data_type] = [
+                        executor.submit(convert_files, type(converter), files[i:i + FILES_PER_TASK], self.version)
+                        for i in range(0, len(files), FILES_PER_TASK)
+                    ]
+        
+        try:
+            # Generate data SQL files
+            for data_type, converter in self.converters.items():
+                logger.info(f"Processing {data_type}...")
                 
-            sql_content = converter.convert_directory(data_dir, self.version)
-            
-            if sql_content:
+                data_dir = self.parsed_data_dir / data_type
+                if not data_dir.exists():
+                    logger.warning(f"Directory not found: {data_dir}")
+                    continue
+                    
+                records = self._merge_results(converter, tasks[data_type]) if executor else None
+                
+                # Stream batched INSERTs into the file as records are converted
                 sql_file = self.output_dir / f"02_data_{data_type}_{timestamp}.sql"
                 with open(sql_file, 'w', encoding='utf-8') as f:
-                    f.write(sql_content)
-                logger.info(f"Created data file: {sql_file}")
-            else:
-                logger.warning(f"No data generated for {data_type}")
+                    written = converter.write_sql(data_dir, self.version, f, batch_size=batch_size, records=records)
+                
+                if written:
+                    logger.info(f"Created data file: {sql_file}")
+                else:
+                    sql_file.unlink()
+                    logger.warning(f"No data generated for {data_type}")
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
         
         # Generate relationships SQL
         relationships_file = self.output_dir / f"03_relationships_{timestamp}.sql"
@@ -112,6 +170,21 @@ class YamlToSupabaseMigrator:
         logger.info("  - For remote: python deploy_to_supabase.py --project-ref <ref> --db-password <password>")
         logger.info("  - Or use: ./deploy.sh [options]")
         
+    def _merge_results(self, converter, futures: List[Future]) -> Iterator[Dict[str, Any]]:
+        """
+        Yield a type's records from its pool tasks in file order.
+        
+        Records are deduplicated by id and each slice's relationship rows are
+        merged into the migrator's converter, exactly as a sequential run would.
+        """
+        for future in futures:
+            records, part = future.result()
+            converter.merge_state(part)
+            for record in records:
+                if record.get('id') not in converter.processed_ids:
+                    converter.processed_ids.add(record['id'])
+                    yield record
+        
     def _generate_relationships_sql(self) -> str:
         """Generate SQL for populating relationship tables."""
         sql_lines = [
@@ -164,6 +237,28 @@ class YamlToSupabaseMigrator:
             ""
         ]
         return '\n'.join(sql_lines)
+        
+    def load_to_database(self, dsn: str, create_schema: bool = False, delta: bool = False):
+        """
+        Stream all data types straight into Postgres instead of writing SQL files.
+        
+        Args:
+            dsn: Postgres connection string or URL
+            create_schema: Drop and recreate the parsed_data_ tables first
+            delta: Only send rows whose content changed since the last load or sync
+        """
+        # psycopg is only needed for direct loading
+        from yaml2supabase.loader import PostgresLoader
+        
+        self.build_entity_index()
+        loader = PostgresLoader(dsn, delta=delta)
+        loader.load(
+            self.converters,
+            self.parsed_data_dir,
+            self.version,
+            schema_sql=create_schema_sql() if create_schema else None,
+            indexes_sql=self._generate_indexes_sql()
+        )
 
 
 def main():
@@ -188,6 +283,38 @@ def main():
                  'breakthroughs', 'monsters', 'monster-abilities'],
         help="Specific data types to migrate (default: all)"
     )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=BaseConverter.SQL_BATCH_SIZE,
+        help=f"Rows per INSERT statement in generated data files (default: {BaseConverter.SQL_BATCH_SIZE})"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes used to convert data types in parallel (default: 1); output is identical"
+    )
+    parser.add_argument(
+        "--load",
+        action="store_true",
+        help="Load directly into Postgres with COPY instead of generating SQL files"
+    )
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help="Like --load, but only insert, update and delete rows whose content changed"
+    )
+    parser.add_argument(
+        "--dsn",
+        default=os.environ.get("DATABASE_URL"),
+        help="Postgres connection string for --load (default: $DATABASE_URL)"
+    )
+    parser.add_argument(
+        "--create-schema",
+        action="store_true",
+        help="With --load, drop and recreate the parsed_data_ tables first (CAUTION!)"
+    )
     
     args = parser.parse_args()
     
@@ -204,7 +331,14 @@ def main():
                 if k in args.data_types
             }
         
-        migrator.generate_all()
+        if args.load or args.sync:
+            if not args.dsn:
+                parser.error("--load/--sync need --dsn or DATABASE_URL")
+            if args.sync and args.create_schema:
+                parser.error("--sync cannot be combined with --create-schema")
+            migrator.load_to_database(args.dsn, create_schema=args.create_schema, delta=args.sync)
+        else:
+            migrator.generate_all(batch_size=args.batch_size, workers=args.workers)
         
     except Exception as e:
         logger.error(f"Migration failed: {e}")
@@ -37,6 +37,7 @@ DROP TABLE IF EXISTS parsed_data_items CASCADE;
 DROP TABLE IF EXISTS parsed_data_keywords CASCADE;
 DROP TABLE IF EXISTS parsed_data_breakthroughs CASCADE;
 DROP TABLE IF EXISTS parsed_data_monsters CASCADE;
+DROP TABLE IF EXISTS parsed_data_sync_state CASCADE;
 
 -- ============================================
 -- Core Data Tables
@@ -269,6 +270,22 @@ CREATE TABLE parsed_data_ability_keywords (
     PRIMARY KEY (ability_id, keyword_id)
 );
 
+-- ============================================
+-- Sync State
+-- ============================================
+
+-- Content hash of every row last written by migrate.py --load/--sync, so a
+-- delta sync only sends rows whose converted content changed. Relationship
+-- tables are unversioned and use version ''.
+CREATE TABLE parsed_data_sync_state (
+    table_name TEXT NOT NULL,
+    version TEXT NOT NULL,
+    row_key TEXT NOT NULL,  -- record id, or JSON array of a relationship row's key columns
+    record_hash TEXT NOT NULL,
+    synced_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (table_name, version, row_key)
+);
+
 -- ============================================
 -- Helper Functions
 -- ============================================